@@ -0,0 +1,57 @@
+import os
+from dataclasses import dataclass
+from .ttl_cache import TTLCache
+
+# Token -> Principal 的行程內快取 (TTL + LRU)
+# 每個 worker 各自一份；跨 worker 的失效靠 TTL 兜底，所以 TTL 不宜設太長
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+
+@dataclass(frozen=True)
+class Principal:
+    # 已驗證的使用者身分 (只放授權判斷需要的欄位)
+    id: int
+    username: str
+    role: str
+
+class PrincipalCache(TTLCache):
+    # token -> Principal；以 user_id 為標籤，使用者變更時清掉他所有 token
+    def __init__(self, maxsize: int = AUTH_CACHE_SIZE, ttl: float = AUTH_CACHE_TTL):
+        super().__init__(maxsize, ttl)
+
+    def _tags(self, token, principal):
+        return (principal.id,)
+
+    def invalidate_user(self, user_id: int):
+        self.invalidate_tag(user_id)
+
+principal_cache = PrincipalCache()
+
+# (kind, id) -> Ownership 的行程內快取，kind 為 board / column / ticket (deps.authorize 使用)
+# 看板的擁有者、欄位與票券所屬的看板建立後都不會變更，只有刪除會讓項目失效：
+# 本 worker 刪除時立即清掉，其他 worker 靠 TTL。crud 的寫入另外以擁有者限定 WHERE，
+# 過期的項目最多讓請求得到 404，不會改到別人的資料
+OWNERSHIP_CACHE_TTL = float(os.getenv("OWNERSHIP_CACHE_TTL", "30"))
+OWNERSHIP_CACHE_SIZE = int(os.getenv("OWNERSHIP_CACHE_SIZE", "100000"))
+
+@dataclass(frozen=True)
+class Ownership:
+    board_id: int
+    owner_id: int
+
+class OwnershipCache(TTLCache):
+    # (kind, id) -> Ownership；以 board_id 為標籤，刪除看板時一起清掉
+    def __init__(self, maxsize: int = OWNERSHIP_CACHE_SIZE, ttl: float = OWNERSHIP_CACHE_TTL):
+        super().__init__(maxsize, ttl)
+
+    def _tags(self, key, ownership):
+        return (ownership.board_id,)
+
+    def invalidate(self, kind: str, *ids):
+        self.invalidate_keys(*((kind, row_id) for row_id in ids))
+
+    def invalidate_board(self, board_id: int):
+        # 看板本身與其下所有欄位 / 票券
+        self.invalidate_tag(board_id)
+
+ownership_cache = OwnershipCache()
@@ -1,78 +1,144 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-import bcrypt
-from . import models, schemas
+from sqlalchemy.orm import Session, selectinload
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import bindparam, case, column, delete, func, insert, literal, literal_column, select, table, tuple_, union_all, update
+from . import events, models, schemas, passwords, search, sync
+from .serialization import rows_to_dicts, schema_columns
+from .ranking import POSITION_GAP, position_between, rebalanced_positions
+from .auth_cache import Ownership, Principal, ownership_cache, principal_cache
+from .stats_cache import stats_cache
 import secrets
 
 def verify_password(plain_password: str, hashed_password: str):
-    # bcrypt.checkpw 需要 bytes
-    return bcrypt.checkpw(
-        plain_password.encode('utf-8'), 
-        hashed_password.encode('utf-8')
-    )
+    # 實際計算在 passwords 模組的獨立 executor 中進行
+    return passwords.verify_password(plain_password, hashed_password)
 
 def get_password_hash(password: str):
-    # bcrypt.hashpw 回傳 bytes，需要 decode 存入 string DB column
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    return passwords.hash_password(password)
 
 # ====== Users ======
 def get_user_by_username(db: Session, username: str):
     return db.query(models.User).filter(models.User.username == username).first()
 
-def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = get_password_hash(user.password)
-    db_user = models.User(
+def get_user(db: Session, user_id: int):
+    return db.query(models.User).filter(models.User.id == user_id).first()
+
+def _returning(db: Session, statement, schema, model):
+    """
+    INSERT / UPDATE / DELETE 以 RETURNING 取回回應需要的欄位 (dict 的 list)：
+    寫入與讀回是同一個 round-trip，不必先 SELECT、commit 後也不用 refresh
+    """
+    return rows_to_dicts(db.execute(
+        statement.returning(*schema_columns(schema, model)).execution_options(synchronize_session=False)
+    ))
+
+def _returning_one(db: Session, statement, schema, model):
+    # 單列版本；沒有符合的列 (例如 id 不存在) 回傳 None
+    rows = _returning(db, statement, schema, model)
+    return rows[0] if rows else None
+
+def _write_with_versions(db: Session, statement, *columns):
+    """
+    看板內容的寫入 (INSERT / UPDATE / DELETE ... RETURNING columns，columns 需包含 board_id)，
+    並讓受影響看板的 version +1；回傳 (rows: list[dict], versions: {board_id: version} 或 None)。
+    PostgreSQL 以 data-modifying CTE 把寫入與 version +1 合成一條 statement；
+    SQLite 的 WITH 不能包含寫入，versions 回傳 None，由 _commit_board_changes 另外一條 UPDATE (同一個 transaction)
+    """
+    statement = statement.returning(*columns).execution_options(synchronize_session=False)
+    if db.get_bind().dialect.name != "postgresql":
+        return rows_to_dicts(db.execute(statement)), None
+    written = statement.cte("written")
+    bumped = update(models.Board)\
+        .where(models.Board.id.in_(select(written.c.board_id)))\
+        .values(version=models.Board.version + 1)\
+        .returning(models.Board.id, models.Board.version)\
+        .cte("bumped")
+    rows = rows_to_dicts(db.execute(
+        select(written, bumped.c.version.label("board_version"))
+        .join(bumped, bumped.c.id == written.c.board_id)
+    ))
+    versions = {row["board_id"]: row.pop("board_version") for row in rows}
+    return rows, versions
+
+def _write_one_with_versions(db: Session, statement, schema, model):
+    # 單列版本：回傳 (dict 或 None, versions)
+    rows, versions = _write_with_versions(db, statement, *schema_columns(schema, model))
+    return (rows[0] if rows else None), versions
+
+def create_user(db: Session, user: schemas.UserCreate, hashed_password: str = None):
+    # async 路由會先在 executor 算好 hash 再傳進來
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
+    db_user = _returning_one(db, insert(models.User).values(
         username=user.username,
         name=user.name,
         email=user.email,
         password_hash=hashed_password
-    )
-    db.add(db_user)
+    ), schemas.UserResponse, models.User)
     db.commit()
-    db.refresh(db_user)
-    db.refresh(db_user)
     return db_user
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.User).offset(skip).limit(limit).all()
+def get_users(db: Session, skip: int = 0, limit: int = 100, after_id: int = None):
+    # keyset 分頁：after_id 為上一頁最後一筆的 id，走主鍵索引直接定位，不受頁數深淺影響
+    # skip (offset) 只留給 PAGINATION_COMPAT 的舊 client
+    query = db.query(models.User).order_by(models.User.id.asc())
+    if after_id is not None:
+        query = query.filter(models.User.id > after_id)
+    if skip:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 def update_user(db: Session, user_id: int, user_update: schemas.UserUpdate):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+    # 強制更新時間
+    db_user = _returning_one(db, update(models.User)
+        .where(models.User.id == user_id)
+        .values(**user_update.model_dump(exclude_unset=True), updated_at=func.now()),
+        schemas.UserResponse, models.User)
     if not db_user:
+        db.rollback()
         return None
-    
-    update_data = user_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_user, key, value)
-    
-    # 強制更新時間
-    db_user.updated_at = func.now()
-    
     db.commit()
-    db.refresh(db_user)
+    # 角色可能變更，讓快取的身分失效
+    principal_cache.invalidate_user(user_id)
     return db_user
 
+def _delete_by_id(db: Session, model, row_id: int) -> bool:
+    # 單一 DELETE；子資料由資料庫 ON DELETE CASCADE 處理，不載入 Python
+    result = db.execute(
+        delete(model).where(model.id == row_id).execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount > 0
+
 def delete_user(db: Session, user_id: int):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if db_user:
-        db.delete(db_user)
-        db.commit()
-        return True
-    return False
+    deleted = _delete_by_id(db, models.User, user_id)
+    if deleted:
+        principal_cache.invalidate_user(user_id)
+        stats_cache.invalidate_user(user_id)
+    return deleted
 
 def reset_password(db: Session, user_id: int, new_password: str):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if db_user:
-        hashed_password = get_password_hash(new_password)
-        db_user.password_hash = hashed_password
-        db_user.updated_at = func.now()
-        db.commit()
-        return True
-    return False
+    hashed_password = get_password_hash(new_password)
+    result = db.execute(
+        update(models.User)
+        .where(models.User.id == user_id)
+        .values(password_hash=hashed_password, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.rollback()
+        return False
+    db.commit()
+    principal_cache.invalidate_user(user_id)
+    return True
 
 # ====== Auth Tokens ======
-def create_auth_token(db: Session, user_id: int):
+def create_auth_token(db: Session, user_id: int, password_hash: str = None):
+    # 登入用；password_hash 有給時一併升級 hash (BCRYPT_ROUNDS 變更後)，與新 token 同一個 commit
+    # 升級 hash 不影響角色，不需清快取
+    if password_hash is not None:
+        db.query(models.User)\
+            .filter(models.User.id == user_id)\
+            .update({models.User.password_hash: password_hash}, synchronize_session=False)
     token_str = "token_" + secrets.token_hex(16)
     db_token = models.AuthToken(token=token_str, user_id=user_id)
     db.add(db_token)
@@ -80,40 +146,209 @@ def create_auth_token(db: Session, user_id: int):
     return token_str
 
 def get_user_by_token(db: Session, token: str):
-    auth_token = db.query(models.AuthToken).filter(models.AuthToken.token == token).first()
-    if auth_token:
-        return auth_token.user
-    return None
+    # JOIN 一次查完 token 與 user，省掉 auth_token.user 的 lazy load
+    return db.query(models.User)\
+        .join(models.AuthToken, models.AuthToken.user_id == models.User.id)\
+        .filter(models.AuthToken.token == token)\
+        .first()
+
+def get_principal_by_token(db: Session, token: str):
+    # 只取授權需要的欄位 (行程內快取由 deps.get_current_user 處理)
+    row = db.query(models.User.id, models.User.username, models.User.role)\
+        .join(models.AuthToken, models.AuthToken.user_id == models.User.id)\
+        .filter(models.AuthToken.token == token)\
+        .first()
+    if not row:
+        return None
+
+    return Principal(id=row.id, username=row.username, role=row.role)
 
 # ====== Boards ======
-def get_boards(db: Session, user_id: int):
+def _group_by_board(rows):
+    # [(id, board_id), ...] -> {board_id: [id, ...]}
+    grouped = {}
+    for row_id, board_id in rows:
+        grouped.setdefault(board_id, []).append(row_id)
+    return grouped
+
+def _commit_board_changes(db: Session, *changes, versions: dict = None):
+    """
+    看板內容有變動時的 commit：changes 為 (event_type, board_id, ids)。
+    同一個 transaction 內 version +1 (ETag 依據) 並送出變動事件，commit 後讓統計快取失效。
+    versions: {board_id: version}，寫入本身已把 version +1 (update_board、PostgreSQL 上的
+    _write_with_versions) 時傳入，不再多一條 UPDATE；None 時 (SQLite、move_tickets 的 executemany)
+    才另外以一條 UPDATE ... RETURNING 遞增。
+    """
+    board_ids = {board_id for _, board_id, _ in changes}
+    if not board_ids:
+        db.commit()
+        return
+    if versions is None:
+        versions = dict(db.execute(
+            update(models.Board)
+            .where(models.Board.id.in_(board_ids))
+            .values(version=models.Board.version + 1)
+            .returning(models.Board.id, models.Board.version)
+            .execution_options(synchronize_session=False)
+        ).all())
+    board_events = [
+        events.make_event(event_type, board_id, versions[board_id], ids)
+        for event_type, board_id, ids in changes if board_id in versions
+    ]
+    events.broker.stage(db, board_events)
+    db.commit()
+    stats_cache.invalidate_board(*board_ids)
+    events.broker.publish(board_events)
+
+def get_board_version(db: Session, board_id: int):
+    # 條件式 GET 只需要這一個查詢；回傳 (owner_id, version) 或 None
+    return db.query(models.Board.owner_id, models.Board.version)\
+        .filter(models.Board.id == board_id)\
+        .first()
+
+def get_ownership(db: Session, keys):
+    """
+    授權用：keys 為 [(kind, id)]，kind 是 board / column / ticket。
+    欄位 / 票券 JOIN 所屬看板，所有種類以 UNION ALL 合成一個查詢；回傳 {(kind, id): Ownership}，不存在的不列入
+    """
+    ids_by_kind = {}
+    for kind, row_id in keys:
+        ids_by_kind.setdefault(kind, set()).add(row_id)
+    parts = []
+    for kind, ids in ids_by_kind.items():
+        if kind == "board":
+            parts.append(select(literal(kind).label("kind"), models.Board.id, models.Board.id.label("board_id"),
+                                models.Board.owner_id).where(models.Board.id.in_(ids)))
+            continue
+        model = models.KanbanColumn if kind == "column" else models.Ticket
+        parts.append(select(literal(kind).label("kind"), model.id, model.board_id, models.Board.owner_id)
+                     .join(models.Board, models.Board.id == model.board_id)
+                     .where(model.id.in_(ids)))
+    if not parts:
+        return {}
+    statement = parts[0] if len(parts) == 1 else union_all(*parts)
+    return {
+        (kind, row_id): Ownership(board_id=board_id, owner_id=owner_id)
+        for kind, row_id, board_id, owner_id in db.execute(statement)
+    }
+
+def _owned_by(model, owner_id: int):
+    # 寫入時在 WHERE 內再以擁有者限定：授權結果可能來自已過期的快取 (boards 以主鍵查，成本可忽略)
+    return model.board_id.in_(select(models.Board.id).where(models.Board.owner_id == owner_id))
+
+
+def _boards_page_query(db: Session, user_id: int, after_id: int = None, limit: int = None):
+    # Keyset 分頁：以 id 遞增排序，after_id 為上一頁最後一筆的 id
+    query = db.query(models.Board)\
+        .filter(models.Board.owner_id == user_id)\
+        .order_by(models.Board.id.asc())
+    if after_id is not None:
+        query = query.filter(models.Board.id > after_id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+def get_boards(db: Session, user_id: int, after_id: int = None, limit: int = None):
     # 簡單實作：只回傳自己擁有的，或者公開的 (這裡先只回傳 User 擁有的)
-    return db.query(models.Board).filter(models.Board.owner_id == user_id).all()
+    # 欄位以 selectinload 一次批次載入，避免每個 board 各自 lazy load (N+1)
+    return _boards_page_query(db, user_id, after_id, limit)\
+        .options(selectinload(models.Board.columns))\
+        .all()
+
+def get_board_summaries(db: Session, user_id: int, after_id: int = None, limit: int = None):
+    # 輕量版列表：每個欄位只回傳票券數量 (在 SQL 內 GROUP BY 計算，不載入票券)
+    boards = _boards_page_query(db, user_id, after_id, limit).all()
+    board_ids = [b.id for b in boards]
+    if not board_ids:
+        return []
+
+    rows = db.query(models.KanbanColumn, func.count(models.Ticket.id))\
+        .outerjoin(models.Ticket, models.Ticket.column_id == models.KanbanColumn.id)\
+        .filter(models.KanbanColumn.board_id.in_(board_ids))\
+        .group_by(models.KanbanColumn.id)\
+        .order_by(models.KanbanColumn.position.asc())\
+        .all()
+
+    columns_by_board = {board_id: [] for board_id in board_ids}
+    for col, ticket_count in rows:
+        columns_by_board[col.board_id].append({
+            "id": col.id,
+            "board_id": col.board_id,
+            "name": col.name,
+            "color": col.color,
+            "position": col.position,
+            "ticket_count": ticket_count,
+        })
+
+    return [
+        {
+            "id": b.id,
+            "name": b.name,
+            "description": b.description,
+            "owner_id": b.owner_id,
+            "created_at": b.created_at,
+            "updated_at": b.updated_at,
+            "columns": columns_by_board[b.id],
+            "ticket_count": sum(c["ticket_count"] for c in columns_by_board[b.id]),
+        }
+        for b in boards
+    ]
+
+DEFAULT_COLUMNS = ["Todo", "In Progress", "Done"]
 
 def create_board(db: Session, board: schemas.BoardCreate, user_id: int):
-    db_board = models.Board(**board.model_dump(), owner_id=user_id)
-    db.add(db_board)
-    db.commit()
-    db.refresh(db_board)
-    
+    # 看板一條 INSERT ... RETURNING、預設欄位一條多列 INSERT ... RETURNING，一次 commit
+    db_board = _returning_one(db, insert(models.Board).values(**board.model_dump(), owner_id=user_id),
+                              schemas.BoardResponse, models.Board)
     # 自動建立預設欄位
-    default_cols = ["Todo", "In Progress", "Done"]
-    for idx, name in enumerate(default_cols):
-        db_col = models.KanbanColumn(board_id=db_board.id, name=name, position=idx)
-        db.add(db_col)
+    columns = _returning(db, insert(models.KanbanColumn).values([
+        {"board_id": db_board["id"], "name": name, "position": idx} for idx, name in enumerate(DEFAULT_COLUMNS)
+    ]), schemas.ColumnResponse, models.KanbanColumn)
     db.commit()
-    
+    stats_cache.invalidate_user(user_id)
+    # 多列 RETURNING 不保證順序
+    db_board["columns"] = sorted(columns, key=lambda c: c["position"])
     return db_board
 
 def get_board_by_id(db: Session, board_id: int):
     return db.query(models.Board).filter(models.Board.id == board_id).first()
 
+def get_board_snapshot(db: Session, board_id: int):
+    # 一次載入看板 + 欄位 + 票券 (固定 3 個查詢)，避免序列化時逐一 lazy load
+    return db.query(models.Board)\
+        .options(
+            selectinload(models.Board.columns),
+            selectinload(models.Board.tickets),
+        )\
+        .filter(models.Board.id == board_id)\
+        .first()
+
+def get_board_snapshot_rows(db: Session, board_id: int):
+    # get_board_snapshot 的快速序列化版本：同樣 3 個查詢，只取 BoardDetailResponse 需要的欄位
+    boards = rows_to_dicts(db.execute(
+        select(*schema_columns(schemas.BoardDetailResponse, models.Board))
+        .where(models.Board.id == board_id)
+    ))
+    if not boards:
+        return None
+    snapshot = boards[0]
+    snapshot["columns"] = rows_to_dicts(db.execute(
+        select(*schema_columns(schemas.ColumnResponse, models.KanbanColumn))
+        .where(models.KanbanColumn.board_id == board_id)
+        .order_by(models.KanbanColumn.position.asc())
+    ))
+    snapshot["tickets"] = rows_to_dicts(db.execute(
+        select(*schema_columns(schemas.TicketResponse, models.Ticket))
+        .where(models.Ticket.board_id == board_id)
+        .order_by(models.Ticket.position.asc())
+    ))
+    return snapshot
+
 # ====== Columns ======
 def create_column(db: Session, column: schemas.ColumnCreate):
-    db_column = models.KanbanColumn(**column.model_dump())
-    db.add(db_column)
-    db.commit()
-    db.refresh(db_column)
+    db_column, versions = _write_one_with_versions(db, insert(models.KanbanColumn).values(**column.model_dump()),
+                                                   schemas.ColumnResponse, models.KanbanColumn)
+    _commit_board_changes(db, ("column.created", column.board_id, [db_column["id"]]), versions=versions)
     return db_column
 
 def get_columns_by_board(db: Session, board_id: int):
@@ -125,88 +360,571 @@ def get_columns_by_board(db: Session, board_id: int):
 # ====== Tickets ======
 def create_ticket(db: Session, ticket: schemas.TicketCreate):
     # 自動計算 Position (放在該欄位最後)
-    max_pos = db.query(func.max(models.Ticket.position))\
-        .filter(models.Ticket.column_id == ticket.column_id)\
-        .scalar() or 0
-    
-    db_ticket = models.Ticket(**ticket.model_dump(), position=max_pos + 1)
-    db.add(db_ticket)
-    db.commit()
-    db.refresh(db_ticket)
+    # 用 subquery 在同一個 INSERT 內計算，不再先查 max 再寫入
+    next_pos = select(func.coalesce(func.max(models.Ticket.position), 0) + POSITION_GAP)\
+        .where(models.Ticket.column_id == ticket.column_id)\
+        .scalar_subquery()
+
+    db_ticket, versions = _write_one_with_versions(db, insert(models.Ticket).values(**ticket.model_dump(), position=next_pos),
+                                                   schemas.TicketResponse, models.Ticket)
+    _commit_board_changes(db, ("ticket.created", ticket.board_id, [db_ticket["id"]]), versions=versions)
     return db_ticket
 
-def get_tickets_by_board(db: Session, board_id: int):
-    return db.query(models.Ticket).filter(models.Ticket.board_id == board_id).all()
+# GET /api/tickets/ 的排序：名稱 -> (keyset 欄位, 是否遞減)。每一種都有對應的索引：
+#   position           (board_id, column_id, position, id)，有 column_id 時同一個索引的前綴
+#   due_date/-due_date (board_id, due_date, id) 或 (column_id, due_date, id)，倒序掃描同一個索引
+# 依到期日排序時沒有到期日的票券不會出現在結果中 (NULL 無法放進 keyset)
+TICKET_SORTS = {
+    "position": ((models.Ticket.column_id, models.Ticket.position, models.Ticket.id), False),
+    "due_date": ((models.Ticket.due_date, models.Ticket.id), False),
+    "-due_date": ((models.Ticket.due_date, models.Ticket.id), True),
+}
 
-def update_ticket(db: Session, ticket_id: int, ticket_update: schemas.TicketUpdate):
-    db_ticket = db.query(models.Ticket).filter(models.Ticket.id == ticket_id).first()
-    if not db_ticket:
-        return None
-    
+def ticket_list_plan(filters: schemas.TicketListFilter):
+    """檢查篩選 / 排序組合能走索引，回傳 (keyset 欄位, 是否遞減)；不行 raise ValueError
+
+    priority 只有少數幾種值，作為索引順序掃描時的額外條件；
+    title 先由全文搜尋索引 (migrations/0007) 找出符合的 id。
+    到期日範圍只有在依到期日排序時才在索引內，其他排序會變成全看板掃描，直接拒絕。
+    """
+    if filters.sort not in TICKET_SORTS:
+        raise ValueError(f"Unknown sort: {filters.sort} (expected one of {', '.join(TICKET_SORTS)})")
+    if (filters.due_from is not None or filters.due_to is not None) and filters.sort == "position":
+        raise ValueError("due_from / due_to require sort=due_date or sort=-due_date")
+    if filters.title is not None and not search.parse_terms(filters.title):
+        raise ValueError("title has no searchable terms")
+    return TICKET_SORTS[filters.sort]
+
+def _ticket_title_criteria(dialect: str, terms: list):
+    if dialect == "postgresql":
+        query = func.to_tsquery(_POSTGRES_CONFIG, search.postgres_title_query(terms))
+        return literal_column("tickets.search_vector").op("@@")(query)
+    fts = literal_column("tickets_fts")
+    matches = select(_TICKETS_FTS.c.rowid).where(fts.op("MATCH")(search.fts5_title_query(terms)))
+    return models.Ticket.id.in_(matches)
+
+def _tickets_page_query(query, board_id: int, after: tuple = None, limit: int = None,
+                        filters: schemas.TicketListFilter = None, dialect: str = None):
+    # after 為上一頁最後一筆的排序鍵 (keyset 分頁)；預設依 (column_id, position, id) 排序
+    filters = filters or schemas.TicketListFilter()
+    keys, descending = ticket_list_plan(filters)
+    query = query.filter(models.Ticket.board_id == board_id)
+    if filters.column_id is not None:
+        query = query.filter(models.Ticket.column_id == filters.column_id)
+    if filters.priority:
+        query = query.filter(models.Ticket.priority.in_(filters.priority))
+    if filters.sort != "position":
+        query = query.filter(models.Ticket.due_date.is_not(None))
+    if filters.due_from is not None:
+        query = query.filter(models.Ticket.due_date >= filters.due_from)
+    if filters.due_to is not None:
+        query = query.filter(models.Ticket.due_date < filters.due_to)
+    if filters.title is not None:
+        query = query.filter(_ticket_title_criteria(dialect, search.parse_terms(filters.title)))
+    query = query.order_by(*(key.desc() if descending else key.asc() for key in keys))
+    if after is not None:
+        query = query.filter(tuple_(*keys) < after if descending else tuple_(*keys) > after)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+def get_tickets_by_board(db: Session, board_id: int, after: tuple = None, limit: int = None,
+                         filters: schemas.TicketListFilter = None):
+    query = db.query(models.Ticket)
+    return _tickets_page_query(query, board_id, after, limit, filters, db.get_bind().dialect.name).all()
+
+def get_ticket_rows_by_board(db: Session, board_id: int, after: tuple = None, limit: int = None,
+                             filters: schemas.TicketListFilter = None):
+    # 快速序列化路徑：只取 TicketResponse 的欄位，回傳 dict (不建立 ORM 物件)
+    query = select(*schema_columns(schemas.TicketResponse, models.Ticket))
+    query = _tickets_page_query(query, board_id, after, limit, filters, db.get_bind().dialect.name)
+    return rows_to_dicts(db.execute(query))
+
+_TICKETS_FTS = table("tickets_fts", column("rowid"))
+_POSTGRES_CONFIG = literal_column("'simple'::regconfig")
+_HEADLINE_TITLE = f"StartSel={search.MARK_START}, StopSel={search.MARK_END}, HighlightAll=true"
+_HEADLINE_SNIPPET = (f"StartSel={search.MARK_START}, StopSel={search.MARK_END},"
+                     " MaxFragments=2, MaxWords=20, MinWords=8, FragmentDelimiter=\" … \"")
+
+def _search_matches(dialect: str, user_id: int, terms: list):
+    # 命中條件：(FROM, WHERE, id 欄位)；PostgreSQL 走 GIN 索引，SQLite 走 FTS5
+    if dialect == "postgresql":
+        query = func.to_tsquery(_POSTGRES_CONFIG, search.postgres_query(terms))
+        source = models.Ticket.__table__.join(models.Board, models.Board.id == models.Ticket.board_id)
+        matches = [models.Board.owner_id == user_id, literal_column("tickets.search_vector").op("@@")(query)]
+        return source, matches, models.Ticket.id
+    source = _TICKETS_FTS\
+        .join(models.Ticket, models.Ticket.id == _TICKETS_FTS.c.rowid)\
+        .join(models.Board, models.Board.id == models.Ticket.board_id)
+    matches = [literal_column("tickets_fts").op("MATCH")(search.fts5_query(terms)), models.Board.owner_id == user_id]
+    return source, matches, _TICKETS_FTS.c.rowid
+
+def _search_boundary(source, matches, id_column):
+    # 第 SEARCH_MAX_CANDIDATES + 1 新的命中 id；沒有 (命中數不超過上限) 時為 NULL
+    # 依 id 由新到舊讀索引，讀到 N + 1 筆就停
+    return select(id_column)\
+        .select_from(source)\
+        .where(*matches)\
+        .order_by(id_column.desc())\
+        .offset(search.SEARCH_MAX_CANDIDATES)\
+        .limit(1)
+
+def _search_statement(dialect: str, user_id: int, terms: list, limit: int, offset: int, after_id: int = None):
+    # 回傳 TicketResponse 欄位 + rank (越大越相關) + 已插入標記的 title_highlight / snippet
+    # 對全部命中計算相關度；after_id 有給時只排序 id 比它大的命中 (SEARCH_MAX_CANDIDATES 的上限)
+    ticket_columns = schema_columns(schemas.TicketResponse, models.Ticket)
+    source, matches, id_column = _search_matches(dialect, user_id, terms)
+    if after_id is not None:
+        matches.append(id_column > after_id)
+    if dialect == "postgresql":
+        query = func.to_tsquery(_POSTGRES_CONFIG, search.postgres_query(terms))
+        rank = func.ts_rank_cd(literal_column("tickets.search_vector"), query)
+        # 先在 GIN 索引上找出這一頁的 id，ts_headline (較貴) 只對這一頁計算
+        hits = select(models.Ticket.id, rank.label("rank"))\
+            .select_from(source)\
+            .where(*matches)\
+            .order_by(rank.desc(), models.Ticket.id.desc())\
+            .limit(limit).offset(offset)\
+            .subquery()
+        return select(
+            *ticket_columns,
+            hits.c.rank,
+            func.ts_headline(_POSTGRES_CONFIG, models.Ticket.title, query, _HEADLINE_TITLE).label("title_highlight"),
+            func.ts_headline(_POSTGRES_CONFIG, models.Ticket.description, query, _HEADLINE_SNIPPET).label("snippet"),
+        ).join_from(hits, models.Ticket, models.Ticket.id == hits.c.id)\
+            .order_by(hits.c.rank.desc(), models.Ticket.id.desc())
+
+    # SQLite FTS5：bm25 越小越相關，標題權重 10、描述 1
+    fts = literal_column("tickets_fts")
+    rank = -func.bm25(fts, 10.0, 1.0)
+    return select(
+        *ticket_columns,
+        rank.label("rank"),
+        func.highlight(fts, 0, search.MARK_START, search.MARK_END).label("title_highlight"),
+        func.snippet(fts, 1, search.MARK_START, search.MARK_END, "…", 16).label("snippet"),
+    ).select_from(source)\
+        .where(*matches)\
+        .order_by(rank.desc(), models.Ticket.id.desc())\
+        .limit(limit).offset(offset)
+
+def search_tickets(db: Session, user_id: int, terms: list, limit: int, offset: int = 0):
+    """
+    全文搜尋使用者所有看板的票券 (title / description)，依相關度排序；回傳 (rows: list[dict], truncated)。
+    預設對全部命中排序。設定 SEARCH_MAX_CANDIDATES 且命中數超過上限時，只排序最新的 N 筆命中，
+    truncated 為 True (較舊的命中沒有參與排序)
+    """
+    dialect = db.get_bind().dialect.name
+    boundary = None
+    if search.SEARCH_MAX_CANDIDATES > 0:
+        boundary = db.scalar(_search_boundary(*_search_matches(dialect, user_id, terms)))
+    statement = _search_statement(dialect, user_id, terms, limit, offset, after_id=boundary)
+    rows = rows_to_dicts(db.execute(statement))
+    for row in rows:
+        row["title_highlight"] = search.highlight(row["title_highlight"])
+        row["snippet"] = search.highlight(row["snippet"]) if row["description"] else None
+    truncated = boundary is not None
+    return rows, truncated
+
+def _timeline_statement(dialect: str, board_id: int, start: datetime, end: datetime, limit: int):
+    # 運算式需與 migrations/0009 的索引一致
+    start_date, due_date = models.Ticket.start_date, models.Ticket.due_date
+    has_dates = (start_date.is_not(None)) | (due_date.is_not(None))
+    if dialect == "postgresql":
+        span_start = func.least(start_date, due_date)
+        span = func.tstzrange(span_start, func.greatest(start_date, due_date), "[]")
+        overlaps = span.op("&&")(func.tstzrange(start, end, "[)"))
+    else:
+        first, second = func.coalesce(start_date, due_date), func.coalesce(due_date, start_date)
+        span_start = func.min(first, second)
+        overlaps = (func.max(first, second) >= start) & (span_start < end)
+    return select(*schema_columns(schemas.TicketResponse, models.Ticket))\
+        .where(models.Ticket.board_id == board_id, has_dates, overlaps)\
+        .order_by(span_start.asc(), models.Ticket.id.asc())\
+        .limit(limit)
+
+def get_ticket_timeline(db: Session, board_id: int, start: datetime, end: datetime, limit: int):
+    # [start_date, due_date] 與 [start, end) 重疊的票券 (dict，依開始時間排序)；多取一筆判斷是否超過 limit
+    statement = _timeline_statement(db.get_bind().dialect.name, board_id, start, end, limit + 1)
+    rows = rows_to_dicts(db.execute(statement))
+    return rows[:limit], len(rows) > limit
+
+def update_ticket(db: Session, ticket_id: int, ticket_update: schemas.TicketUpdate, owner_id: int = None):
+    # owner_id 有給時只更新該使用者看板上的票券 (不符合時同樣回傳 None)
     update_data = ticket_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_ticket, key, value)
-    
+    criteria = [models.Ticket.id == ticket_id]
+    if owner_id is not None:
+        criteria.append(_owned_by(models.Ticket, owner_id))
     # 強制更新時間
-    db_ticket.updated_at = func.now()
-    
-    db.commit()
-    db.refresh(db_ticket)
+    db_ticket, versions = _write_one_with_versions(db, update(models.Ticket)
+        .where(*criteria)
+        .values(**update_data, updated_at=func.now()),
+        schemas.TicketResponse, models.Ticket)
+    if not db_ticket:
+        db.rollback()
+        return None
+
+    event_type = "ticket.moved" if "column_id" in update_data or "position" in update_data else "ticket.updated"
+    _commit_board_changes(db, (event_type, db_ticket["board_id"], [ticket_id]), versions=versions)
     return db_ticket
 
+def move_tickets(db: Session, moves: list):
+    """
+    批次移動 / 排序票券，全部在同一個 transaction 內完成。
+    每個 move 把票券放到目標欄位的第 index 個 (0-based)，只改寫被移動的那一列；
+    欄位的 position 間隔用完時才重排該欄位。
+    回傳 position 或欄位有變動的票券；有票券不存在時回傳 None，欄位不合法時 raise ValueError。
+    """
+    if not moves:
+        return []
+
+    ticket_ids = {m.ticket_id for m in moves}
+    rows = db.query(models.Ticket.id, models.Ticket.board_id, models.Ticket.column_id)\
+        .filter(models.Ticket.id.in_(ticket_ids))\
+        .all()
+    if len(rows) != len(ticket_ids):
+        return None
+    ticket_board = {row.id: row.board_id for row in rows}
+    ticket_column = {row.id: row.column_id for row in rows}
+
+    column_ids = {m.column_id for m in moves} | set(ticket_column.values())
+    column_boards = dict(
+        db.query(models.KanbanColumn.id, models.KanbanColumn.board_id)
+        .filter(models.KanbanColumn.id.in_(column_ids))
+        .all()
+    )
+    for m in moves:
+        if column_boards.get(m.column_id) != ticket_board[m.ticket_id]:
+            raise ValueError(f"Column {m.column_id} does not belong to the ticket's board")
+
+    # 每個相關欄位只查一次排序，之後都在記憶體中計算
+    orders = {column_id: [] for column_id in column_ids}
+    rows = db.query(models.Ticket.id, models.Ticket.column_id, models.Ticket.position)\
+        .filter(models.Ticket.column_id.in_(column_ids))\
+        .order_by(models.Ticket.position.asc(), models.Ticket.id.asc())
+    for row in rows:
+        orders[row.column_id].append([row.id, row.position])
+
+    changed = {}  # ticket_id -> (column_id, position)
+    for m in moves:
+        source = orders[ticket_column[m.ticket_id]]
+        source[:] = [entry for entry in source if entry[0] != m.ticket_id]
+
+        target = orders[m.column_id]
+        index = max(0, min(m.index, len(target)))
+        prev_pos = target[index - 1][1] if index > 0 else None
+        next_pos = target[index][1] if index < len(target) else None
+        entry = [m.ticket_id, position_between(prev_pos, next_pos)]
+        target.insert(index, entry)
+        ticket_column[m.ticket_id] = m.column_id
+
+        if entry[1] is None:
+            # 間隔用完：重排整個目標欄位
+            for e, pos in zip(target, rebalanced_positions(len(target))):
+                e[1] = pos
+                changed[e[0]] = (m.column_id, pos)
+        else:
+            changed[m.ticket_id] = (m.column_id, entry[1])
+
+    # 一次 executemany 寫回所有變動 (直接用 Core table，跳過 ORM 的逐列同步)
+    tickets_table = models.Ticket.__table__
+    stmt = update(tickets_table)\
+        .where(tickets_table.c.id == bindparam("b_id"))\
+        .values(column_id=bindparam("b_column_id"), position=bindparam("b_position"), updated_at=func.now())
+    db.execute(stmt, [
+        {"b_id": ticket_id, "b_column_id": column_id, "b_position": position}
+        for ticket_id, (column_id, position) in changed.items()
+    ])
+    _commit_board_changes(db, *(
+        ("ticket.moved", board_id, ids)
+        for board_id, ids in _group_by_board(
+            (ticket_id, column_boards[column_id]) for ticket_id, (column_id, _) in changed.items()
+        ).items()
+    ))
+    db.expire_all()
+
+    return db.query(models.Ticket)\
+        .filter(models.Ticket.id.in_(changed.keys()))\
+        .order_by(models.Ticket.column_id.asc(), models.Ticket.position.asc())\
+        .all()
+
 def get_ticket(db: Session, ticket_id: int):
     return db.query(models.Ticket).filter(models.Ticket.id == ticket_id).first()
 
-def delete_ticket(db: Session, ticket_id: int):
-    db_ticket = db.query(models.Ticket).filter(models.Ticket.id == ticket_id).first()
-    if db_ticket:
-        db.delete(db_ticket)
-        db.commit()
-    return db_ticket
+def _record_ticket_tombstones(db: Session, board_ids, rows=None, source=None):
+    """
+    記錄被刪除的票券 (增量同步用)，並清掉這些看板過期的 tombstone。
+    rows: [(ticket_id, board_id), ...]；或 source: 回傳 (id, board_id) 的 select (刪除前執行)
+    """
+    columns = ["ticket_id", "board_id"]
+    if source is not None:
+        db.execute(insert(models.TicketTombstone).from_select(columns, source))
+    elif rows:
+        db.execute(insert(models.TicketTombstone), [
+            {"ticket_id": ticket_id, "board_id": board_id} for ticket_id, board_id in rows
+        ])
+    if board_ids:
+        horizon = datetime.now(timezone.utc) - sync.SYNC_TOMBSTONE_RETENTION
+        db.execute(
+            delete(models.TicketTombstone)
+            .where(models.TicketTombstone.board_id.in_(board_ids))
+            .where(models.TicketTombstone.deleted_at < horizon)
+            .execution_options(synchronize_session=False)
+        )
+
+def delete_ticket(db: Session, ticket_id: int, owner_id: int = None):
+    # 單一 DELETE ... RETURNING board_id，不先載入票券；不存在回傳 False (owner_id 同 update_ticket)
+    criteria = [models.Ticket.id == ticket_id]
+    if owner_id is not None:
+        criteria.append(_owned_by(models.Ticket, owner_id))
+    rows, versions = _write_with_versions(db, delete(models.Ticket).where(*criteria), models.Ticket.board_id)
+    if not rows:
+        db.rollback()
+        return False
+    board_id = rows[0]["board_id"]
+    _record_ticket_tombstones(db, [board_id], rows=[(ticket_id, board_id)])
+    _commit_board_changes(db, ("ticket.deleted", board_id, [ticket_id]), versions=versions)
+    ownership_cache.invalidate("ticket", ticket_id)
+    return True
+
+def get_ticket_changes(db: Session, board_id: int, since=None):
+    """
+    增量同步：回傳 since 之後新增 / 更新的票券與被刪除的票券 id。
+    since 為 None 或早於 tombstone 保留期限時回傳整個看板 (reset=True)。
+    查詢走 (board_id, updated_at) 與 (board_id, deleted_at) 索引。
+    """
+    # 以資料庫時鐘為準 (updated_at 也是資料庫寫入的)；since 由 sync.decode_cursor 轉成 aware UTC
+    now = sync.to_utc(db.query(func.now()).scalar())
+    # 比資料庫時鐘還新的 cursor 不可能是我們發出的，同樣整個重新同步
+    reset = since is None or since < now - sync.SYNC_TOMBSTONE_RETENTION or since > now
+
+    # 只取 TicketResponse 的欄位 (dict)；reset 時就是整個看板，不建立 ORM 物件
+    tickets = select(*schema_columns(schemas.TicketResponse, models.Ticket))\
+        .where(models.Ticket.board_id == board_id)
+    deleted = []
+    if not reset:
+        tickets = tickets.where(models.Ticket.updated_at >= since)
+        deleted = db.query(models.TicketTombstone.ticket_id)\
+            .filter(models.TicketTombstone.board_id == board_id)\
+            .filter(models.TicketTombstone.deleted_at >= since)\
+            .distinct()\
+            .all()
+
+    # 下一個 cursor 往回重疊一段時間；重複收到的票券由 client 以 id 覆蓋即可
+    cursor = now - sync.SYNC_CURSOR_OVERLAP
+    if since is not None and not reset:
+        cursor = max(cursor, since)
+    return {
+        "tickets": rows_to_dicts(db.execute(tickets.order_by(models.Ticket.updated_at.asc()))),
+        "deleted": [row.ticket_id for row in deleted],
+        "cursor": sync.encode_cursor(cursor),
+        "reset": reset,
+    }
+
+def _ticket_selector_criteria(selector: schemas.TicketSelector):
+    criteria = []
+    if selector.ids is not None:
+        criteria.append(models.Ticket.id.in_(selector.ids))
+    if selector.board_id is not None:
+        criteria.append(models.Ticket.board_id == selector.board_id)
+    if selector.column_id is not None:
+        criteria.append(models.Ticket.column_id == selector.column_id)
+    if selector.priority is not None:
+        criteria.append(models.Ticket.priority == selector.priority)
+    return criteria
+
+def bulk_delete_tickets(db: Session, selector: schemas.TicketSelector, owner_id: int = None):
+    # 單一 DELETE ... RETURNING，不先把票券載入 session；owner_id 有給時只刪該使用者看板上的票券
+    criteria = _ticket_selector_criteria(selector)
+    if owner_id is not None:
+        criteria.append(_owned_by(models.Ticket, owner_id))
+    rows, versions = _write_with_versions(db, delete(models.Ticket).where(*criteria),
+                                          models.Ticket.id, models.Ticket.board_id)
+    rows = [(row["id"], row["board_id"]) for row in rows]
+    grouped = _group_by_board(rows)
+    _record_ticket_tombstones(db, list(grouped), rows=rows)
+    _commit_board_changes(db, *(("ticket.deleted", board_id, ids) for board_id, ids in grouped.items()),
+                          versions=versions)
+    ids = [ticket_id for ticket_id, _ in rows]
+    ownership_cache.invalidate("ticket", *ids)
+    return ids
+
+def bulk_update_tickets(db: Session, bulk_update: schemas.TicketBulkUpdate, owner_id: int = None):
+    # 單一 UPDATE ... RETURNING；只更新有傳入的欄位 (owner_id 同 bulk_delete_tickets)
+    values = bulk_update.changes.model_dump(exclude_unset=True)
+    criteria = _ticket_selector_criteria(bulk_update)
+    if owner_id is not None:
+        criteria.append(_owned_by(models.Ticket, owner_id))
+    rows, versions = _write_with_versions(db, update(models.Ticket)
+        .where(*criteria)
+        .values(**values, updated_at=func.now()),
+        models.Ticket.id, models.Ticket.board_id)
+    rows = [(row["id"], row["board_id"]) for row in rows]
+    _commit_board_changes(db, *(
+        ("ticket.updated", board_id, ids) for board_id, ids in _group_by_board(rows).items()
+    ), versions=versions)
+    return [ticket_id for ticket_id, _ in rows]
 
 # ====== More Board CRUD ======
-def update_board(db: Session, board_id: int, board_update: schemas.BoardCreate):
-    db_board = db.query(models.Board).filter(models.Board.id == board_id).first()
-    if not db_board:
-        return None
-    for key, value in board_update.model_dump(exclude_unset=True).items():
-        setattr(db_board, key, value)
-    
+def update_board(db: Session, board_id: int, board_update: schemas.BoardCreate, owner_id: int = None):
+    """
+    單一 UPDATE ... RETURNING，同一條 statement 內 version +1；回應的 columns 另外一個查詢。
+    owner_id 有給時只更新該使用者的看板；看板不存在或不是他的都回傳 None (由呼叫端區分)。
+    """
+    criteria = [models.Board.id == board_id]
+    if owner_id is not None:
+        criteria.append(models.Board.owner_id == owner_id)
     # 強制更新時間
-    db_board.updated_at = func.now()
-
-    db.commit()
-    db.refresh(db_board)
+    row = db.execute(
+        update(models.Board)
+        .where(*criteria)
+        .values(**board_update.model_dump(exclude_unset=True), updated_at=func.now(), version=models.Board.version + 1)
+        .returning(*schema_columns(schemas.BoardResponse, models.Board), models.Board.version)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is None:
+        db.rollback()
+        return None
+    db_board = dict(row._mapping)
+    version = db_board.pop("version")
+    db_board["columns"] = rows_to_dicts(db.execute(
+        select(*schema_columns(schemas.ColumnResponse, models.KanbanColumn))
+        .where(models.KanbanColumn.board_id == board_id)
+        .order_by(models.KanbanColumn.position.asc())
+    ))
+    _commit_board_changes(db, ("board.updated", board_id, [board_id]), versions={board_id: version})
     return db_board
 
-def delete_board(db: Session, board_id: int):
-    db_board = db.query(models.Board).filter(models.Board.id == board_id).first()
-    if db_board:
-        db.delete(db_board)
-        db.commit()
-    return db_board
+def delete_board(db: Session, board_id: int, owner_id: int = None):
+    # owner_id 的意義同 update_board
+    criteria = [models.Board.id == board_id]
+    if owner_id is not None:
+        criteria.append(models.Board.owner_id == owner_id)
+    result = db.execute(
+        delete(models.Board).where(*criteria).execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.rollback()
+        return False
+    # 看板本身被刪除，沒有 version 可以 +1；直接通知訂閱者
+    board_events = [events.make_event("board.deleted", board_id, None, [board_id])]
+    events.broker.stage(db, board_events)
+    db.commit()
+    stats_cache.invalidate_board(board_id)
+    ownership_cache.invalidate_board(board_id)
+    events.broker.publish(board_events)
+    return True
 
 # ====== More Column CRUD ======
 def get_column(db: Session, column_id: int):
     return db.query(models.KanbanColumn).filter(models.KanbanColumn.id == column_id).first()
 
-def update_column(db: Session, column_id: int, column_update: schemas.ColumnUpdate):
-    db_column = db.query(models.KanbanColumn).filter(models.KanbanColumn.id == column_id).first()
+def update_column(db: Session, column_id: int, column_update: schemas.ColumnUpdate, owner_id: int = None):
+    # owner_id 有給時只更新該使用者看板上的欄位 (不符合時同樣回傳 None)
+    criteria = [models.KanbanColumn.id == column_id]
+    if owner_id is not None:
+        criteria.append(_owned_by(models.KanbanColumn, owner_id))
+    # 強制更新時間
+    db_column, versions = _write_one_with_versions(db, update(models.KanbanColumn)
+        .where(*criteria)
+        .values(**column_update.model_dump(exclude_unset=True), updated_at=func.now()),
+        schemas.ColumnResponse, models.KanbanColumn)
     if not db_column:
+        db.rollback()
         return None
-    for key, value in column_update.model_dump(exclude_unset=True).items():
-        setattr(db_column, key, value)
-    
-    # 強制更新時間
-    db_column.updated_at = func.now()
-
-    db.commit()
-    db.refresh(db_column)
+    _commit_board_changes(db, ("column.updated", db_column["board_id"], [column_id]), versions=versions)
     return db_column
 
-def delete_column(db: Session, column_id: int):
-    db_column = db.query(models.KanbanColumn).filter(models.KanbanColumn.id == column_id).first()
-    if db_column:
-        db.delete(db_column)
-        db.commit()
-    return db_column
+def delete_column(db: Session, column_id: int, owner_id: int = None):
+    # owner_id 同 update_column
+    criteria = [models.KanbanColumn.id == column_id]
+    if owner_id is not None:
+        criteria.append(_owned_by(models.KanbanColumn, owner_id))
+    # 欄位內的票券會被 ON DELETE CASCADE 刪除，先以 INSERT ... SELECT 寫入 tombstone (不載入票券)
+    _record_ticket_tombstones(db, [], source=select(models.Ticket.id, models.Ticket.board_id)
+                              .where(models.Ticket.column_id == column_id))
+    # RETURNING board_id 用來讓統計快取失效，仍然只有一條 DELETE
+    rows, versions = _write_with_versions(db, delete(models.KanbanColumn).where(*criteria),
+                                          models.KanbanColumn.board_id)
+    if not rows:
+        db.rollback()
+        return False
+    board_id = rows[0]["board_id"]
+    _record_ticket_tombstones(db, [board_id])
+    _commit_board_changes(db, ("column.deleted", board_id, [column_id]), versions=versions)
+    # 欄位內票券的項目留給 TTL：之後的寫入在 WHERE 內找不到票券，一樣是 404
+    ownership_cache.invalidate("column", column_id)
+    return True
+
+# ====== Stats ======
+def get_ticket_stats(db: Session, user_id: int, board_id: int = None, due_soon_days: int = 3):
+    """
+    使用者看板的票券統計 (看板 / 欄位 / 優先級 / 逾期 / 即將到期)。
+    固定 3 個查詢：看板、欄位、依 (column_id, priority) GROUP BY 的票券彙總；不載入任何票券。
+    每個看板 position 最大的欄位視為「完成」，完成的票券不算逾期。
+    """
+    board_query = db.query(models.Board.id, models.Board.name, models.Board.description)\
+        .filter(models.Board.owner_id == user_id)\
+        .order_by(models.Board.id.asc())
+    if board_id is not None:
+        board_query = board_query.filter(models.Board.id == board_id)
+    boards = board_query.all()
+    board_ids = [b.id for b in boards]
+
+    columns = db.query(
+            models.KanbanColumn.id, models.KanbanColumn.board_id, models.KanbanColumn.name,
+            models.KanbanColumn.color, models.KanbanColumn.position,
+        )\
+        .filter(models.KanbanColumn.board_id.in_(board_ids))\
+        .order_by(models.KanbanColumn.position.asc(), models.KanbanColumn.id.asc())\
+        .all() if board_ids else []
+
+    now = datetime.now(timezone.utc)
+    soon = now + timedelta(days=due_soon_days)
+    due = models.Ticket.due_date
+    rows = db.query(
+            models.Ticket.column_id,
+            models.Ticket.priority,
+            func.count(models.Ticket.id),
+            func.sum(case((due < now, 1), else_=0)),
+            func.sum(case(((due >= now) & (due < soon), 1), else_=0)),
+        )\
+        .filter(models.Ticket.board_id.in_(board_ids))\
+        .group_by(models.Ticket.column_id, models.Ticket.priority)\
+        .all() if board_ids else []
+
+    def empty_counts():
+        return {"total": 0, "done": 0, "overdue": 0, "due_soon": 0, "by_priority": {}}
+
+    board_stats = {b.id: {"id": b.id, "name": b.name, "description": b.description,
+                          "columns": [], **empty_counts()} for b in boards}
+    column_stats = {}
+    for col in columns:
+        entry = {"id": col.id, "name": col.name, "color": col.color, "position": col.position,
+                 "ticket_count": 0, "is_done": False}
+        board_stats[col.board_id]["columns"].append(entry)
+        column_stats[col.id] = (col.board_id, entry)
+    for board in board_stats.values():
+        if board["columns"]:
+            board["columns"][-1]["is_done"] = True
+
+    totals = empty_counts()
+    for column_id, priority, count, overdue, due_soon in rows:
+        board_id_, column = column_stats[column_id]
+        column["ticket_count"] += count
+        priority = priority or "medium"
+        for target in (board_stats[board_id_], totals):
+            target["total"] += count
+            target["by_priority"][priority] = target["by_priority"].get(priority, 0) + count
+            if column["is_done"]:
+                target["done"] += count
+            else:
+                target["overdue"] += overdue or 0
+                target["due_soon"] += due_soon or 0
+
+    return {
+        "generated_at": now,
+        "due_soon_days": due_soon_days,
+        "total_boards": len(boards),
+        **totals,
+        "boards": list(board_stats.values()),
+    }
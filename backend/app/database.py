@@ -1,19 +1,63 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.util.concurrency import greenlet_spawn
+from fastapi.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from .pool import engine_options
+
 # 取得資料庫 URL
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
 if not SQLALCHEMY_DATABASE_URL:
     raise ValueError("DATABASE_URL not set in .env file")
 
+# 直連 URL (繞過 transaction pooler)，供 migration / 管理腳本使用；未設定時與 DATABASE_URL 相同
+SQLALCHEMY_DIRECT_DATABASE_URL = os.getenv("DATABASE_DIRECT_URL") or SQLALCHEMY_DATABASE_URL
+
+# Async 模式 (opt-in)：DATABASE_ASYNC=true 時改用 SQLAlchemy async engine + async driver
+# (postgresql -> asyncpg, sqlite -> aiosqlite)，請求不再占用 threadpool，併發量改由連線池決定
+DATABASE_ASYNC = os.getenv("DATABASE_ASYNC", "false").lower() in ("1", "true", "yes")
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str):
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"DATABASE_ASYNC is not supported for {backend}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend])
+
 # 建立引擎
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+if DATABASE_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async_engine = create_async_engine(
+        to_async_url(SQLALCHEMY_DATABASE_URL),
+        **engine_options(SQLALCHEMY_DATABASE_URL, async_mode=True),
+    )
+    # crud 仍使用同步 ORM API；在 greenlet 中執行時，實際 I/O 由 async driver 完成
+    # (與 AsyncSession 內部的做法相同)
+    engine = async_engine.sync_engine
+else:
+    async_engine = None
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+
+# SQLite 預設不檢查外鍵，ON DELETE CASCADE 需要每條連線開啟 foreign_keys
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
 
 # 建立 SessionLocal 類別
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -21,10 +65,26 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # 宣告 Base 類別，供 Models繼承
 Base = declarative_base()
 
+async def run_db(fn, *args, **kwargs):
+    # 在 async 路由中呼叫同步 crud：
+    # async 模式在 event loop 的 greenlet 中執行 (不占 thread)，同步模式丟到 threadpool
+    if DATABASE_ASYNC:
+        return await greenlet_spawn(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, *args, **kwargs)
+
 # Dependency: 取得資料庫連線
-def get_db():
+def _get_sync_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def _get_async_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        await greenlet_spawn(db.close)
+
+get_db = _get_async_db if DATABASE_ASYNC else _get_sync_db
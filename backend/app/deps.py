@@ -1,18 +1,19 @@
 from fastapi import Depends, HTTPException, status
-from fastapi.security import APIKeyHeader
+from fastapi.security import APIKeyHeader, APIKeyQuery
 from sqlalchemy.orm import Session
-from .database import get_db
-from . import crud, models
+from .database import get_db, run_db
+from . import crud
+from .auth_cache import Principal, ownership_cache, principal_cache
+from .metrics import auth_failures
 
 # 定義 Header 格式: Authorization: Token <key>
 # 不過 APIKeyHeader 只會取值，我們需要自己解析 "Token " 前綴
 header_scheme = APIKeyHeader(name="Authorization", auto_error=False)
+query_scheme = APIKeyQuery(name="token", auto_error=False)
 
-def get_current_user(
-    token_header: str = Depends(header_scheme),
-    db: Session = Depends(get_db)
-):
+def parse_token(token_header: str) -> str:
     if not token_header:
+        auth_failures.inc(("missing_token",))
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Missing Authorization Header",
@@ -22,19 +23,106 @@ def get_current_user(
     token = token_header
     if token.startswith("Token "):
         token = token.split(" ")[1]
+    return token
+
+async def get_current_user(
+    token_header: str = Depends(header_scheme),
+    db: Session = Depends(get_db)
+):
+    token = parse_token(token_header)
         
-    user = crud.get_user_by_token(db, token=token)
-    if not user:
+    # 回傳輕量的 Principal (id / username / role)，常見情況直接命中快取，不需任何 I/O
+    principal = principal_cache.get(token)
+    if principal is None:
+        principal = await run_db(crud.get_principal_by_token, db, token=token)
+        if principal:
+            principal_cache.put(token, principal)
+    if not principal:
+        auth_failures.inc(("invalid_token",))
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid Token",
         )
-    return user
+    return principal
+
+async def get_stream_token(
+    token_header: str = Depends(header_scheme),
+    token_query: str = Depends(query_scheme)
+):
+    # 瀏覽器的 EventSource 不能帶 header，串流端點允許改用 ?token=
+    # 只取出 token，驗證交給端點在同一次 DB 呼叫內完成
+    return parse_token(token_header or token_query)
 
-def get_current_admin(current_user: models.User = Depends(get_current_user)):
+def get_current_admin(current_user: Principal = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin privileges required"
         )
     return current_user
+
+# ====== 看板 / 欄位 / 票券的擁有者檢查 ======
+_NOT_FOUND = {"board": "Board not found", "column": "Column not found", "ticket": "Ticket not found"}
+
+def _access_keys(boards, columns, tickets):
+    return [("board", i) for i in boards] + [("column", i) for i in columns] + [("ticket", i) for i in tickets]
+
+def _cached_ownership(keys):
+    found, missing = {}, []
+    for key in keys:
+        ownership = ownership_cache.get(key)
+        if ownership is None:
+            missing.append(key)
+        else:
+            found[key] = ownership
+    return found, missing
+
+def _load_ownership(db: Session, keys):
+    loaded = crud.get_ownership(db, keys)
+    ownership_cache.put_many(loaded)
+    return loaded
+
+def _check_access(principal: Principal, keys, found):
+    for key in keys:
+        if key not in found:
+            raise HTTPException(status_code=404, detail=_NOT_FOUND[key[0]])
+    if any(found[key].owner_id != principal.id for key in keys):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return found
+
+def authorize(db: Session, principal: Principal, boards=(), columns=(), tickets=()):
+    """
+    確認使用者擁有這些看板 / 欄位 / 票券 (欄位與票券看所屬看板的 owner_id)，回傳 {(kind, id): Ownership}。
+    先查行程內快取，未命中的全部以一個 JOIN 查詢取回；不存在 raise 404，不是擁有者 raise 403。
+    給同步 endpoint 檢查 request body 內的 id 用；路徑參數請用 get_ticket_access / get_column_access。
+    """
+    keys = _access_keys(boards, columns, tickets)
+    found, missing = _cached_ownership(keys)
+    if missing:
+        found.update(_load_ownership(db, missing))
+    return _check_access(principal, keys, found)
+
+async def authorize_async(db: Session, principal: Principal, boards=(), columns=(), tickets=()):
+    # authorize 的 async 版本：快取全部命中時不需要任何 I/O
+    keys = _access_keys(boards, columns, tickets)
+    found, missing = _cached_ownership(keys)
+    if missing:
+        found.update(await run_db(_load_ownership, db, missing))
+    return _check_access(principal, keys, found)
+
+async def get_ticket_access(
+    ticket_id: int,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # 路徑上的票券必須在使用者的看板上；回傳 Ownership (board_id / owner_id)
+    found = await authorize_async(db, current_user, tickets=[ticket_id])
+    return found[("ticket", ticket_id)]
+
+async def get_column_access(
+    column_id: int,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    found = await authorize_async(db, current_user, columns=[column_id])
+    return found[("column", column_id)]
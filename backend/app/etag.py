@@ -0,0 +1,27 @@
+from fastapi import Request, Response
+
+# 條件式 GET：ETag 由 boards.version 組成，比對時只需查一個欄位，不載入任何資料列
+
+def board_etag(kind: str, board_id: int, version: int) -> str:
+    # kind 區分同一個看板的不同表示 (快照 / 欄位 / 票券)
+    return f'"{kind}-{board_id}-{version}"'
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match 使用 weak comparison，忽略 W/ 前綴
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    # 瀏覽器會快取回應，但每次都帶 If-None-Match 重新驗證
+    response.headers["Cache-Control"] = "private, no-cache"
+
+def not_modified_response(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
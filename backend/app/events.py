@@ -0,0 +1,200 @@
+"""
+看板即時變動推播 (SSE: GET /api/boards/{id}/events)
+
+crud 的寫入路徑在 _commit_board_changes 產生精簡事件 {type, board_id, version, ids}，
+client 收到後再用增量同步 (?since=) 取回實際資料。
+
+EVENT_BROKER 決定事件如何在 worker 之間傳遞:
+    memory    單一行程：commit 後直接分派給本行程的訂閱者 (預設)
+    postgres  多 worker：在同一個 transaction 內 pg_notify，commit 時 PostgreSQL 才送出；
+              每個 worker 以一條專用連線 LISTEN，收到後分派給自己的訂閱者
+"""
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from sqlalchemy import create_engine, func
+from sqlalchemy import select as sa_select
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+EVENT_BROKER = os.getenv("EVENT_BROKER", "memory").lower()
+EVENT_CHANNEL = "kanban_board_events"
+# 每個訂閱者最多累積幾個未送出的事件；塞滿代表 client 太慢，改送一個 resync
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+# ids 超過這個數量就不列出 (NOTIFY payload 上限 8000 bytes)，client 直接做增量同步
+EVENT_MAX_IDS = int(os.getenv("EVENT_MAX_IDS", "100"))
+
+def make_event(event_type: str, board_id: int, version: int, ids):
+    ids = list(ids)
+    return {
+        "type": event_type,
+        "board_id": board_id,
+        "version": version,
+        "ids": ids if len(ids) <= EVENT_MAX_IDS else None,
+    }
+
+RESYNC_EVENT = {"type": "resync"}
+
+class Subscription:
+    def __init__(self, board_id: int, maxsize: int):
+        self.board_id = board_id
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, event):
+        # 在 event loop 內執行
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # 跟不上就丟掉累積的事件，只留一個 resync 讓 client 重新同步
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+class EventHub:
+    """行程內的訂閱者清單；所有訂閱者共用同一個 event loop"""
+
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.delivered = 0
+        self._subscribers = {}  # board_id -> set(Subscription)
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, board_id: int) -> Subscription:
+        # 必須在 event loop 中呼叫
+        sub = Subscription(board_id, self.queue_size)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers.setdefault(board_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            subs = self._subscribers.get(sub.board_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.board_id]
+
+    def dispatch(self, event):
+        # 任何 thread 都可以呼叫；每個事件只排程一次，在 loop 內再分派給所有訂閱者
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        if event.get("board_id") is not None and event["board_id"] not in self._subscribers:
+            return
+        loop.call_soon_threadsafe(self._fanout, event)
+
+    def _fanout(self, event):
+        with self._lock:
+            if event.get("board_id") is None:
+                targets = [s for subs in self._subscribers.values() for s in subs]
+            else:
+                targets = list(self._subscribers.get(event["board_id"], ()))
+        for sub in targets:
+            sub.deliver(event)
+        self.delivered += len(targets)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "boards": len(self._subscribers),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "delivered": self.delivered,
+            }
+
+hub = EventHub()
+
+class MemoryBroker:
+    name = "memory"
+
+    def stage(self, db, events):
+        pass
+
+    def publish(self, events):
+        # commit 之後才分派，client 收到事件時資料一定已經可讀
+        for event in events:
+            hub.dispatch(event)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+class PostgresBroker:
+    name = "postgres"
+
+    def __init__(self, database_url: str):
+        self.database_url = database_url
+        self._stop = threading.Event()
+        self._thread = None
+
+    def stage(self, db, events):
+        # 在寫入的 transaction 內 NOTIFY：rollback 就不會送出，commit 後所有 worker (含自己) 才收到
+        for event in events:
+            db.execute(sa_select(func.pg_notify(EVENT_CHANNEL, json.dumps(event))))
+
+    def publish(self, events):
+        # 本行程也透過 LISTEN 收到，這裡不重複分派
+        pass
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen_forever, name="event-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _listen_forever(self):
+        # LISTEN 需要 session 層級的連線，必須走直連 URL (transaction pooler 不支援)
+        engine = create_engine(self.database_url, poolclass=NullPool)
+        backoff = 1
+        try:
+            while not self._stop.is_set():
+                try:
+                    self._listen(engine)
+                    backoff = 1
+                except Exception:
+                    logger.exception("Event listener connection lost, retrying in %ss", backoff)
+                    # 斷線期間可能漏掉事件，請所有訂閱者重新同步
+                    hub.dispatch(RESYNC_EVENT)
+                    self._stop.wait(backoff)
+                    backoff = min(backoff * 2, 30)
+        finally:
+            engine.dispose()
+
+    def _listen(self, engine):
+        conn = engine.raw_connection()
+        try:
+            dbapi_conn = conn.driver_connection
+            dbapi_conn.autocommit = True
+            with dbapi_conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {EVENT_CHANNEL}")
+            while not self._stop.is_set():
+                # 最多等 5 秒就回頭檢查是否要停止
+                if select.select([dbapi_conn], [], [], 5) == ([], [], []):
+                    continue
+                dbapi_conn.poll()
+                while dbapi_conn.notifies:
+                    notify = dbapi_conn.notifies.pop(0)
+                    hub.dispatch(json.loads(notify.payload))
+        finally:
+            conn.close()
+
+def _create_broker():
+    if EVENT_BROKER == "postgres":
+        from .database import SQLALCHEMY_DIRECT_DATABASE_URL
+        return PostgresBroker(SQLALCHEMY_DIRECT_DATABASE_URL)
+    if EVENT_BROKER != "memory":
+        raise ValueError(f"Unknown EVENT_BROKER: {EVENT_BROKER}")
+    return MemoryBroker()
+
+broker = _create_broker()
@@ -0,0 +1,123 @@
+"""
+每個請求的 SQL 統計：查詢數、DB 時間、慢查詢與 N+1 偵測
+
+SQLAlchemy 的 cursor 事件把每個 statement 的耗時記到目前請求的 RequestStats (contextvar)；
+threadpool 與 greenlet 都會帶著 contextvar，同步 / async 模式都適用。
+SQLTimingMiddleware 在回應 header 加上:
+    Server-Timing: db;dur=12.3;desc="7 queries", total;dur=45.6
+並在請求結束時記錄慢請求與疑似 N+1 (同一個 statement 重複超過 N_PLUS_ONE_THRESHOLD 次)。
+
+    SERVER_TIMING            是否輸出 Server-Timing header (預設 true)
+    SLOW_QUERY_MS            單一 statement 超過這個時間就記錄 statement 與路由 (預設 200，0 關閉)
+    SLOW_REQUEST_MS          整個請求超過這個時間就記錄查詢數與 DB 時間 (預設 1000，0 關閉)
+    SQL_DETECT_N_PLUS_ONE    開發用：偵測 N+1 (預設 false)
+    N_PLUS_ONE_THRESHOLD     同一個 statement 在一個請求內出現超過幾次算 N+1 (預設 5)
+"""
+import contextvars
+import logging
+import os
+import time
+from collections import Counter
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING = os.getenv("SERVER_TIMING", "true").lower() in ("1", "true", "yes")
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+SQL_DETECT_N_PLUS_ONE = os.getenv("SQL_DETECT_N_PLUS_ONE", "false").lower() in ("1", "true", "yes")
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+def _one_line(statement: str) -> str:
+    return " ".join(statement.split())
+
+class RequestStats:
+    def __init__(self, scope):
+        self.scope = scope
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = Counter() if SQL_DETECT_N_PLUS_ONE else None
+        # SSE 等長連線的總時間沒有意義，不列入慢請求
+        self.streaming = False
+
+    @property
+    def route(self):
+        return f"{self.scope.get('method', '')} {self.scope.get('path', '')}"
+
+    def record(self, statement: str, elapsed: float):
+        self.queries += 1
+        self.db_time += elapsed
+        if self.statements is not None:
+            self.statements[statement] += 1
+        if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+            logger.warning("Slow query (%.1f ms) on %s: %s", elapsed * 1000, self.route, _one_line(statement))
+
+    def server_timing(self) -> str:
+        total = (time.perf_counter() - self.started) * 1000
+        return f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries", total;dur={total:.1f}'
+
+    def finish(self):
+        elapsed = (time.perf_counter() - self.started) * 1000
+        if SLOW_REQUEST_MS and elapsed >= SLOW_REQUEST_MS and not self.streaming:
+            logger.warning("Slow request (%.1f ms) %s: %d queries, %.1f ms in DB",
+                           elapsed, self.route, self.queries, self.db_time * 1000)
+        if self.statements:
+            for statement, count in self.statements.items():
+                if count > N_PLUS_ONE_THRESHOLD:
+                    logger.warning("Possible N+1 on %s: %d x %s", self.route, count, _one_line(statement))
+
+_current = contextvars.ContextVar("request_sql_stats", default=None)
+
+def instrument_engine(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("query_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        # 失敗的 statement 沒有 after_cursor_execute，清掉開始時間
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+class SQLTimingMiddleware:
+    """ASGI middleware：建立每個請求的 RequestStats，回應時加上 Server-Timing"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                stats.streaming = any(
+                    name == b"content-type" and value.startswith(b"text/event-stream") for name, value in headers
+                )
+                if SERVER_TIMING:
+                    headers.append((b"server-timing", stats.server_timing().encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            stats.finish()
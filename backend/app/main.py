@@ -1,12 +1,34 @@
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import auth, boards, columns, tickets, users
-from .database import engine, Base
+from fastapi.responses import JSONResponse
+from sqlalchemy import exc as sa_exc
+from . import events, instrumentation, metrics, profiling
+from .routers import auth, boards, columns, tickets, users, stats, system
+from .routers import metrics as metrics_router
+from .database import async_engine, engine, DATABASE_ASYNC
+from .migrations import run_migrations
+from .passwords import PasswordHasherBusy
 
-# 自動建立資料表 (若不存在)
-Base.metadata.create_all(bind=engine)
+# 啟動時自動套用尚未執行的資料庫遷移 (AUTO_MIGRATE=false 時改為手動執行 `python migrate.py`)
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "true").lower() in ("1", "true", "yes")
 
-app = FastAPI(title="Kanban API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if AUTO_MIGRATE:
+        # 遷移固定走同步 driver，丟到 threadpool 避免卡住 event loop
+        await run_in_threadpool(run_migrations)
+    events.broker.start()
+    metrics.start()
+    yield
+    metrics.stop()
+    events.broker.stop()
+    if DATABASE_ASYNC:
+        await async_engine.dispose()
+
+app = FastAPI(title="Kanban API", version="1.0.0", lifespan=lifespan)
 
 # 設定 CORS (允許前端存取)
 # 設定 CORS (允許前端存取)
@@ -19,14 +41,47 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 讓前端可以讀到分頁 cursor、ETag、Server-Timing 與 profile id
+    expose_headers=["X-Next-Cursor", "Link", "ETag", "Server-Timing", "X-Profile-Id", "X-Profile-Status"],
 )
 
+# 每個請求的查詢數 / DB 時間 (Server-Timing header)、慢查詢與 N+1 記錄
+instrumentation.instrument_engine(engine)
+app.add_middleware(instrumentation.SQLTimingMiddleware)
+# Admin 按需 profile (X-Profile: 1)；未開啟時完全不掛，一般請求沒有額外成本
+if profiling.PROFILER_ENABLED:
+    app.add_middleware(profiling.ProfilerMiddleware)
+# Prometheus 指標 (延遲 / in-flight)；最後加入 = 最外層，量到的時間包含其他 middleware
+app.add_middleware(metrics.MetricsMiddleware)
+
+# 密碼雜湊佇列滿載：回 503 讓 client 稍後重試，而不是卡住整個 server
+@app.exception_handler(PasswordHasherBusy)
+def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+# 連線池耗盡 (pool_timeout 內拿不到連線)：回 503 而不是 500
+@app.exception_handler(sa_exc.TimeoutError)
+def pool_timeout_handler(request: Request, exc: sa_exc.TimeoutError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
 # 註冊 Routers
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(boards.router, prefix="/api/boards", tags=["boards"])
 app.include_router(columns.router, prefix="/api/columns", tags=["columns"])
 app.include_router(tickets.router, prefix="/api/tickets", tags=["tickets"])
+app.include_router(stats.router, prefix="/api/stats", tags=["stats"])
+app.include_router(system.router, prefix="/api/system", tags=["system"])
+if metrics.METRICS_ENABLED:
+    app.include_router(metrics_router.router)
 
 @app.get("/")
 def read_root():
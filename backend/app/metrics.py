@@ -0,0 +1,306 @@
+"""
+Prometheus 格式的 /metrics：請求延遲、進行中的請求、連線池、bcrypt 佇列、認證失敗
+
+記錄只做 dict / list 的加法，不拿任何 lock：
+- HTTP 相關 (延遲、in-flight) 與認證失敗都在 event loop thread 上記錄，只有單一寫入者
+- bcrypt 耗時在 PasswordHasher 原本就有的 lock 內記錄，不額外加鎖
+- 連線池 / bcrypt 佇列等 gauge 在 scrape 時才讀取，不在請求路徑上
+
+多個 uvicorn worker (--workers N) 時每個 process 各自計數，設定 METRICS_DIR 後：
+每個 worker 每 METRICS_FLUSH_INTERVAL 秒把自己的快照寫成 METRICS_DIR/<pid>.json，
+/metrics 由接到 scrape 的 worker 合併所有檔案 (counter / histogram 相加，
+gauge 只加總仍在更新的 worker)。部署 (重啟全部 worker) 前請清空這個目錄。
+
+    METRICS_ENABLED          是否提供 /metrics (預設 true)
+    METRICS_TOKEN            設定後 scrape 需帶 Authorization: Bearer <token>
+    METRICS_DIR              多 worker 時共用的快照目錄 (未設定 = 單一 process，只回報自己)
+    METRICS_FLUSH_INTERVAL   寫入快照的間隔秒數 (預設 5)
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from starlette.routing import replace_params
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PASSWORD_HASH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = {}
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.series = {}    # label 值的 tuple -> 數值
+        _registry[name] = self
+
+    def set(self, labels: tuple, value: float):
+        self.series[labels] = value
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        self.series[labels] = self.series.get(labels, 0) + amount
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        self.series[labels] = self.series.get(labels, 0) + amount
+
+    def dec(self, labels: tuple = (), amount: float = 1):
+        self.series[labels] = self.series.get(labels, 0) - amount
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, labels: tuple, value: float):
+        # series: 各 bucket 的 (非累加) 計數 + 超過最大 bucket 的計數 + 總和
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+http_request_duration = Histogram(
+    "kanban_http_request_duration_seconds", "HTTP request latency by route template and status",
+    labels=("method", "route", "status"),
+)
+http_requests_in_flight = Gauge("kanban_http_requests_in_flight", "HTTP requests currently being served (excluding SSE streams)")
+auth_failures = Counter("kanban_auth_failures_total", "Rejected authentication attempts", labels=("reason",))
+password_hash_duration = Histogram(
+    "kanban_password_hash_duration_seconds", "bcrypt hash / verify time including queue wait",
+    buckets=PASSWORD_HASH_BUCKETS,
+)
+password_hash_queue_depth = Gauge("kanban_password_hash_queue_depth", "bcrypt jobs waiting for a worker")
+password_hash_in_flight = Gauge("kanban_password_hash_in_flight", "bcrypt jobs queued or running")
+password_hash_workers = Gauge("kanban_password_hash_workers", "bcrypt executor workers")
+password_hash_rejected = Counter("kanban_password_hash_rejected_total", "bcrypt jobs rejected with 503 (queue full or timed out)")
+db_pool_size = Gauge("kanban_db_pool_size", "Configured connection pool size")
+db_pool_checked_out = Gauge("kanban_db_pool_checked_out", "Connections currently checked out")
+db_pool_checked_in = Gauge("kanban_db_pool_checked_in", "Idle connections in the pool")
+db_pool_overflow = Gauge("kanban_db_pool_overflow", "Overflow connections currently open")
+db_pool_checkouts = Counter("kanban_db_pool_checkouts_total", "Successful connection checkouts")
+db_pool_wait = Counter("kanban_db_pool_wait_seconds_total", "Time spent waiting for a connection")
+db_pool_timeouts = Counter("kanban_db_pool_timeouts_total", "Checkouts that hit pool_timeout")
+event_subscribers = Gauge("kanban_event_subscribers", "Open SSE board event streams")
+
+def _collect():
+    # Scrape / 寫快照時才讀取的數值；延遲 import 避免 passwords -> metrics 的循環 import
+    from .database import engine
+    from .events import hub
+    from .passwords import hasher
+    from .pool import pool_status
+
+    status = pool_status(engine)
+    for metric, key in ((db_pool_size, "size"), (db_pool_checked_out, "checked_out"),
+                        (db_pool_checked_in, "checked_in"), (db_pool_overflow, "overflow"),
+                        (db_pool_checkouts, "checkouts"), (db_pool_wait, "wait_seconds_total"),
+                        (db_pool_timeouts, "timeouts")):
+        # NullPool (外部 pooler) 沒有 size / checked_out 等數值
+        if key in status:
+            metric.set((), status[key])
+
+    stats = hasher.stats()
+    password_hash_queue_depth.set((), stats["queue_depth"])
+    password_hash_in_flight.set((), stats["in_flight"])
+    password_hash_workers.set((), stats["workers"])
+    password_hash_rejected.set((), stats["rejected"])
+    event_subscribers.set((), hub.stats()["subscribers"])
+
+def snapshot() -> dict:
+    _collect()
+    return {
+        "pid": os.getpid(),
+        "time": time.time(),
+        # 先複製 (histogram 的 list 也是)，寫檔途中 event loop 繼續記錄也不受影響
+        "metrics": {name: [[list(labels), list(value) if isinstance(value, list) else value]
+                           for labels, value in list(metric.series.items())]
+                    for name, metric in _registry.items()},
+    }
+
+# --- 多 worker 彙總 ---------------------------------------------------------
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(METRICS_DIR, f"{pid}.json")
+
+def _write_snapshot(data: dict):
+    path = _snapshot_path(data["pid"])
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    # rename 是 atomic 的，讀取端不會看到寫一半的檔案
+    os.replace(tmp, path)
+
+def _read_snapshots(exclude_pid: int) -> list:
+    snapshots = []
+    for filename in os.listdir(METRICS_DIR):
+        if not filename.endswith(".json") or filename == f"{exclude_pid}.json":
+            continue
+        try:
+            with open(os.path.join(METRICS_DIR, filename)) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            # 另一個 worker 剛好在替換檔案，下次 scrape 再算
+            continue
+    return snapshots
+
+def _merge(snapshots: list) -> dict:
+    # counter / histogram 相加 (已結束的 worker 也算，數值不會倒退)；
+    # gauge 只加總還在寫快照的 worker，已停止或超過 3 個間隔沒更新的視為不存在
+    now = time.time()
+    merged = {name: {} for name in _registry}
+    for data in snapshots:
+        live = data.get("live", True) and now - data["time"] <= METRICS_FLUSH_INTERVAL * 3
+        for name, series in data["metrics"].items():
+            metric = _registry.get(name)
+            if metric is None or (metric.kind == "gauge" and not live):
+                continue
+            target = merged[name]
+            for labels, value in series:
+                key = tuple(labels)
+                if metric.kind == "histogram":
+                    current = target.get(key)
+                    if current is None or len(current) != len(value):
+                        target[key] = list(value)
+                    else:
+                        target[key] = [a + b for a, b in zip(current, value)]
+                else:
+                    target[key] = target.get(key, 0) + value
+    return merged
+
+# --- 輸出 -------------------------------------------------------------------
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _label_text(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render(merged: dict) -> str:
+    lines = []
+    for name, metric in _registry.items():
+        series = merged.get(name) or {}
+        lines.append(f"# HELP {name} {metric.help}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for labels, value in sorted(series.items()):
+            if metric.kind != "histogram":
+                lines.append(f"{name}{_label_text(metric.labels, labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric.buckets + ("+Inf",), value[:-1]):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{name}_bucket{_label_text(metric.labels, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_label_text(metric.labels, labels)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_label_text(metric.labels, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+async def exposition() -> str:
+    # 自己的快照在 event loop thread 上即時取得，其他 worker 的檔案丟到 threadpool 讀
+    own = snapshot()
+    others = await asyncio.to_thread(_read_snapshots, own["pid"]) if METRICS_DIR else []
+    return render(_merge([own] + others))
+
+# --- 定期寫快照 (lifespan 內啟動) -------------------------------------------
+
+_flush_task = None
+
+async def _flush_forever():
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(_write_snapshot, snapshot())
+        except OSError:
+            logger.exception("Failed to write metrics snapshot to %s", METRICS_DIR)
+
+def start():
+    global _flush_task
+    if METRICS_ENABLED and METRICS_DIR:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        _write_snapshot(snapshot())
+        _flush_task = asyncio.get_running_loop().create_task(_flush_forever())
+
+def stop():
+    global _flush_task
+    if _flush_task is None:
+        return
+    _flush_task.cancel()
+    _flush_task = None
+    # 最後一次寫入：counter 保留給之後的 scrape，gauge 標記為已停止
+    try:
+        _write_snapshot({**snapshot(), "live": False})
+    except OSError:
+        logger.exception("Failed to write metrics snapshot to %s", METRICS_DIR)
+
+# --- ASGI middleware --------------------------------------------------------
+
+def route_template(scope) -> str:
+    # 用路由樣板 (/api/boards/{board_id}) 當 label，避免每個 id 產生一條 series
+    route = scope.get("route")
+    if route is None or not hasattr(route, "path_format"):
+        return "unmatched"
+    # include_router 的 prefix 不在 route.path 上，從實際路徑扣掉路由本身的部分補回來
+    path = scope.get("path", "")
+    suffix, _ = replace_params(route.path_format, route.param_convertors, dict(scope.get("path_params", {})))
+    prefix = path[: len(path) - len(suffix)] if path.endswith(suffix) else ""
+    return prefix + route.path
+
+class MetricsMiddleware:
+    """ASGI middleware：記錄每個請求的延遲 (依路由樣板與狀態碼) 與進行中的請求數"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        state = {"status": 500, "streaming": False}
+        http_requests_in_flight.inc()
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                if any(name == b"content-type" and value.startswith(b"text/event-stream")
+                       for name, value in message.get("headers", [])):
+                    # SSE 是長連線，不算進 in-flight 與延遲 (另有 kanban_event_subscribers)
+                    state["streaming"] = True
+                    http_requests_in_flight.dec()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            if not state["streaming"]:
+                http_requests_in_flight.dec()
+                http_request_duration.observe(
+                    (scope["method"], route_template(scope), str(state["status"])),
+                    time.perf_counter() - started,
+                )
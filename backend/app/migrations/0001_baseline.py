@@ -0,0 +1,78 @@
+"""初始 schema (原本由 Base.metadata.create_all + migrate_dates.py 建立)"""
+from sqlalchemy import (
+    BigInteger, Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text, inspect, text,
+)
+from sqlalchemy.sql import func
+
+description = "baseline schema (users, auth_tokens, boards, columns, tickets)"
+
+# 凍結的 schema 定義：之後 models.py 的變動要寫成新的遷移，不要回頭改這裡
+BigIntId = BigInteger().with_variant(Integer, "sqlite")
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", BigIntId, primary_key=True, index=True),
+    Column("username", String(50), unique=True, nullable=False),
+    Column("password_hash", String(255), nullable=False),
+    Column("name", String(100), nullable=False),
+    Column("email", String(255), unique=True),
+    Column("role", String(20), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "auth_tokens", metadata,
+    Column("id", BigIntId, primary_key=True, index=True),
+    Column("token", String(64), unique=True, nullable=False),
+    Column("user_id", BigInteger, ForeignKey("users.id"), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "boards", metadata,
+    Column("id", BigIntId, primary_key=True, index=True),
+    Column("name", String(100), nullable=False),
+    Column("description", Text),
+    Column("owner_id", BigInteger, ForeignKey("users.id"), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "columns", metadata,
+    Column("id", BigIntId, primary_key=True, index=True),
+    Column("board_id", BigInteger, ForeignKey("boards.id"), nullable=False),
+    Column("name", String(100), nullable=False),
+    Column("color", String(20)),
+    Column("position", Integer, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "tickets", metadata,
+    Column("id", BigIntId, primary_key=True, index=True),
+    Column("board_id", BigInteger, ForeignKey("boards.id"), nullable=False),
+    Column("column_id", BigInteger, ForeignKey("columns.id"), nullable=False),
+    Column("title", String(255), nullable=False),
+    Column("description", Text),
+    Column("priority", String(20)),
+    Column("start_date", DateTime(timezone=True), nullable=True),
+    Column("due_date", DateTime(timezone=True), nullable=True),
+    Column("position", Integer),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+def upgrade(conn):
+    # 既有資料庫已經有這些表，checkfirst 只會補建不存在的
+    metadata.create_all(conn, checkfirst=True)
+
+    # 舊資料庫可能還沒跑過 migrate_dates.py
+    existing = {c["name"] for c in inspect(conn).get_columns("tickets")}
+    for name in ("start_date", "due_date"):
+        if name not in existing:
+            col_type = "TIMESTAMP WITH TIME ZONE" if conn.dialect.name == "postgresql" else "TIMESTAMP"
+            conn.execute(text(f"ALTER TABLE tickets ADD COLUMN {name} {col_type}"))
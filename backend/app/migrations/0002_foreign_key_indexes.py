@@ -0,0 +1,24 @@
+"""外鍵與常用查詢的索引"""
+from . import create_index
+
+description = "indexes on foreign keys, (column_id, position) and (board_id, updated_at)"
+
+# CREATE INDEX CONCURRENTLY 不能在 transaction 內執行
+transactional = False
+
+INDEXES = [
+    # get_columns_by_board / 刪除 board 時的 cascade
+    ("ix_columns_board_id", "columns", ["board_id"]),
+    # get_boards
+    ("ix_boards_owner_id", "boards", ["owner_id"]),
+    # 刪除 user 時的 cascade
+    ("ix_auth_tokens_user_id", "auth_tokens", ["user_id"]),
+    # 欄位內排序、create_ticket 的 max(position)；也涵蓋只用 column_id 的查詢與 cascade
+    ("ix_tickets_column_id_position", "tickets", ["column_id", "position"]),
+    # get_tickets_by_board 與依更新時間的增量查詢；也涵蓋只用 board_id 的查詢與 cascade
+    ("ix_tickets_board_id_updated_at", "tickets", ["board_id", "updated_at"]),
+]
+
+def upgrade(conn):
+    for name, table, columns in INDEXES:
+        create_index(conn, name, table, columns)
@@ -0,0 +1,65 @@
+"""外鍵改成 ON DELETE CASCADE，刪除 user / board / column 時由資料庫一次刪掉子資料"""
+import re
+from sqlalchemy import inspect, text
+
+description = "ON DELETE CASCADE on all foreign keys"
+
+# (table, column, referred table)
+FOREIGN_KEYS = [
+    ("auth_tokens", "user_id", "users"),
+    ("boards", "owner_id", "users"),
+    ("columns", "board_id", "boards"),
+    ("tickets", "board_id", "boards"),
+    ("tickets", "column_id", "columns"),
+]
+
+_REFERENCES_RE = re.compile(r"REFERENCES\s+\"?(\w+)\"?\s*\(\s*\"?id\"?\s*\)(?!\s+ON DELETE)", re.IGNORECASE)
+
+def _upgrade_postgresql(conn):
+    inspector = inspect(conn)
+    for table, column, referred in FOREIGN_KEYS:
+        for fk in inspector.get_foreign_keys(table):
+            if fk["constrained_columns"] != [column]:
+                continue
+            if (fk.get("options") or {}).get("ondelete", "").upper() == "CASCADE":
+                continue
+            name = fk["name"]
+            # 同一個 ALTER 內 drop + add，不會有沒有外鍵的空窗
+            conn.execute(text(
+                f'ALTER TABLE {table} DROP CONSTRAINT "{name}", '
+                f'ADD CONSTRAINT "{name}" FOREIGN KEY ({column}) REFERENCES {referred} (id) ON DELETE CASCADE'
+            ))
+
+def _upgrade_sqlite(conn):
+    # SQLite 不能修改既有的外鍵，照官方流程重建表: 建新表 -> 複製 -> 刪舊表 -> 改名 -> 補回索引
+    # (遷移用的連線沒有開 PRAGMA foreign_keys，過程中不會觸發 cascade)
+    for table in dict.fromkeys(t for t, _, _ in FOREIGN_KEYS):
+        create_sql = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": table}
+        ).scalar()
+        if not _REFERENCES_RE.search(create_sql):
+            continue
+        index_sqls = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = :name AND sql IS NOT NULL"),
+            {"name": table},
+        ).scalars().all()
+
+        new_table = f"{table}_new"
+        new_sql = _REFERENCES_RE.sub(lambda m: f"{m.group(0)} ON DELETE CASCADE", create_sql)
+        new_sql = re.sub(rf"^CREATE TABLE\s+\"?{table}\"?", f"CREATE TABLE {new_table}", new_sql, count=1)
+        conn.execute(text(new_sql))
+        conn.execute(text(f"INSERT INTO {new_table} SELECT * FROM {table}"))
+        conn.execute(text(f"DROP TABLE {table}"))
+        conn.execute(text(f"ALTER TABLE {new_table} RENAME TO {table}"))
+        for index_sql in index_sqls:
+            conn.execute(text(index_sql))
+
+    violations = conn.execute(text("PRAGMA foreign_key_check")).all()
+    if violations:
+        raise RuntimeError(f"Foreign key violations after rebuild: {violations[:5]}")
+
+def upgrade(conn):
+    if conn.dialect.name == "postgresql":
+        _upgrade_postgresql(conn)
+    else:
+        _upgrade_sqlite(conn)
@@ -0,0 +1,10 @@
+"""boards.version：看板內容的版本號，用於 ETag / If-None-Match"""
+from sqlalchemy import inspect, text
+
+description = "boards.version counter for conditional GETs"
+
+def upgrade(conn):
+    existing = {c["name"] for c in inspect(conn).get_columns("boards")}
+    if "version" not in existing:
+        # 常數預設值在 PostgreSQL 11+ 不需要改寫整張表
+        conn.execute(text("ALTER TABLE boards ADD COLUMN version BIGINT NOT NULL DEFAULT 0"))
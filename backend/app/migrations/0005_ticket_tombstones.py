@@ -0,0 +1,24 @@
+"""ticket_tombstones：記錄已刪除的票券，供增量同步使用"""
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, MetaData, Table
+from sqlalchemy.sql import func
+
+description = "ticket_tombstones table for delta sync"
+
+# 凍結的 schema 定義
+BigIntId = BigInteger().with_variant(Integer, "sqlite")
+metadata = MetaData()
+
+Table("boards", metadata, Column("id", BigIntId, primary_key=True))
+
+Table(
+    "ticket_tombstones", metadata,
+    Column("id", BigIntId, primary_key=True),
+    Column("ticket_id", BigInteger, nullable=False),
+    Column("board_id", BigInteger, ForeignKey("boards.id", ondelete="CASCADE"), nullable=False),
+    Column("deleted_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Index("ix_ticket_tombstones_board_id_deleted_at", "board_id", "deleted_at"),
+)
+
+def upgrade(conn):
+    # 新表是空的，索引直接在 transaction 內建立即可
+    metadata.tables["ticket_tombstones"].create(conn, checkfirst=True)
@@ -0,0 +1,11 @@
+"""票券 keyset 分頁的索引"""
+from . import create_index
+
+description = "index on tickets (board_id, column_id, position, id) for keyset pagination"
+
+# CREATE INDEX CONCURRENTLY 不能在 transaction 內執行
+transactional = False
+
+def upgrade(conn):
+    # GET /api/tickets/?board_id=&cursor=：board_id 等值 + (column_id, position, id) 範圍，每頁直接從索引定位
+    create_index(conn, "ix_tickets_board_id_column_id_position", "tickets", ["board_id", "column_id", "position", "id"])
@@ -0,0 +1,48 @@
+"""票券全文搜尋：PostgreSQL 用 tsvector + GIN，SQLite 用 FTS5"""
+from sqlalchemy import text
+from . import create_index
+
+description = "full-text search on tickets (tsvector + GIN on PostgreSQL, FTS5 on SQLite)"
+
+# CREATE INDEX CONCURRENTLY 不能在 transaction 內執行
+transactional = False
+
+# 'simple' 不做 stemming，中英文混雜的內容都能用前綴比對；標題權重 A、描述權重 B
+POSTGRES_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A')"
+    " || setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+SQLITE_STATEMENTS = [
+    # external content：不重複存放內文，只存索引；prefix='2 3' 讓短前綴查詢也走索引
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tickets_fts USING fts5("
+    " title, description, content='tickets', content_rowid='id',"
+    " tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS tickets_fts_ai AFTER INSERT ON tickets BEGIN"
+    " INSERT INTO tickets_fts (rowid, title, description) VALUES (new.id, new.title, new.description);"
+    " END",
+    # ON DELETE CASCADE 刪掉的票券也會觸發
+    "CREATE TRIGGER IF NOT EXISTS tickets_fts_ad AFTER DELETE ON tickets BEGIN"
+    " INSERT INTO tickets_fts (tickets_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);"
+    " END",
+    # 只有標題 / 描述變動才需要重建；拖拉排序 (position / column_id) 不影響索引
+    "CREATE TRIGGER IF NOT EXISTS tickets_fts_au AFTER UPDATE OF title, description ON tickets BEGIN"
+    " INSERT INTO tickets_fts (tickets_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);"
+    " INSERT INTO tickets_fts (rowid, title, description) VALUES (new.id, new.title, new.description);"
+    " END",
+    # 既有的票券
+    "INSERT INTO tickets_fts (tickets_fts) VALUES ('rebuild')",
+]
+
+def upgrade(conn):
+    if conn.dialect.name == "postgresql":
+        # generated column 由資料庫在每次寫入時維護，應用程式不需要處理
+        # 注意：加入 STORED generated column 會重寫整張 tickets 表
+        conn.execute(text(
+            "ALTER TABLE tickets ADD COLUMN IF NOT EXISTS search_vector tsvector"
+            f" GENERATED ALWAYS AS ({POSTGRES_SEARCH_VECTOR}) STORED"
+        ))
+        create_index(conn, "ix_tickets_search_vector", "tickets", ["search_vector"], using="gin")
+    else:
+        for statement in SQLITE_STATEMENTS:
+            conn.execute(text(statement))
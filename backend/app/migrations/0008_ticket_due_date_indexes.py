@@ -0,0 +1,18 @@
+"""依到期日排序 / 篩選票券的索引"""
+from . import create_index
+
+description = "indexes on tickets (board_id, due_date, id) and (column_id, due_date, id) for server-side sort/filter"
+
+# CREATE INDEX CONCURRENTLY 不能在 transaction 內執行
+transactional = False
+
+INDEXES = [
+    # GET /api/tickets/?board_id=&sort=due_date&due_from=&due_to=：到期日範圍 + 排序都在索引內
+    ("ix_tickets_board_id_due_date", "tickets", ["board_id", "due_date", "id"]),
+    # 同上再加 column_id=：column 已決定 board，直接以 column_id 開頭
+    ("ix_tickets_column_id_due_date", "tickets", ["column_id", "due_date", "id"]),
+]
+
+def upgrade(conn):
+    for name, table, columns in INDEXES:
+        create_index(conn, name, table, columns)
@@ -0,0 +1,28 @@
+"""時間軸 (GET /api/tickets/timeline) 的區間重疊索引"""
+from . import create_index
+
+description = "interval-overlap index on tickets [start_date, due_date] (GiST range on PostgreSQL, composite on SQLite)"
+
+# CREATE INDEX CONCURRENTLY 不能在 transaction 內執行
+transactional = False
+
+# 只有一端的票券視為單點；start_date > due_date 的資料以 least / greatest 修正，不會讓 tstzrange 出錯
+# 兩端都是 NULL 的票券不在時間軸上 (NULL 邊界的 range 是無限大)，用 partial index 排除；
+# 查詢需帶同樣的條件 planner 才會選用
+HAS_DATES = "start_date IS NOT NULL OR due_date IS NOT NULL"
+
+POSTGRES_SPAN = "tstzrange(LEAST(start_date, due_date), GREATEST(start_date, due_date), '[]')"
+
+# SQLite 沒有 range 型別：用 (board_id, 結束, 開始) 的運算式索引，
+# 以「結束 >= 視窗開始」掃描索引範圍、「開始 < 視窗結束」在索引內過濾。
+# 多參數的 min / max 在 SQLite 是純量函式，與 crud 的查詢運算式一致才會用到索引
+SQLITE_SPAN_START = "min(coalesce(start_date, due_date), coalesce(due_date, start_date))"
+SQLITE_SPAN_END = "max(coalesce(start_date, due_date), coalesce(due_date, start_date))"
+
+def upgrade(conn):
+    if conn.dialect.name == "postgresql":
+        # 看板條件由 (board_id, ...) 的 btree 索引做 bitmap AND，不需要 btree_gist extension
+        create_index(conn, "ix_tickets_timeline", "tickets", [POSTGRES_SPAN], using="gist", where=HAS_DATES)
+    else:
+        create_index(conn, "ix_tickets_timeline", "tickets", ["board_id", SQLITE_SPAN_END, SQLITE_SPAN_START],
+                     where=HAS_DATES)
@@ -0,0 +1,110 @@
+"""
+版本化資料庫遷移
+
+每個遷移是本目錄下的 `NNNN_<name>.py`，提供:
+    description: str
+    transactional: bool = True   # False 時以 AUTOCOMMIT 執行 (例如 CREATE INDEX CONCURRENTLY)
+    def upgrade(conn): ...
+
+已套用的版本記錄在 schema_migrations 表。PostgreSQL 上以 advisory lock 確保
+多個 worker 同時啟動時只有一個在跑遷移；SQLite 直接依序執行。
+"""
+import importlib
+import pkgutil
+import re
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+MIGRATION_LOCK_ID = 728_431_001  # pg_advisory_lock 的任意固定 key
+
+_MODULE_RE = re.compile(r"^(\d{4})_(\w+)$")
+
+def discover():
+    migrations = []
+    for info in pkgutil.iter_modules(__path__):
+        match = _MODULE_RE.match(info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{__name__}.{info.name}")
+        migrations.append((int(match.group(1)), match.group(2), module))
+    return sorted(migrations, key=lambda m: m[0])
+
+def _ensure_version_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            " version INTEGER PRIMARY KEY,"
+            " name VARCHAR(255) NOT NULL,"
+            " applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+            ")"
+        ))
+
+def applied_versions(engine):
+    _ensure_version_table(engine)
+    with engine.connect() as conn:
+        return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+def _apply(engine, version, name, module):
+    record = text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)")
+    if getattr(module, "transactional", True):
+        with engine.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(record, {"version": version, "name": name})
+    else:
+        # CONCURRENTLY 之類的語句不能包在 transaction 內
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            module.upgrade(conn)
+            conn.execute(record, {"version": version, "name": name})
+
+def run_migrations(database_url=None, log=print):
+    """套用所有尚未執行的遷移，回傳本次套用的版本列表"""
+    if database_url is None:
+        from ..database import SQLALCHEMY_DIRECT_DATABASE_URL
+        database_url = SQLALCHEMY_DIRECT_DATABASE_URL
+
+    # 遷移固定用同步 driver + 直連 URL (不經 transaction pooler)
+    engine = create_engine(database_url, poolclass=NullPool)
+    is_postgres = engine.dialect.name == "postgresql"
+    applied_now = []
+    try:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+            if is_postgres:
+                lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            try:
+                # 取得 lock 後再讀版本，其他 worker 可能已經跑完
+                done = applied_versions(engine)
+                for version, name, module in discover():
+                    if version in done:
+                        continue
+                    log(f"Applying migration {version:04d}_{name}: {module.description}")
+                    _apply(engine, version, name, module)
+                    applied_now.append(version)
+            finally:
+                if is_postgres:
+                    lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+    finally:
+        engine.dispose()
+    return applied_now
+
+# ===== 遷移檔共用的 helper =====
+
+def create_index(conn, name, table, columns, using=None, where=None):
+    """建立索引：PostgreSQL 使用 CONCURRENTLY (不鎖表)，SQLite 直接建立。
+
+    PostgreSQL 上的遷移需設定 transactional = False。using 指定索引類型 (例如 gin)，只用於 PostgreSQL。
+    columns 也可以是運算式；where 建立 partial index。
+    """
+    cols = ", ".join(columns)
+    predicate = f" WHERE {where}" if where else ""
+    if conn.dialect.name == "postgresql":
+        # 先前中斷的 CONCURRENTLY 會留下 INVALID 索引，IF NOT EXISTS 會直接略過，要先清掉
+        invalid = conn.execute(text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+            " WHERE c.relname = :name AND NOT i.indisvalid"
+        ), {"name": name}).first()
+        if invalid:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        method = f" USING {using}" if using else ""
+        conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table}{method} ({cols}){predicate}"))
+    else:
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({cols}){predicate}"))
@@ -1,12 +1,18 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, BigInteger, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, BigInteger, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base
 
+# SQLite 只有 INTEGER PRIMARY KEY 會自動遞增；其他資料庫維持 BIGINT
+BigIntId = BigInteger().with_variant(Integer, "sqlite")
+
+# 子資料的刪除交給資料庫的 ON DELETE CASCADE (migrations/0003)；
+# passive_deletes=True 讓 ORM 刪除父物件時不再先載入所有子物件
+
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigIntId, primary_key=True, index=True)
     username = Column(String(50), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     name = Column(String(100), nullable=False)
@@ -15,15 +21,15 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    tokens = relationship("AuthToken", back_populates="user", cascade="all, delete-orphan")
-    owned_boards = relationship("Board", back_populates="owner", cascade="all, delete-orphan")
+    tokens = relationship("AuthToken", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    owned_boards = relationship("Board", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
 
 class AuthToken(Base):
     __tablename__ = "auth_tokens"
 
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigIntId, primary_key=True, index=True)
     token = Column(String(64), unique=True, nullable=False)
-    user_id = Column(BigInteger, ForeignKey("users.id"), nullable=False)
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="tokens")
@@ -31,22 +37,24 @@ class AuthToken(Base):
 class Board(Base):
     __tablename__ = "boards"
 
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigIntId, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
     description = Column(Text)
-    owner_id = Column(BigInteger, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # 看板 / 欄位 / 票券每次寫入都 +1，作為 ETag (migrations/0004)
+    version = Column(BigInteger, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     owner = relationship("User", back_populates="owned_boards")
-    columns = relationship("KanbanColumn", back_populates="board", cascade="all, delete-orphan", order_by="KanbanColumn.position")
-    tickets = relationship("Ticket", back_populates="board", cascade="all, delete-orphan")
+    columns = relationship("KanbanColumn", back_populates="board", cascade="all, delete-orphan", passive_deletes=True, order_by="KanbanColumn.position")
+    tickets = relationship("Ticket", back_populates="board", cascade="all, delete-orphan", passive_deletes=True, order_by="Ticket.position")
 
 class KanbanColumn(Base):
     __tablename__ = "columns"
 
-    id = Column(BigInteger, primary_key=True, index=True)
-    board_id = Column(BigInteger, ForeignKey("boards.id"), nullable=False)
+    id = Column(BigIntId, primary_key=True, index=True)
+    board_id = Column(BigInteger, ForeignKey("boards.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     color = Column(String(20), default="slate")
     position = Column(Integer, default=0, nullable=False)
@@ -54,14 +62,25 @@ class KanbanColumn(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     board = relationship("Board", back_populates="columns")
-    tickets = relationship("Ticket", back_populates="column", cascade="all, delete-orphan")
+    tickets = relationship("Ticket", back_populates="column", cascade="all, delete-orphan", passive_deletes=True)
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    # 索引由 migrations/0002、0006、0008 建立；board_id / column_id 單欄查詢由複合索引的前綴涵蓋
+    # 時間軸的區間索引 (migrations/0009) 是運算式索引，各資料庫不同，不列在這裡
+    # 全文搜尋 (migrations/0007)：PostgreSQL 的 search_vector generated column、SQLite 的 tickets_fts，
+    # 都由資料庫維護，不對應到 ORM
+    __table_args__ = (
+        Index("ix_tickets_column_id_position", "column_id", "position"),
+        Index("ix_tickets_board_id_updated_at", "board_id", "updated_at"),
+        Index("ix_tickets_board_id_column_id_position", "board_id", "column_id", "position", "id"),
+        Index("ix_tickets_board_id_due_date", "board_id", "due_date", "id"),
+        Index("ix_tickets_column_id_due_date", "column_id", "due_date", "id"),
+    )
 
-    id = Column(BigInteger, primary_key=True, index=True)
-    board_id = Column(BigInteger, ForeignKey("boards.id"), nullable=False)
-    column_id = Column(BigInteger, ForeignKey("columns.id"), nullable=False)
+    id = Column(BigIntId, primary_key=True, index=True)
+    board_id = Column(BigInteger, ForeignKey("boards.id", ondelete="CASCADE"), nullable=False)
+    column_id = Column(BigInteger, ForeignKey("columns.id", ondelete="CASCADE"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text)
     priority = Column(String(20), default="medium")
@@ -73,3 +92,15 @@ class Ticket(Base):
 
     board = relationship("Board", back_populates="tickets")
     column = relationship("KanbanColumn", back_populates="tickets")
+
+class TicketTombstone(Base):
+    # 已刪除票券的紀錄，供增量同步 (?since=) 回報刪除；只保留 SYNC_TOMBSTONE_RETENTION_DAYS 天
+    __tablename__ = "ticket_tombstones"
+    __table_args__ = (
+        Index("ix_ticket_tombstones_board_id_deleted_at", "board_id", "deleted_at"),
+    )
+
+    id = Column(BigIntId, primary_key=True)
+    ticket_id = Column(BigInteger, nullable=False)
+    board_id = Column(BigInteger, ForeignKey("boards.id", ondelete="CASCADE"), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
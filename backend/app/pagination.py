@@ -0,0 +1,54 @@
+import base64
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from fastapi import Request, Response
+
+# 列表端點的 keyset (cursor) 分頁：GET /api/users/、GET /api/tickets/
+# cursor 是排序鍵 (最後一筆) 的 base64url 編碼，client 視為不透明字串，原樣帶回 ?cursor= 即可
+# 下一頁同時放在 X-Next-Cursor 與 Link: <...>; rel="next"；沒有這兩個 header 代表已是最後一頁
+
+# 相容模式：恢復舊行為 (users 可用 skip/offset、未帶 limit/cursor 的 tickets 一次回傳全部)
+PAGINATION_COMPAT = os.getenv("PAGINATION_COMPAT", "false").lower() in ("1", "true", "yes")
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = 1000
+
+# cursor 內的整數要能放進資料庫的 BIGINT (SQLite INTEGER)，超出範圍會在綁定參數時才炸成 500
+_INT_MIN, _INT_MAX = -2**63, 2**63 - 1
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> tuple:
+    """回傳 size 個整數組成的排序鍵；格式錯誤 raise ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    if not all(type(v) is int and _INT_MIN <= v <= _INT_MAX for v in values):
+        raise ValueError("Invalid cursor")
+    return tuple(values)
+
+def datetime_key(value: datetime) -> int:
+    # 時間欄位放進 cursor 時轉成微秒整數；naive datetime (SQLite) 視為 UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+def key_datetime(value: int) -> datetime:
+    """datetime_key 的反向；超出 datetime 可表示的範圍 raise ValueError"""
+    try:
+        return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(microseconds=value)
+    except OverflowError:
+        raise ValueError("Invalid cursor")
+
+def set_next_page(request: Request, response: Response, cursor: str):
+    response.headers["X-Next-Cursor"] = cursor
+    next_url = request.url.include_query_params(cursor=cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
@@ -0,0 +1,149 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import bcrypt
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+from .database import DATABASE_ASYNC
+from .metrics import password_hash_duration
+
+# bcrypt 是 CPU-bound，放到獨立且有上限的 executor 執行，避免塞滿 Starlette 的 threadpool
+# PASSWORD_HASH_EXECUTOR: thread (預設，bcrypt 計算時會釋放 GIL) 或 process
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 最多允許多少個請求排隊等待；超過直接回 503
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "32"))
+# 排隊 + 計算的總等待秒數；逾時回 503
+PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "5"))
+# bcrypt work factor；調整後既有 hash 會在使用者下次登入時自動升級
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+class PasswordHasherBusy(Exception):
+    """密碼雜湊佇列已滿或等待逾時 (由 main.py 轉成 503)"""
+
+def _hashpw(password: str, rounds: int) -> str:
+    # bcrypt.hashpw 回傳 bytes，需要 decode 存入 string DB column
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+def _checkpw(password: str, hashed_password: str) -> bool:
+    # bcrypt.checkpw 需要 bytes
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+class PasswordHasher:
+    def __init__(self, kind: str, workers: int, max_queue: int, timeout: float):
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0       # 已送出但尚未完成的工作數 (執行中 + 排隊中)
+        self.rejected = 0
+        self.completed = 0
+        self.total_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._pending - self.workers)
+
+    def _get_executor(self):
+        # 延遲建立，避免 import 時就 fork 出 process
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers, thread_name_prefix="bcrypt"
+                        )
+        return self._executor
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self._pending += 1
+        started = time.perf_counter()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._done(started)
+            raise
+        future.add_done_callback(lambda _: self._done(started))
+        return future
+
+    def _done(self, started: float):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+            self.total_seconds += elapsed
+            # 已經持有 lock，histogram 不需另外加鎖
+            password_hash_duration.observe((), elapsed)
+
+    def _timed_out(self, future):
+        # 還在排隊的工作直接取消，已在計算的就讓它跑完
+        future.cancel()
+        with self._lock:
+            self.rejected += 1
+        raise PasswordHasherBusy()
+
+    def run(self, fn, *args):
+        if DATABASE_ASYNC and in_greenlet():
+            # DATABASE_ASYNC 模式下同步路由跑在 event loop 的 greenlet 中，不能 block，改成 await
+            return await_only(self.run_async(fn, *args))
+        future = self._submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            self._timed_out(future)
+
+    async def run_async(self, fn, *args):
+        future = self._submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._timed_out(future)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "executor": self.kind,
+                "workers": self.workers,
+                "in_flight": self._pending,
+                "queue_depth": max(0, self._pending - self.workers),
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "total_seconds": self.total_seconds,
+            }
+
+hasher = PasswordHasher(
+    kind=PASSWORD_HASH_EXECUTOR,
+    workers=PASSWORD_HASH_WORKERS,
+    max_queue=PASSWORD_HASH_QUEUE,
+    timeout=PASSWORD_HASH_TIMEOUT,
+)
+
+def hash_password(password: str) -> str:
+    return hasher.run(_hashpw, password, BCRYPT_ROUNDS)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return hasher.run(_checkpw, plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    return await hasher.run_async(_hashpw, password, BCRYPT_ROUNDS)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hasher.run_async(_checkpw, plain_password, hashed_password)
+
+def needs_rehash(hashed_password: str) -> bool:
+    # bcrypt hash 格式: $2b$<rounds>$<salt+hash>
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
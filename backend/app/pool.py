@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+import uuid
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+# 連線池設定 (皆可由環境變數調整)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Supabase / 雲端 DB 會關閉閒置連線，定期回收避免拿到死連線
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# 外部 pooler (PgBouncer / Supabase transaction pooler, port 6543)：
+# auto = 依 port 判斷；true 時由外部 pooler 負責連線池，本地改用 NullPool 並關閉 prepared statement
+DB_EXTERNAL_POOLER = os.getenv("DB_EXTERNAL_POOLER", "auto").lower()
+
+SUPABASE_TRANSACTION_POOLER_PORT = 6543
+
+def uses_external_pooler(url) -> bool:
+    if DB_EXTERNAL_POOLER == "auto":
+        parsed = make_url(url)
+        return parsed.get_backend_name() == "postgresql" and parsed.port == SUPABASE_TRANSACTION_POOLER_PORT
+    return DB_EXTERNAL_POOLER in ("1", "true", "yes")
+
+class PoolStats:
+    # 等待取得連線的次數 / 時間，以及逾時次數 (連線不足的早期警訊)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "wait_seconds_total": self.wait_seconds,
+                "wait_seconds_max": self.max_wait_seconds,
+                "wait_seconds_avg": self.wait_seconds / self.checkouts if self.checkouts else 0.0,
+                "timeouts": self.timeouts,
+            }
+
+pool_stats = PoolStats()
+
+class _TimedCheckoutMixin:
+    # 量測從 pool 取得連線的等待時間
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.record(time.perf_counter() - started)
+        return conn
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+def engine_options(url, async_mode: bool = False):
+    """依環境變數組出 create_engine / create_async_engine 的連線池參數"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite 只能用單一連線，維持 SQLAlchemy 預設
+        return {}
+
+    if uses_external_pooler(url):
+        options = {"poolclass": NullPool}
+        if async_mode:
+            # Transaction pooler 會把同一個 session 的語句分到不同後端連線，
+            # asyncpg 的 prepared statement 快取必須關閉
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+        return options
+
+    return {
+        "poolclass": TimedAsyncQueuePool if async_mode else TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+def pool_status(engine):
+    pool = engine.pool
+    status = {
+        "pool_class": type(pool).__name__,
+        "external_pooler": isinstance(pool, NullPool),
+    }
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    status.update(pool_stats.snapshot())
+    return status
@@ -0,0 +1,226 @@
+"""
+管理員按需 profile 單一請求 (排查「只有正式環境某個看板很慢」這類問題)
+
+Admin 在請求加上 X-Profile: 1 header (或 ?profile=1)，該請求就在 cProfile 下執行：
+回應帶 X-Profile-Id，結果存成 PROFILER_DIR/<id>.prof (pstats 格式，可用 snakeviz 或
+python -m pstats 開啟)，由 GET /api/system/profiles 列出、/api/system/profiles/{id} 下載。
+
+- PROFILER_ENABLED=false (預設) 時不掛 middleware，一般請求沒有任何額外成本；
+  開啟後沒帶旗標的請求也只多一次 header 掃描
+- 非 admin、或超過頻率限制時旗標會被忽略，請求照常執行，回應帶 X-Profile-Status 說明原因
+- 每個 worker 同時只 profile 一個請求，每分鐘最多 PROFILER_RATE_PER_MINUTE 次
+- Python 3.12 起 cProfile 以 sys.monitoring 實作，會記錄 process 內所有 thread：
+  threadpool 裡的同步 endpoint 也包含在內，但同一時間在這個 worker 執行的其他請求也會混入
+
+    PROFILER_ENABLED           是否允許 profile (預設 false)
+    PROFILER_RATE_PER_MINUTE   每個 worker 每分鐘最多幾次 (預設 6)
+    PROFILER_DIR               存放結果的目錄，多個 worker 可共用 (預設 <tmp>/kanban-profiles)
+    PROFILER_KEEP              保留最近幾份 (預設 50)
+"""
+import asyncio
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import tempfile
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from urllib.parse import parse_qs
+from fastapi import HTTPException
+from . import deps
+from .database import SessionLocal, run_db
+
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILER_RATE_PER_MINUTE = int(os.getenv("PROFILER_RATE_PER_MINUTE", "6"))
+PROFILER_DIR = os.getenv("PROFILER_DIR", os.path.join(tempfile.gettempdir(), "kanban-profiles"))
+PROFILER_KEEP = int(os.getenv("PROFILER_KEEP", "50"))
+
+_PROFILE_ID = re.compile(r"^\d{8}-\d{6}-[0-9a-f]{8}$")
+
+class ProfileLimiter:
+    # 只在 event loop thread 上使用，不需要 lock
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self.active = False
+        self._started = deque()
+
+    def acquire(self):
+        """可以開始時回傳 None，否則回傳拒絕原因"""
+        now = time.monotonic()
+        while self._started and now - self._started[0] >= 60:
+            self._started.popleft()
+        if self.active:
+            return "busy"
+        if len(self._started) >= self.per_minute:
+            return "rate-limited"
+        self.active = True
+        self._started.append(now)
+        return None
+
+    def release(self):
+        self.active = False
+
+class ProfileStore:
+    def __init__(self, directory: str, keep: int):
+        self.directory = directory
+        self.keep = keep
+
+    def _path(self, profile_id: str, ext: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.{ext}")
+
+    def save(self, profile_id: str, profile: cProfile.Profile, meta: dict):
+        os.makedirs(self.directory, exist_ok=True)
+        profile.dump_stats(self._path(profile_id, "prof"))
+        with open(self._path(profile_id, "json"), "w") as f:
+            json.dump(meta, f)
+        self._prune()
+
+    def _prune(self):
+        # id 以時間開頭，排序即為新舊順序
+        ids = sorted(name[:-5] for name in os.listdir(self.directory) if name.endswith(".json"))
+        for profile_id in ids[:-self.keep] if self.keep > 0 else ids:
+            for ext in ("prof", "json"):
+                try:
+                    os.remove(self._path(profile_id, ext))
+                except FileNotFoundError:
+                    pass
+
+    def list(self):
+        if not os.path.isdir(self.directory):
+            return []
+        items = []
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    items.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return items
+
+    def get_path(self, profile_id: str):
+        # id 來自 URL，先驗證格式避免路徑穿越
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        path = self._path(profile_id, "prof")
+        return path if os.path.exists(path) else None
+
+    def summary(self, profile_id: str, limit: int = 50):
+        path = self.get_path(profile_id)
+        if path is None:
+            return None
+        out = io.StringIO()
+        pstats.Stats(path, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+limiter = ProfileLimiter(PROFILER_RATE_PER_MINUTE)
+store = ProfileStore(PROFILER_DIR, PROFILER_KEEP)
+
+def _requested(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            return value not in (b"", b"0", b"false")
+    query = scope.get("query_string", b"")
+    if b"profile=" not in query:
+        return False
+    return parse_qs(query.decode("latin-1")).get("profile", [""])[-1] not in ("", "0", "false")
+
+async def _authorize_admin(scope):
+    """回傳 admin 的 Principal；沒帶 token 或不是 admin 回傳 None"""
+    token_header = next((v.decode("latin-1") for n, v in scope["headers"] if n == b"authorization"), None)
+    if not token_header:
+        return None
+    db = SessionLocal()
+    try:
+        return deps.get_current_admin(await deps.get_current_user(token_header, db))
+    except HTTPException:
+        return None
+    finally:
+        await run_db(db.close)
+
+# 背景保存中的 task (保留參照，避免還沒執行完就被 GC)
+_pending_saves = set()
+
+def _save_in_background(profile_id: str, profile: cProfile.Profile, meta: dict):
+    task = asyncio.get_running_loop().create_task(asyncio.to_thread(store.save, profile_id, profile, meta))
+    _pending_saves.add(task)
+    task.add_done_callback(_pending_saves.discard)
+
+def _with_header(send, name: bytes, value: bytes):
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            message = {**message, "headers": list(message.get("headers", [])) + [(name, value)]}
+        await send(message)
+    return wrapped
+
+class ProfilerMiddleware:
+    """ASGI middleware：admin 帶 X-Profile 旗標的請求在 cProfile 下執行並保存結果"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _requested(scope):
+            return await self.app(scope, receive, send)
+
+        principal = await _authorize_admin(scope)
+        reason = "forbidden" if principal is None else limiter.acquire()
+        if reason is not None:
+            return await self.app(scope, receive, _with_header(send, b"x-profile-status", reason.encode()))
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # 其他工具 (例如 debugger / 另一個 profiler) 已經占用 sys.monitoring
+            limiter.release()
+            return await self.app(scope, receive, _with_header(send, b"x-profile-status", b"busy"))
+
+        profile_id = f"{datetime.now(timezone.utc):%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+        started = time.perf_counter()
+        state = {"status": 500, "finished": False}
+
+        def finish():
+            # 停止 profile 並釋放名額，只執行一次；回傳要保存的 meta (已結束過回傳 None)
+            if state["finished"]:
+                return None
+            state["finished"] = True
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            limiter.release()
+            return {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": state["status"],
+                "duration_ms": round(elapsed * 1000, 1),
+                "user": principal.username,
+                "pid": os.getpid(),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                if any(name == b"content-type" and value.startswith(b"text/event-stream") for name, value in headers):
+                    # SSE 是長連線，只 profile 到開始串流為止；名額立即釋放，結果在背景保存
+                    meta = finish()
+                    if meta is not None:
+                        _save_in_background(profile_id, profile, meta)
+                headers += [(b"x-profile-id", profile_id.encode()), (b"x-profile-status", b"recorded")]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            meta = finish()
+            if meta is not None:
+                await asyncio.to_thread(store.save, profile_id, profile, meta)
@@ -0,0 +1,20 @@
+# Gap-based 排序：相鄰票券的 position 之間保留間隔，
+# 移動一張卡只需要改它自己的 position；間隔用完時才重排整個欄位
+
+POSITION_GAP = 1024
+
+def position_between(prev_pos, next_pos):
+    """回傳介於兩個鄰居之間的新 position；沒有空間時回傳 None (需要重排)"""
+    if prev_pos is None and next_pos is None:
+        return POSITION_GAP
+    if prev_pos is None:
+        return next_pos - POSITION_GAP
+    if next_pos is None:
+        return prev_pos + POSITION_GAP
+    if next_pos - prev_pos < 2:
+        return None
+    return (prev_pos + next_pos) // 2
+
+def rebalanced_positions(count):
+    """重排時使用的均勻 position"""
+    return [(i + 1) * POSITION_GAP for i in range(count)]
@@ -1,16 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from .. import crud, schemas, deps
-from ..database import get_db
+from .. import crud, schemas, deps, passwords
+from ..database import get_db, run_db
+from ..metrics import auth_failures
+from ..routing import DBRoute
 
-router = APIRouter()
+router = APIRouter(route_class=DBRoute)
 
 @router.post("/register", response_model=schemas.UserResponse)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = crud.get_user_by_username(db, username=user.username)
+async def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+    # async 路由：DB 操作經 run_db 執行，bcrypt 丟到專用 executor，等待時不占用 thread
+    db_user = await run_db(crud.get_user_by_username, db, username=user.username)
     if db_user:
         raise HTTPException(status_code=400, detail="Username already registered")
-    return crud.create_user(db=db, user=user)
+    hashed_password = await passwords.hash_password_async(user.password)
+    return await run_db(crud.create_user, db=db, user=user, hashed_password=hashed_password)
 
 from pydantic import BaseModel
 
@@ -19,18 +23,33 @@ class LoginRequest(BaseModel):
     password: str
 
 @router.post("/login", response_model=schemas.Token)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
-    db_user = crud.get_user_by_username(db, username=login_data.username)
-    if not db_user or not crud.verify_password(login_data.password, db_user.password_hash):
+async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+    db_user = await run_db(crud.get_user_by_username, db, username=login_data.username)
+    if not db_user or not await passwords.verify_password_async(login_data.password, db_user.password_hash):
+        auth_failures.inc(("bad_credentials",))
         raise HTTPException(status_code=401, detail="Incorrect username or password")
-    
-    token = crud.create_auth_token(db, user_id=db_user.id)
+    # 之後的 commit 會讓 db_user 過期，先轉成 response model 避免序列化時再查 DB
+    user_data = schemas.UserResponse.model_validate(db_user)
+
+    # work factor 變更後，趁有明文密碼時升級舊 hash (與建立 token 同一個 commit)
+    new_hash = None
+    if passwords.needs_rehash(db_user.password_hash):
+        new_hash = await passwords.hash_password_async(login_data.password)
+
+    token = await run_db(crud.create_auth_token, db, user_id=db_user.id, password_hash=new_hash)
     return {
         "access_token": token,
         "token_type": "token", 
-        "user": db_user
+        "user": user_data
     }
 
 @router.get("/me", response_model=schemas.UserResponse)
-def read_users_me(current_user = Depends(deps.get_current_user)):
-    return current_user
+def read_users_me(
+    current_user = Depends(deps.get_current_user),
+    db: Session = Depends(get_db)
+):
+    # current_user 只是快取的 Principal，完整資料另外查
+    db_user = crud.get_user(db, user_id=current_user.id)
+    if not db_user:
+        raise HTTPException(status_code=401, detail="Invalid Token")
+    return db_user
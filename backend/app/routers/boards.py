@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+import asyncio
+import json
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from sqlalchemy.orm import Session
-from .. import crud, schemas, deps
-from ..database import get_db
+from .. import crud, schemas, deps, etag, events, serialization
+from ..auth_cache import principal_cache
+from ..database import get_db, run_db
+from ..metrics import auth_failures
+from ..routing import DBRoute
 
-router = APIRouter()
+router = APIRouter(route_class=DBRoute)
+
+# SSE 心跳間隔 (秒)；要短於 proxy / load balancer 的 idle timeout
+SSE_HEARTBEAT = float(os.getenv("SSE_HEARTBEAT", "25"))
 
 @router.post("/", response_model=schemas.BoardResponse)
 def create_board(
@@ -14,28 +24,76 @@ def create_board(
 ):
     return crud.create_board(db=db, board=board, user_id=current_user.id)
 
+def _set_next_cursor(response: Response, items, limit: Optional[int]):
+    # 這一頁剛好滿載時才回傳下一頁 cursor (最後一筆的 id)
+    if limit is not None and len(items) == limit:
+        last = items[-1]
+        response.headers["X-Next-Cursor"] = str(last["id"] if isinstance(last, dict) else last.id)
+
 @router.get("/", response_model=List[schemas.BoardResponse])
 def read_boards(
+    response: Response,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
     current_user = Depends(deps.get_current_user),
     db: Session = Depends(get_db)
 ):
-    return crud.get_boards(db=db, user_id=current_user.id)
+    boards = crud.get_boards(db=db, user_id=current_user.id, after_id=after_id, limit=limit)
+    _set_next_cursor(response, boards, limit)
+    return boards
+
+@router.get("/summary", response_model=List[schemas.BoardSummaryResponse])
+def read_board_summaries(
+    response: Response,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    current_user = Depends(deps.get_current_user),
+    db: Session = Depends(get_db)
+):
+    summaries = crud.get_board_summaries(db=db, user_id=current_user.id, after_id=after_id, limit=limit)
+    _set_next_cursor(response, summaries, limit)
+    return summaries
 
 @router.get("/{board_id}", response_model=schemas.BoardDetailResponse)
 def read_board(
     board_id: int,
+    request: Request,
+    response: Response,
     current_user = Depends(deps.get_current_user),
     db: Session = Depends(get_db)
 ):
-    board = crud.get_board_by_id(db, board_id=board_id)
-    if not board:
+    # 先只查 owner + version：沒有變動時直接 304，不載入也不序列化任何資料
+    current = crud.get_board_version(db, board_id=board_id)
+    if not current:
         raise HTTPException(status_code=404, detail="Board not found")
     # 簡單權限檢查：只有 owner 可以看 (或 member)
     # 這裡暫時只檢查 owner，實際專案應檢查 board_members
-    if board.owner_id != current_user.id:
+    if current.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
+
+    tag = etag.board_etag("board", board_id, current.version)
+    if etag.is_not_modified(request, tag):
+        return etag.not_modified_response(tag)
+
+    # 看板快照：欄位與票券一併回傳，前端只需打這一支 API
+    # version 在資料之前讀取，期間若有寫入，下次請求的 ETag 一定不同
+    if serialization.FAST_JSON:
+        board = crud.get_board_snapshot_rows(db, board_id=board_id)
+    else:
+        board = crud.get_board_snapshot(db, board_id=board_id)
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+    etag.set_etag(response, tag)
+    if serialization.FAST_JSON:
+        return serialization.json_response(board, response)
     return board
 
+def _board_write_error(db: Session, board_id: int):
+    # 只限擁有者的寫入沒有更新到任何列時才查：區分看板不存在 (404) 與不是擁有者 (403)
+    if crud.get_board_version(db, board_id=board_id) is None:
+        return HTTPException(status_code=404, detail="Board not found")
+    return HTTPException(status_code=403, detail="Not authorized")
+
 @router.put("/{board_id}", response_model=schemas.BoardResponse)
 def update_board(
     board_id: int,
@@ -43,13 +101,11 @@ def update_board(
     current_user = Depends(deps.get_current_user),
     db: Session = Depends(get_db)
 ):
-    board = crud.get_board_by_id(db, board_id=board_id)
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
-    if board.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-        
-    return crud.update_board(db, board_id=board_id, board_update=board_update)
+    # 擁有者檢查放在 UPDATE 的 WHERE 內，成功時不需要先查看板
+    board = crud.update_board(db, board_id=board_id, board_update=board_update, owner_id=current_user.id)
+    if board is None:
+        raise _board_write_error(db, board_id)
+    return board
 
 @router.delete("/{board_id}")
 def delete_board(
@@ -57,11 +113,60 @@ def delete_board(
     current_user = Depends(deps.get_current_user),
     db: Session = Depends(get_db)
 ):
-    board = crud.get_board_by_id(db, board_id=board_id)
-    if not board:
+    if not crud.delete_board(db, board_id=board_id, owner_id=current_user.id):
+        raise _board_write_error(db, board_id)
+    return {"message": "Board deleted"}
+
+def _sse(event_type: str, data) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+def _authorize_stream(db: Session, token: str, board_id: int):
+    # 驗證 token + 讀取看板在同一次 DB 呼叫內完成並立刻歸還連線：
+    # 大量 client 同時連線時，不會出現「拿著連線等 thread」的互相等待，閒置的串流也不占連線池
+    try:
+        principal = principal_cache.get(token)
+        if principal is None:
+            principal = crud.get_principal_by_token(db, token=token)
+            if principal:
+                principal_cache.put(token, principal)
+        current = crud.get_board_version(db, board_id=board_id) if principal else None
+        return principal, current
+    finally:
+        db.close()
+
+@router.get("/{board_id}/events")
+async def stream_board_events(
+    board_id: int,
+    token: str = Depends(deps.get_stream_token),
+    db: Session = Depends(get_db)
+):
+    # Server-Sent Events：看板有變動時推送 {type, board_id, version, ids}，client 再做增量同步
+    current_user, current = await run_db(_authorize_stream, db, token, board_id)
+    if not current_user:
+        auth_failures.inc(("invalid_token",))
+        raise HTTPException(status_code=401, detail="Invalid Token")
+    if not current:
         raise HTTPException(status_code=404, detail="Board not found")
-    if board.owner_id != current_user.id:
+    if current.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
-        
-    crud.delete_board(db, board_id=board_id)
-    return {"message": "Board deleted"}
+
+    async def stream():
+        sub = events.hub.subscribe(board_id)
+        try:
+            # 訂閱之後才送 ready；client 收到 ready 時同步一次，就不會漏掉中間的變動
+            yield "retry: 3000\n" + _sse("ready", {"board_id": board_id, "version": current.version})
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), timeout=SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event["type"], event)
+        finally:
+            events.hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
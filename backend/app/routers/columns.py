@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from typing import List
 from sqlalchemy.orm import Session
-from .. import crud, schemas, deps
+from .. import crud, schemas, deps, etag
 from ..database import get_db
+from ..routing import DBRoute
 
-router = APIRouter()
+router = APIRouter(route_class=DBRoute)
 
 @router.post("/", response_model=schemas.ColumnResponse)
 def create_column(
@@ -13,55 +14,48 @@ def create_column(
     db: Session = Depends(get_db)
 ):
     # 檢查權限：使用者是否為該 board 的擁有者
-    board = crud.get_board_by_id(db, board_id=column.board_id)
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
-    if board.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
+    deps.authorize(db, current_user, boards=[column.board_id])
     return crud.create_column(db=db, column=column)
 
 @router.get("/", response_model=List[schemas.ColumnResponse])
 def read_columns(
     board_id: int,
+    request: Request,
+    response: Response,
     current_user = Depends(deps.get_current_user),
     db: Session = Depends(get_db)
 ):
-    # 檢查權限同樣需要
+    # ETag 用的 version 查詢同時帶回 owner_id，權限檢查不需要另外查詢
+    current = crud.get_board_version(db, board_id=board_id)
+    if not current:
+        raise HTTPException(status_code=404, detail="Board not found")
+    if current.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    tag = etag.board_etag("columns", board_id, current.version)
+    if etag.is_not_modified(request, tag):
+        return etag.not_modified_response(tag)
+    etag.set_etag(response, tag)
     return crud.get_columns_by_board(db, board_id=board_id)
 
 @router.put("/{column_id}", response_model=schemas.ColumnResponse)
 def update_column(
     column_id: int,
     column_update: schemas.ColumnUpdate,
-    current_user = Depends(deps.get_current_user),
+    access = Depends(deps.get_column_access),
     db: Session = Depends(get_db)
 ):
-    db_column = crud.get_column(db, column_id=column_id)
+    # 權限由 get_column_access 檢查 (快取或一個 JOIN 查詢)；UPDATE 本身也限定擁有者
+    db_column = crud.update_column(db, column_id=column_id, column_update=column_update, owner_id=access.owner_id)
     if not db_column:
         raise HTTPException(status_code=404, detail="Column not found")
-        
-    # Check permissions (via board ownership)
-    board = crud.get_board_by_id(db, board_id=db_column.board_id)
-    if not board or board.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-        
-    return crud.update_column(db, column_id=column_id, column_update=column_update)
+    return db_column
 
 @router.delete("/{column_id}")
 def delete_column(
     column_id: int,
-    current_user = Depends(deps.get_current_user),
+    access = Depends(deps.get_column_access),
     db: Session = Depends(get_db)
 ):
-    db_column = crud.get_column(db, column_id=column_id)
-    if not db_column:
+    if not crud.delete_column(db, column_id=column_id, owner_id=access.owner_id):
         raise HTTPException(status_code=404, detail="Column not found")
-        
-    # Check permissions
-    board = crud.get_board_by_id(db, board_id=db_column.board_id)
-    if not board or board.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-        
-    crud.delete_column(db, column_id=column_id)
     return {"message": "Column deleted"}
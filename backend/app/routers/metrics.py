@@ -0,0 +1,17 @@
+import secrets
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+from .. import metrics
+
+router = APIRouter()
+
+# Prometheus scrape 端點 (不在 /api 底下、不列入 OpenAPI)
+# 設定 METRICS_TOKEN 時需帶 Authorization: Bearer <token>
+
+@router.get("/metrics", include_in_schema=False)
+async def read_metrics(request: Request):
+    if metrics.METRICS_TOKEN:
+        expected = f"Bearer {metrics.METRICS_TOKEN}"
+        if not secrets.compare_digest(request.headers.get("Authorization", ""), expected):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(await metrics.exposition(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,36 @@
+import os
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from .. import crud, schemas, deps
+from ..auth_cache import Principal
+from ..database import get_db
+from ..routing import DBRoute
+from ..stats_cache import stats_cache
+
+router = APIRouter(route_class=DBRoute)
+
+# 到期日在幾天內算「即將到期」
+STATS_DUE_SOON_DAYS = int(os.getenv("STATS_DUE_SOON_DAYS", "3"))
+
+@router.get("/", response_model=schemas.StatsResponse)
+def read_stats(
+    board_id: Optional[int] = None,
+    current_user: Principal = Depends(deps.get_current_user),
+    db: Session = Depends(get_db)
+):
+    # 儀表板 (全部看板) 與單一看板統計共用；結果短期快取，票券 / 欄位寫入時失效
+    # 單一看板先檢查擁有者 (走 ownership 快取)，不存在 / 別人的看板不會碰到統計快取
+    if board_id is not None:
+        deps.authorize(db, current_user, boards=[board_id])
+    key = (current_user.id, board_id)
+    stats = stats_cache.get(key)
+    if stats is None:
+        stats = crud.get_ticket_stats(
+            db, user_id=current_user.id, board_id=board_id, due_soon_days=STATS_DUE_SOON_DAYS
+        )
+        if board_id is not None and not stats["boards"]:
+            # 檢查後才被刪除的看板
+            raise HTTPException(status_code=404, detail="Board not found")
+        stats_cache.put(key, stats)
+    return stats
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
+from .. import deps, events, profiling
+from ..auth_cache import ownership_cache, principal_cache
+from ..database import engine
+from ..pool import pool_status
+from ..routing import DBRoute
+from ..stats_cache import stats_cache
+
+router = APIRouter(route_class=DBRoute)
+
+# 系統狀態 (僅限 Admin)：用來調整快取與連線池大小
+
+@router.get("/pool")
+def read_pool_status(current_user = Depends(deps.get_current_admin)):
+    # checked_out / overflow 接近上限、wait_seconds 上升即代表連線不足
+    return pool_status(engine)
+
+@router.get("/auth-cache")
+def read_auth_cache_stats(current_user = Depends(deps.get_current_admin)):
+    # Token 快取命中率，用於調整 AUTH_CACHE_SIZE / AUTH_CACHE_TTL
+    return principal_cache.stats()
+
+@router.get("/ownership-cache")
+def read_ownership_cache_stats(current_user = Depends(deps.get_current_admin)):
+    # 看板 / 欄位 / 票券擁有者快取 (deps.authorize)，用於調整 OWNERSHIP_CACHE_SIZE / OWNERSHIP_CACHE_TTL
+    return ownership_cache.stats()
+
+@router.get("/stats-cache")
+def read_stats_cache_stats(current_user = Depends(deps.get_current_admin)):
+    # /api/stats 快取命中率，用於調整 STATS_CACHE_SIZE / STATS_CACHE_TTL
+    return stats_cache.stats()
+
+@router.get("/events")
+def read_event_stats(current_user = Depends(deps.get_current_admin)):
+    # 即時推播：目前的訂閱數與已分派的事件數
+    return {"broker": events.broker.name, **events.hub.stats()}
+
+@router.get("/profiles")
+def list_profiles(current_user = Depends(deps.get_current_admin)):
+    # 以 X-Profile: 1 執行過的請求 (需 PROFILER_ENABLED=true)，新的在前
+    return profiling.store.list()
+
+@router.get("/profiles/{profile_id}")
+def download_profile(profile_id: str, format: str = "prof", current_user = Depends(deps.get_current_admin)):
+    # format=prof 下載 pstats 檔 (snakeviz / python -m pstats)；format=text 回傳依累計時間排序的前 50 名
+    if format == "text":
+        summary = profiling.store.summary(profile_id)
+        if summary is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return PlainTextResponse(summary)
+    path = profiling.store.get_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+import hashlib
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import List, Optional, Union
 from sqlalchemy.orm import Session
-from .. import crud, schemas, deps
+from .. import crud, schemas, deps, etag, pagination, search, serialization, sync, timeline
 from ..database import get_db
+from ..routing import DBRoute
 
-router = APIRouter()
+router = APIRouter(route_class=DBRoute)
 
 @router.post("/", response_model=schemas.TicketResponse)
 def create_ticket(
@@ -12,25 +15,232 @@ def create_ticket(
     current_user = Depends(deps.get_current_user),
     db: Session = Depends(get_db)
 ):
-    # 權限檢查省略，邏輯同上
+    # 欄位必須在使用者的看板上，且屬於 ticket.board_id
+    access = deps.authorize(db, current_user, columns=[ticket.column_id])[("column", ticket.column_id)]
+    if access.board_id != ticket.board_id:
+        raise HTTPException(status_code=400, detail="Column does not belong to the board")
     return crud.create_ticket(db=db, ticket=ticket)
 
-@router.get("/", response_model=List[schemas.TicketResponse])
+def _page_key(ticket, sort: str) -> tuple:
+    # 排序鍵全部轉成整數放進 cursor；到期日以微秒表示
+    get = ticket.get if isinstance(ticket, dict) else lambda name: getattr(ticket, name)
+    if sort == "position":
+        return (get("column_id"), get("position"), get("id"))
+    return (pagination.datetime_key(get("due_date")), get("id"))
+
+@router.get("/", response_model=Union[List[schemas.TicketResponse], schemas.TicketDeltaResponse])
 def read_tickets(
     board_id: int,
+    request: Request,
+    response: Response,
+    since: Optional[str] = Query(None, description='增量同步 cursor；第一次同步傳 "0"'),
+    cursor: Optional[str] = Query(None, description="分頁 cursor (上一頁回應的 X-Next-Cursor)"),
+    limit: Optional[int] = Query(None, ge=1, le=pagination.MAX_PAGE_SIZE),
+    column_id: Optional[int] = None,
+    priority: Optional[List[str]] = Query(None, description="可重複，任一符合即可"),
+    due_from: Optional[datetime] = Query(None, description="到期日 >= (需搭配 sort=due_date / -due_date)"),
+    due_to: Optional[datetime] = Query(None, description="到期日 < (需搭配 sort=due_date / -due_date)"),
+    title: Optional[str] = Query(None, max_length=200, description="標題中有以這些字開頭的詞 (全部都要符合)"),
+    sort: str = Query("position", description="position、due_date 或 -due_date；依到期日排序時不含沒有到期日的票券"),
+    current_user = Depends(deps.get_current_user),
+    db: Session = Depends(get_db)
+):
+    deps.authorize(db, current_user, boards=[board_id])
+    filters = schemas.TicketListFilter(column_id=column_id, priority=priority, due_from=due_from,
+                                       due_to=due_to, title=title, sort=sort)
+    if since is not None:
+        # 增量同步：只回傳 cursor 之後的變動與刪除 (tombstone)
+        if not filters.is_default():
+            raise HTTPException(status_code=400, detail="Filters and sort cannot be combined with since")
+        try:
+            since_at = sync.decode_cursor(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid sync cursor")
+        changes = crud.get_ticket_changes(db, board_id=board_id, since=since_at)
+        if serialization.FAST_JSON:
+            return serialization.json_response(changes, response)
+        return changes
+
+    # 只接受能走索引的篩選 / 排序組合
+    try:
+        keys, _ = crud.ticket_list_plan(filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    after = None
+    if cursor is not None:
+        try:
+            after = pagination.decode_cursor(cursor, len(keys))
+            if sort != "position":
+                after = (pagination.key_datetime(after[0]), after[1])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    if limit is None and not (pagination.PAGINATION_COMPAT and cursor is None):
+        # 相容模式下未帶 cursor / limit 才一次回傳整個看板
+        limit = pagination.DEFAULT_PAGE_SIZE
+
+    current = crud.get_board_version(db, board_id=board_id)
+    if current:
+        # 每一頁 (與每一組篩選) 各自有 ETag；看板有任何寫入時全部一起失效
+        kind = "tickets" if limit is None else f"tickets.{limit}.{cursor or ''}"
+        if not filters.is_default():
+            kind += "." + hashlib.sha1(filters.model_dump_json().encode()).hexdigest()[:12]
+        tag = etag.board_etag(kind, board_id, current.version)
+        if etag.is_not_modified(request, tag):
+            return etag.not_modified_response(tag)
+        etag.set_etag(response, tag)
+    if serialization.FAST_JSON:
+        # 快速路徑：欄位直接從資料列進 JSON，不逐筆經過 Pydantic；輸出與 response_model 相同
+        tickets = crud.get_ticket_rows_by_board(db, board_id=board_id, after=after, limit=limit, filters=filters)
+    else:
+        tickets = crud.get_tickets_by_board(db, board_id=board_id, after=after, limit=limit, filters=filters)
+    if limit is not None and len(tickets) == limit:
+        pagination.set_next_page(request, response, pagination.encode_cursor(*_page_key(tickets[-1], sort)))
+    if serialization.FAST_JSON:
+        return serialization.json_response(tickets, response)
+    return tickets
+
+@router.get("/search", response_model=schemas.TicketSearchResponse)
+def search_tickets(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="搜尋字詞 (全部都要出現，最後一個詞做前綴比對)"),
+    cursor: Optional[str] = Query(None, description="分頁 cursor (上一頁回應的 X-Next-Cursor)"),
+    limit: int = Query(20, ge=1, le=100),
     current_user = Depends(deps.get_current_user),
     db: Session = Depends(get_db)
 ):
-    return crud.get_tickets_by_board(db, board_id=board_id)
+    # 搜尋自己所有看板的票券標題與描述；PostgreSQL 走 GIN 索引，SQLite 走 FTS5
+    terms = search.parse_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="Search query has no searchable terms")
+    offset = 0
+    if cursor is not None:
+        # 依相關度排序沒有穩定的 keyset，cursor 內放的是 offset
+        try:
+            offset, = pagination.decode_cursor(cursor, 1)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # 只有 0 <= offset (< SEARCH_MAX_CANDIDATES，有設定上限時) 是我們發出去的 cursor
+        if offset < 0 or 0 < search.SEARCH_MAX_CANDIDATES <= offset:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    results, truncated = crud.search_tickets(db, user_id=current_user.id, terms=terms, limit=limit, offset=offset)
+    # 有設定上限時結果最多 SEARCH_MAX_CANDIDATES 筆，超過就不再給下一頁 (truncated 告知 client)
+    has_more = len(results) == limit
+    if search.SEARCH_MAX_CANDIDATES > 0:
+        has_more = has_more and offset + limit < search.SEARCH_MAX_CANDIDATES
+    if has_more:
+        pagination.set_next_page(request, response, pagination.encode_cursor(offset + limit))
+    return {"results": results, "truncated": truncated}
+
+@router.get("/timeline", response_model=schemas.TicketTimelineResponse)
+def read_ticket_timeline(
+    board_id: int,
+    request: Request,
+    response: Response,
+    start: datetime = Query(..., alias="from", description="視窗開始 (含)；區間從這個時間對齊"),
+    end: datetime = Query(..., alias="to", description="視窗結束 (不含)"),
+    bucket: str = Query("day", description="day 或 week"),
+    limit: int = Query(500, ge=1, le=pagination.MAX_PAGE_SIZE),
+    current_user = Depends(deps.get_current_user),
+    db: Session = Depends(get_db)
+):
+    # 行事曆 / 甘特圖：只回傳 [start_date, due_date] 與視窗重疊的票券，並在 server 分好每天 / 每週
+    deps.authorize(db, current_user, boards=[board_id])
+    if bucket not in timeline.BUCKET_SIZES:
+        raise HTTPException(status_code=400, detail=f"Unknown bucket: {bucket} (expected day or week)")
+    if (start.tzinfo is None) != (end.tzinfo is None):
+        raise HTTPException(status_code=400, detail="from and to must both have or both omit a UTC offset")
+    if end <= start:
+        raise HTTPException(status_code=400, detail="to must be after from")
+    if timeline.bucket_count(start, end, bucket) > timeline.TIMELINE_MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Window too large (at most {timeline.TIMELINE_MAX_BUCKETS} buckets)")
+
+    current = crud.get_board_version(db, board_id=board_id)
+    if current:
+        kind = "timeline." + hashlib.sha1(f"{start.isoformat()}|{end.isoformat()}|{bucket}|{limit}".encode()).hexdigest()[:12]
+        tag = etag.board_etag(kind, board_id, current.version)
+        if etag.is_not_modified(request, tag):
+            return etag.not_modified_response(tag)
+        etag.set_etag(response, tag)
+    tickets, truncated = crud.get_ticket_timeline(db, board_id=board_id, start=start, end=end, limit=limit)
+    result = {
+        "start": start,
+        "end": end,
+        "bucket": bucket,
+        "tickets": tickets,
+        "buckets": timeline.bucket_tickets(tickets, start, end, bucket),
+        "truncated": truncated,
+    }
+    if serialization.FAST_JSON:
+        return serialization.json_response(result, response)
+    return result
+
+@router.post("/move", response_model=List[schemas.TicketResponse])
+def move_tickets(
+    move_request: schemas.TicketMoveRequest,
+    current_user = Depends(deps.get_current_user),
+    db: Session = Depends(get_db)
+):
+    # 拖拉排序：一次送出所有移動，單一 transaction；回傳 position 有變動的票券
+    # 票券與目標欄位都要在使用者的看板上 (同一個看板由 crud 檢查)
+    deps.authorize(db, current_user, columns={m.column_id for m in move_request.moves},
+                   tickets={m.ticket_id for m in move_request.moves})
+    try:
+        tickets = crud.move_tickets(db, moves=move_request.moves)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if tickets is None:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    return tickets
+
+def _authorize_selector(db: Session, current_user, selector: schemas.TicketSelector):
+    # 明確指定的看板 / 欄位 / 票券先檢查 (404 / 403)；只用 priority 篩選時靠 crud 的 owner_id 限定範圍
+    deps.authorize(db, current_user,
+                   boards=[selector.board_id] if selector.board_id is not None else [],
+                   columns=[selector.column_id] if selector.column_id is not None else [],
+                   tickets=set(selector.ids or []))
+
+@router.post("/bulk-delete", response_model=schemas.TicketBulkResult)
+def bulk_delete_tickets(
+    selector: schemas.TicketSelector,
+    current_user = Depends(deps.get_current_user),
+    db: Session = Depends(get_db)
+):
+    # 例如清空欄位：{"column_id": 3}，一個請求、一條 DELETE
+    if not selector.has_criteria():
+        raise HTTPException(status_code=400, detail="At least one of ids, board_id, column_id, priority is required")
+    _authorize_selector(db, current_user, selector)
+    ids = crud.bulk_delete_tickets(db, selector=selector, owner_id=current_user.id)
+    return {"ids": ids, "count": len(ids)}
+
+@router.patch("/bulk", response_model=schemas.TicketBulkResult)
+def bulk_update_tickets(
+    bulk_update: schemas.TicketBulkUpdate,
+    current_user = Depends(deps.get_current_user),
+    db: Session = Depends(get_db)
+):
+    if not bulk_update.has_criteria():
+        raise HTTPException(status_code=400, detail="At least one of ids, board_id, column_id, priority is required")
+    if not bulk_update.changes.model_fields_set:
+        raise HTTPException(status_code=400, detail="No changes given")
+    _authorize_selector(db, current_user, bulk_update)
+    ids = crud.bulk_update_tickets(db, bulk_update=bulk_update, owner_id=current_user.id)
+    return {"ids": ids, "count": len(ids)}
 
 @router.put("/{ticket_id}", response_model=schemas.TicketResponse)
 def update_ticket(
     ticket_id: int,
     ticket_update: schemas.TicketUpdate,
+    access = Depends(deps.get_ticket_access),
     current_user = Depends(deps.get_current_user),
     db: Session = Depends(get_db)
 ):
-    ticket = crud.update_ticket(db, ticket_id=ticket_id, ticket_update=ticket_update)
+    if ticket_update.column_id is not None:
+        # 移到其他欄位：目標欄位必須在同一個看板
+        target = deps.authorize(db, current_user, columns=[ticket_update.column_id])[("column", ticket_update.column_id)]
+        if target.board_id != access.board_id:
+            raise HTTPException(status_code=400, detail="Column does not belong to the ticket's board")
+    ticket = crud.update_ticket(db, ticket_id=ticket_id, ticket_update=ticket_update, owner_id=access.owner_id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     return ticket
@@ -38,12 +248,9 @@ def update_ticket(
 @router.delete("/{ticket_id}")
 def delete_ticket(
     ticket_id: int,
-    current_user = Depends(deps.get_current_user),
+    access = Depends(deps.get_ticket_access),
     db: Session = Depends(get_db)
 ):
-    ticket = crud.get_ticket(db, ticket_id=ticket_id)
-    if not ticket:
+    if not crud.delete_ticket(db, ticket_id=ticket_id, owner_id=access.owner_id):
         raise HTTPException(status_code=404, detail="Ticket not found")
-        
-    crud.delete_ticket(db, ticket_id=ticket_id)
     return {"message": "Ticket deleted"}
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from typing import List, Optional
 from sqlalchemy.orm import Session
-from .. import crud, schemas, models, deps
+from .. import crud, schemas, deps, pagination
 from ..database import get_db
+from ..routing import DBRoute
+from ..auth_cache import Principal
 
-router = APIRouter()
+router = APIRouter(route_class=DBRoute)
 
 # 輔助函數：檢查是否為 Admin
-def check_admin(current_user: models.User):
+def check_admin(current_user: Principal):
     if current_user.role != 'admin':
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -16,21 +18,37 @@ def check_admin(current_user: models.User):
 
 @router.get("/", response_model=List[schemas.UserResponse])
 def read_users(
-    skip: int = 0,
-    limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_user),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(pagination.DEFAULT_PAGE_SIZE, ge=1, le=pagination.MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0, description="僅 PAGINATION_COMPAT 模式可用；請改用 cursor"),
+    current_user: Principal = Depends(deps.get_current_user),
     db: Session = Depends(get_db)
 ):
     # 限制只有管理員可以看所有用戶？或者開放給所有人看成員列表？
     # 這裡假設只有 Admin 能管理。如果是一般成員看 Member 列表，可以另開權限。
     # 為了方便，先允許所有登入用戶讀取列表 (用於看板成員顯示)，但在 User Management 介面通常是 Admin。
     # 既然是 "User Management CRUD"，我們稍微寬鬆一點，讓大家能看到成員，但只有 Admin 能刪改。
-    return crud.get_users(db, skip=skip, limit=limit)
+    if skip and not pagination.PAGINATION_COMPAT:
+        # 直接忽略 skip 會讓舊 client 一直拿到第一頁，明確拒絕
+        raise HTTPException(status_code=400, detail="Offset pagination is disabled; use cursor")
+    after_id = None
+    if cursor is not None:
+        try:
+            (after_id,) = pagination.decode_cursor(cursor, 1)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    users = crud.get_users(db, skip=skip, limit=limit, after_id=after_id)
+    if len(users) == limit:
+        pagination.set_next_page(request, response, pagination.encode_cursor(users[-1].id))
+    return users
 
 @router.post("/", response_model=schemas.UserResponse)
 def create_user(
     user: schemas.UserCreate,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_user),
     db: Session = Depends(get_db)
 ):
     check_admin(current_user)
@@ -43,7 +61,7 @@ def create_user(
 def update_user(
     user_id: int,
     user_update: schemas.UserUpdate, # 我們需要定義這個 schema
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_user),
     db: Session = Depends(get_db)
 ):
     check_admin(current_user)
@@ -55,7 +73,7 @@ def update_user(
 @router.delete("/{user_id}")
 def delete_user(
     user_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_user),
     db: Session = Depends(get_db)
 ):
     check_admin(current_user)
@@ -72,7 +90,7 @@ def delete_user(
 def reset_password(
     user_id: int,
     password_data: schemas.UserPasswordReset, # 需要定義
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_user),
     db: Session = Depends(get_db)
 ):
     check_admin(current_user)
@@ -0,0 +1,37 @@
+import functools
+import inspect
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from sqlalchemy.util.concurrency import greenlet_spawn
+from starlette.responses import Response
+from .database import DATABASE_ASYNC
+
+def _greenlet_endpoint(endpoint, response_model):
+    # 回應在 greenlet 內就先轉成 response model，序列化時的 lazy load 才能走 async driver
+    adapter = None
+    if response_model is not None and not isinstance(response_model, DefaultPlaceholder):
+        adapter = TypeAdapter(response_model)
+
+    def call(*args, **kwargs):
+        result = endpoint(*args, **kwargs)
+        if adapter is not None and not isinstance(result, Response):
+            result = adapter.validate_python(result, from_attributes=True)
+        return result
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        return await greenlet_spawn(call, *args, **kwargs)
+
+    return wrapper
+
+class DBRoute(APIRoute):
+    """
+    DATABASE_ASYNC=true 時，同步 (def) endpoint 改在 event loop 的 greenlet 中執行，
+    不再占用 threadpool；同步模式下行為與一般 APIRoute 完全相同。
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        if DATABASE_ASYNC and not inspect.iscoroutinefunction(endpoint):
+            endpoint = _greenlet_endpoint(endpoint, kwargs.get("response_model"))
+        super().__init__(path, endpoint, **kwargs)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 # =======================
@@ -55,6 +55,49 @@ class TicketUpdate(BaseModel):
     column_id: Optional[int] = None # 用於移動
     position: Optional[int] = None
 
+class TicketMove(BaseModel):
+    ticket_id: int
+    column_id: int
+    index: int  # 在目標欄位中的位置 (0-based)
+
+class TicketMoveRequest(BaseModel):
+    moves: List[TicketMove]
+
+class TicketSelector(BaseModel):
+    # 批次操作的目標：ids 與篩選條件之間是 AND；至少要給一個條件
+    ids: Optional[List[int]] = None
+    board_id: Optional[int] = None
+    column_id: Optional[int] = None
+    priority: Optional[str] = None
+
+    def has_criteria(self) -> bool:
+        return any(v is not None for v in (self.ids, self.board_id, self.column_id, self.priority))
+
+class TicketListFilter(BaseModel):
+    # GET /api/tickets/ 的篩選與排序 (皆為 AND)；組合必須能走索引，檢查在 crud.ticket_list_plan
+    column_id: Optional[int] = None
+    priority: Optional[List[str]] = None
+    due_from: Optional[datetime] = None   # 含
+    due_to: Optional[datetime] = None     # 不含
+    title: Optional[str] = None           # 標題中有以這些字開頭的詞 (走全文搜尋索引)
+    sort: str = "position"
+
+    def is_default(self) -> bool:
+        return self == TicketListFilter()
+
+class TicketBulkChanges(BaseModel):
+    # 移動欄位請用 /tickets/move (需要重新計算 position)
+    priority: Optional[str] = None
+    start_date: Optional[datetime] = None
+    due_date: Optional[datetime] = None
+
+class TicketBulkUpdate(TicketSelector):
+    changes: TicketBulkChanges
+
+class TicketBulkResult(BaseModel):
+    ids: List[int]
+    count: int
+
 class TicketResponse(TicketBase):
     id: int
     board_id: int
@@ -64,6 +107,39 @@ class TicketResponse(TicketBase):
     updated_at: datetime
     model_config = ConfigDict(from_attributes=True)
 
+class TicketSearchResult(TicketResponse):
+    # 相關度 (越大越相關)；title_highlight / snippet 已做 HTML 跳脫，命中處以 <mark> 標示
+    rank: float
+    title_highlight: str
+    snippet: Optional[str] = None
+
+class TicketSearchResponse(BaseModel):
+    results: List[TicketSearchResult]
+    # 只在設定 SEARCH_MAX_CANDIDATES 且命中數超過上限時為 True：較舊的命中沒有參與排序
+    truncated: bool = False
+
+class TicketDeltaResponse(BaseModel):
+    # 增量同步：reset=True 時 tickets 是整個看板，client 應取代本地資料
+    tickets: List[TicketResponse]
+    deleted: List[int]
+    cursor: str
+    reset: bool
+
+class TimelineBucket(BaseModel):
+    # [start, end) 內有進行中的票券 (依開始時間排序)
+    start: datetime
+    end: datetime
+    ticket_ids: List[int]
+
+class TicketTimelineResponse(BaseModel):
+    # 與 [start, end) 重疊的票券；truncated=True 代表超過 limit，只回傳開始最早的 limit 張
+    start: datetime
+    end: datetime
+    bucket: str
+    tickets: List[TicketResponse]
+    buckets: List[TimelineBucket]
+    truncated: bool
+
 # =======================
 # Column Schemas
 # =======================
@@ -86,6 +162,9 @@ class ColumnResponse(ColumnBase):
     position: int
     model_config = ConfigDict(from_attributes=True)
 
+class ColumnSummaryResponse(ColumnResponse):
+    ticket_count: int = 0
+
 # =======================
 # Board Schemas
 # =======================
@@ -108,3 +187,41 @@ class BoardResponse(BoardBase):
 
 class BoardDetailResponse(BoardResponse):
     tickets: List[TicketResponse] = []
+
+class BoardSummaryResponse(BoardBase):
+    id: int
+    owner_id: int
+    created_at: datetime
+    updated_at: datetime
+    ticket_count: int = 0
+    columns: List[ColumnSummaryResponse] = []
+
+# =======================
+# Stats Schemas
+# =======================
+class ColumnStats(BaseModel):
+    id: int
+    name: str
+    color: Optional[str] = None
+    position: int
+    ticket_count: int
+    is_done: bool  # 看板中 position 最大的欄位
+
+class TicketCounts(BaseModel):
+    total: int
+    done: int
+    overdue: int
+    due_soon: int
+    by_priority: Dict[str, int]
+
+class BoardStats(TicketCounts):
+    id: int
+    name: str
+    description: Optional[str] = None
+    columns: List[ColumnStats]
+
+class StatsResponse(TicketCounts):
+    generated_at: datetime
+    due_soon_days: int
+    total_boards: int
+    boards: List[BoardStats]
@@ -0,0 +1,49 @@
+import html
+import os
+import re
+
+# 票券全文搜尋 (GET /api/tickets/search) 的查詢字串處理與 highlight
+# 索引由 migrations/0007 建立：PostgreSQL 是 tickets.search_vector (GIN)，SQLite 是 tickets_fts (FTS5)
+
+MAX_TERMS = 8
+
+# 預設 (0) 對全部命中計算相關度並可一路分頁到最後一筆。
+# 設為 N 時只對最新的 N 筆命中排序 (限制常見詞的成本)，結果總數也以 N 為上限；
+# 命中數超過 N 時回應的 truncated 為 True，client 可提示使用者縮小搜尋範圍
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "0"))
+
+# 資料庫只負責在命中位置插入標記；標記用 Unicode 私有區字元，跳脫 HTML 後再換成 <mark>
+MARK_START = "\ue000"
+MARK_END = "\ue001"
+
+_TERM = re.compile(r"\w+")
+
+def parse_terms(q: str) -> list:
+    # 只取文字 / 數字，查詢語法的特殊字元 (& | ! : * " 等) 一律丟掉，不會被當成運算子
+    return [term.lower() for term in _TERM.findall(q)][:MAX_TERMS]
+
+def _is_prefix(terms: list, index: int) -> bool:
+    # 只有最後一個詞做前綴比對 (邊打邊搜)，前面的詞視為已打完的完整詞；
+    # 前綴會展開成所有符合的詞再合併，對常見詞成本很高。單一字元的前綴也只做完整比對
+    return index == len(terms) - 1 and len(terms[index]) >= 2
+
+def postgres_query(terms: list) -> str:
+    # to_tsquery 語法：所有詞都要出現 (AND)，:* 為前綴比對
+    return " & ".join(f"{t}:*" if _is_prefix(terms, i) else t for i, t in enumerate(terms))
+
+def fts5_query(terms: list) -> str:
+    # FTS5 語法：空白分隔即為 AND，"詞"* 為前綴比對
+    return " ".join(f'"{t}"*' if _is_prefix(terms, i) else f'"{t}"' for i, t in enumerate(terms))
+
+def postgres_title_query(terms: list) -> str:
+    # 只比對標題 (權重 A)，每個詞都是前綴
+    return " & ".join(f"{t}:*A" for t in terms)
+
+def fts5_title_query(terms: list) -> str:
+    # 只比對 title 欄，每個詞都是前綴
+    return " AND ".join(f'title : "{t}"*' for t in terms)
+
+def highlight(value):
+    if value is None:
+        return None
+    return html.escape(value).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
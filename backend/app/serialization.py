@@ -0,0 +1,58 @@
+"""
+大型列表的快速序列化路徑 (GET /api/tickets/、GET /api/boards/{id})
+
+原本的做法是載入 ORM 物件 -> 每一筆以 Pydantic from_attributes 驗證成 TicketResponse -> JSON。
+資料來自自己的資料庫，不需要再驗證一次；快速路徑只 SELECT 回應 schema 需要的欄位，
+資料列以 dict 直接交給 JSON encoder，輸出與 response_model 完全相同 (欄位、順序、時間格式)。
+
+有安裝 orjson (uv sync --extra fast) 時使用 orjson，否則退回標準庫 json。
+FAST_JSON=false 可關閉，回到 response_model 驗證的路徑 (比對或排查問題用)。
+"""
+import json
+import os
+from datetime import date, datetime
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FAST_JSON = os.getenv("FAST_JSON", "true").lower() in ("1", "true", "yes")
+
+def schema_columns(schema, model):
+    # 依 schema 欄位順序取出 model 的欄位，SELECT 結果的 key 順序即為輸出順序
+    return [getattr(model, name) for name in schema.model_fields if name in model.__table__.columns]
+
+def rows_to_dicts(result):
+    # result 為 db.execute(select(...)) 的結果；key 只取一次，比逐列 row._mapping 快數倍
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+def _isoformat(value):
+    # 與 Pydantic 相同：UTC 寫成 Z，其他時區保留 offset，naive 不加時區
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return _isoformat(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+def json_response(content, response: Response = None) -> FastJSONResponse:
+    # 直接回傳 Response 時 FastAPI 不會合併注入的 response 的 header，這裡自己帶上 (ETag / Link 等)
+    headers = {}
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k not in ("content-length", "content-type")}
+    return FastJSONResponse(content, headers=headers)
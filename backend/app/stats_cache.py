@@ -0,0 +1,24 @@
+import os
+from .ttl_cache import TTLCache
+
+# GET /api/stats 的行程內短期快取 (TTL + LRU)
+# 票券 / 欄位 / 看板寫入時依 board_id 失效；跨 worker 的一致性靠 TTL 兜底
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "30"))
+STATS_CACHE_SIZE = int(os.getenv("STATS_CACHE_SIZE", "10000"))
+
+class StatsCache(TTLCache):
+    # (user_id, board_id | None) -> 統計結果；標籤為使用者與統計涵蓋的每個看板，任一個有寫入就失效
+    def __init__(self, maxsize: int = STATS_CACHE_SIZE, ttl: float = STATS_CACHE_TTL):
+        super().__init__(maxsize, ttl)
+
+    def _tags(self, key, stats):
+        return [("user", key[0])] + [("board", b["id"]) for b in stats["boards"]]
+
+    def invalidate_board(self, *board_ids):
+        self.invalidate_tag(*(("board", board_id) for board_id in board_ids))
+
+    def invalidate_user(self, user_id: int):
+        # 新增看板時，使用者的全部統計都要重算
+        self.invalidate_tag(("user", user_id))
+
+stats_cache = StatsCache()
@@ -0,0 +1,46 @@
+import base64
+import binascii
+import os
+from datetime import datetime, timedelta, timezone
+
+# 增量同步 (GET /api/tickets/?board_id=&since=) 的 cursor 與 tombstone 設定
+# cursor 往回重疊幾秒：涵蓋 SQLite 的秒級時間戳，以及 commit 晚於 updated_at 的 transaction
+SYNC_CURSOR_OVERLAP = timedelta(seconds=float(os.getenv("SYNC_CURSOR_OVERLAP", "5")))
+# tombstone 保留天數；cursor 比這更舊的 client 會收到完整重新同步 (reset)
+SYNC_TOMBSTONE_RETENTION = timedelta(days=float(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30")))
+
+# 第一次同步用的 cursor
+INITIAL_CURSOR = "0"
+
+def to_utc(value: datetime) -> datetime:
+    # 所有時間比較都在 aware UTC 下進行：SQLite 的 now() 是 naive (UTC)，PostgreSQL 是 aware
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def encode_cursor(value: datetime) -> str:
+    # 不透明字串 (UTC isoformat 的 base64url)，client 原樣帶回即可
+    raw = to_utc(value).isoformat().encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _parse(text: str) -> datetime:
+    try:
+        return to_utc(datetime.fromisoformat(text))
+    except OverflowError:
+        # 例如 0001-01-01T00:00:00+08:00 轉成 UTC 會超出範圍
+        raise ValueError("Invalid sync cursor")
+
+def decode_cursor(cursor: str):
+    """回傳 aware UTC datetime；INITIAL_CURSOR 回傳 None。格式錯誤 raise ValueError"""
+    if cursor == INITIAL_CURSOR:
+        return None
+    try:
+        # 舊版 client 保存的是 isoformat 原文 (可能是 Z、+08:00 或 naive)
+        return _parse(cursor)
+    except ValueError:
+        pass
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid sync cursor")
+    return _parse(text)
@@ -0,0 +1,37 @@
+import os
+from datetime import timedelta, timezone
+
+# 時間軸 (GET /api/tickets/timeline)：把票券 [start_date, due_date] 分到每天 / 每週的區間
+# 查詢與索引見 crud.get_ticket_timeline、migrations/0009
+
+BUCKET_SIZES = {"day": timedelta(days=1), "week": timedelta(weeks=1)}
+
+# 一次最多幾個區間 (約一年的天數 / 兩年的週數)
+TIMELINE_MAX_BUCKETS = int(os.getenv("TIMELINE_MAX_BUCKETS", "400"))
+
+def _utc(value):
+    # SQLite 讀回的是 naive datetime，視為 UTC (與 pagination.datetime_key 相同)
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def bucket_count(start, end, bucket: str) -> int:
+    step = BUCKET_SIZES[bucket]
+    return -((_utc(start) - _utc(end)) // step)
+
+def bucket_tickets(tickets: list, start, end, bucket: str) -> list:
+    """回傳每個區間的票券 id；區間從 start 開始對齊 (client 傳當地的午夜 / 週一即為當地的日 / 週)
+
+    tickets 是 dict (需有 id、start_date、due_date)，已依開始時間排序；只有一端的票券視為單點。
+    """
+    step = BUCKET_SIZES[bucket]
+    count = bucket_count(start, end, bucket)
+    # 區間邊界沿用 start / end 的時區表示 (naive 的輸入回傳 naive)
+    buckets = [{"start": start + step * i, "end": min(start + step * (i + 1), end), "ticket_ids": []}
+               for i in range(count)]
+    start = _utc(start)
+    for ticket in tickets:
+        dates = [_utc(d) for d in (ticket["start_date"], ticket["due_date"]) if d is not None]
+        first = max((min(dates) - start) // step, 0)
+        last = min((max(dates) - start) // step, count - 1)
+        for i in range(first, last + 1):
+            buckets[i]["ticket_ids"].append(ticket["id"])
+    return buckets
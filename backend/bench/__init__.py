@@ -0,0 +1,20 @@
+"""
+可重現的壓測套件
+
+    uv run python -m bench                                  # 預設：SQLite 暫存檔、20 users × 3 boards × 4 columns × 200 tickets
+    uv run python -m bench --users 50 --concurrency 100 --duration 60 --output results.json
+    uv run python -m bench --database-url postgresql://user:pw@localhost:5432/kanban_bench
+    uv run python -m bench --baseline main.json             # 與先前的結果比較，p95 退步超過門檻時 exit 1
+
+流程:
+    1. dataset   套用 migrations，直接寫入資料庫建立 users × boards × columns × tickets (以 --seed 決定內容)
+    2. server    以 uvicorn 啟動 app (單一 worker，與正式環境相同的程式路徑)
+    3. workload  N 個虛擬使用者併發執行：登入、打開看板、新增 / 移動 / 刪除票券、管理員儀表板
+    4. report    每個端點的 throughput 與 p50 / p95 / p99，輸出 JSON
+
+server.py (啟動 / 等待 server、建立壓測看板) 與 report.percentile 也給 backend 根目錄的
+bench_async.py、bench_events.py 使用，所有壓測共用同一套 harness。
+
+全程只連本機的資料庫與 server，不需要網路；需要 httpx (uv sync --extra bench)。
+資料庫中 username 以 bench_ 開頭的使用者 (連同其看板) 每次執行前都會被刪除，請使用專用的資料庫。
+"""
@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from . import report, workload
+from .server import BACKEND_DIR, start_server, wait_ready
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Seed a dataset and load test the API")
+    parser.add_argument("--database-url", default=None, help="defaults to a temporary SQLite file")
+    parser.add_argument("--async-mode", action="store_true", help="run the server with DATABASE_ASYNC=true")
+    # 資料量
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--boards", type=int, default=3, help="boards per user")
+    parser.add_argument("--columns", type=int, default=4, help="columns per board")
+    parser.add_argument("--tickets", type=int, default=200, help="tickets per board")
+    # 負載
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds excluded from the results")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the dataset and the operation mix")
+    parser.add_argument("--port", type=int, default=8790)
+    # 輸出
+    parser.add_argument("--output", help="write the JSON report to this file (default: stdout)")
+    parser.add_argument("--baseline", help="compare against a previous JSON report")
+    parser.add_argument("--max-regression", type=float, default=1.2,
+                        help="fail when an endpoint's p95 exceeds baseline by this ratio")
+    return parser.parse_args()
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def main():
+    args = parse_args()
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+    # seed 與 server 使用相同設定；壓測登入很頻繁，降低 bcrypt 成本 (除非呼叫端另外指定)
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["DATABASE_ASYNC"] = "false"
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    sys.path.insert(0, BACKEND_DIR)
+
+    from app.migrations import run_migrations
+    from . import dataset as dataset_module
+
+    log = lambda msg: print(msg, file=sys.stderr)
+    run_migrations(database_url, log=log)
+    seed_started = time.perf_counter()
+    dataset = dataset_module.seed(args.users, args.boards, args.columns, args.tickets, seed=args.seed)
+    log(f"Seeded {dataset.counts()} in {time.perf_counter() - seed_started:.1f}s")
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    proc = start_server(database_url, args.async_mode, args.port)
+    try:
+        wait_ready(base_url)
+        log(f"Running {args.concurrency} virtual users for {args.warmup:g}s warmup + {args.duration:g}s")
+        samples, measured_from, finished = asyncio.run(
+            workload.run(base_url, dataset, args.concurrency, args.duration, args.warmup, args.seed)
+        )
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    result = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            # 只記錄資料庫種類，不輸出連線字串 (可能含密碼)
+            "database": database_url.split(":", 1)[0],
+            "async_mode": args.async_mode,
+            "dataset": dataset.counts(),
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "operations": workload.OPERATIONS,
+        },
+        "results": report.summarize(samples, finished - measured_from),
+    }
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    report.print_table(result, file=sys.stderr)
+
+    if args.baseline:
+        regressions = 0
+        log(f"\nCompared with {args.baseline} (p95):")
+        for endpoint, base, current, ratio, regressed in report.compare(result, report.load(args.baseline), max_ratio=args.max_regression):
+            regressions += regressed
+            log(f"  {endpoint:<28} {base:>8.1f}ms -> {current:>8.1f}ms  {ratio:>5.2f}x{'  REGRESSION' if regressed else ''}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""建立壓測資料：直接以 bulk INSERT 寫入資料庫，不經過 API"""
+import random
+from dataclasses import dataclass, field
+
+USER_PREFIX = "bench_"
+ADMIN_USERNAME = "bench_admin"
+PASSWORD = "bench-password"
+
+@dataclass
+class BoardData:
+    id: int
+    column_ids: list
+    ticket_ids: list
+
+@dataclass
+class UserData:
+    username: str
+    boards: list = field(default_factory=list)
+
+@dataclass
+class Dataset:
+    users: list
+    admin_username: str = ADMIN_USERNAME
+    password: str = PASSWORD
+
+    def counts(self):
+        boards = [b for u in self.users for b in u.boards]
+        return {
+            "users": len(self.users),
+            "boards": len(boards),
+            "columns": sum(len(b.column_ids) for b in boards),
+            "tickets": sum(len(b.ticket_ids) for b in boards),
+        }
+
+def seed(users: int, boards: int, columns: int, tickets: int, seed: int = 0) -> Dataset:
+    """
+    建立 users 個使用者，每人 boards 個看板、每個看板 columns 個欄位與 tickets 張票券，另加一個管理員。
+    呼叫前必須已設定 DATABASE_URL (app.database 在 import 時讀取)。
+    """
+    from sqlalchemy import delete
+    from app import models, passwords
+    from app.database import SessionLocal
+    from app.ranking import POSITION_GAP
+
+    rng = random.Random(seed)
+    # bcrypt 很慢，所有使用者共用同一個 hash
+    password_hash = passwords.hash_password(PASSWORD)
+
+    db = SessionLocal()
+    try:
+        # 清掉上一次的壓測資料 (看板 / 欄位 / 票券由 ON DELETE CASCADE 一併刪除)
+        db.execute(delete(models.User).where(models.User.username.startswith(USER_PREFIX, autoescape=True)))
+        db.commit()
+
+        user_rows = [{
+            "username": f"{USER_PREFIX}user_{i}",
+            "password_hash": password_hash,
+            "name": f"Bench User {i}",
+            "role": "user",
+        } for i in range(users)]
+        user_rows.append({"username": ADMIN_USERNAME, "password_hash": password_hash, "name": "Bench Admin", "role": "admin"})
+        user_ids = _insert_returning_ids(db, models.User, user_rows)
+
+        dataset = Dataset(users=[UserData(username=row["username"]) for row in user_rows[:-1]])
+        board_rows = [{
+            "name": f"Board {u}-{b}",
+            "description": f"Benchmark board {b} of user {u}",
+            "owner_id": user_ids[u],
+        } for u in range(users) for b in range(boards)]
+        board_ids = _insert_returning_ids(db, models.Board, board_rows)
+
+        column_rows = [{
+            "board_id": board_id,
+            "name": f"Column {c}",
+            "color": "slate",
+            "position": c,
+        } for board_id in board_ids for c in range(columns)]
+        column_ids = _insert_returning_ids(db, models.KanbanColumn, column_rows)
+
+        for index, board_id in enumerate(board_ids):
+            board_columns = column_ids[index * columns:(index + 1) * columns]
+            ticket_rows = [{
+                "board_id": board_id,
+                "column_id": board_columns[t % columns],
+                "title": f"Ticket {t}",
+                "description": "Seeded by bench" if rng.random() < 0.5 else None,
+                "priority": rng.choice(("low", "medium", "high")),
+                "position": (t // columns + 1) * POSITION_GAP,
+            } for t in range(tickets)]
+            ticket_ids = _insert_returning_ids(db, models.Ticket, ticket_rows) if ticket_rows else []
+            dataset.users[index // boards].boards.append(BoardData(board_id, board_columns, ticket_ids))
+        db.commit()
+        return dataset
+    finally:
+        db.close()
+
+def _insert_returning_ids(db, model, rows, batch_size: int = 5000):
+    from sqlalchemy import insert
+
+    ids = []
+    for start in range(0, len(rows), batch_size):
+        result = db.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            rows[start:start + batch_size],
+        )
+        ids.extend(result.scalars().all())
+    return ids
@@ -0,0 +1,68 @@
+"""彙整壓測結果 (每個端點的 throughput 與延遲百分位)，以及與 baseline 比較"""
+import json
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+def _summary(latencies, errors, elapsed):
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies, default=0) * 1000, 2),
+    }
+
+def summarize(samples, elapsed: float) -> dict:
+    by_endpoint = {}
+    for sample in samples:
+        by_endpoint.setdefault(sample.endpoint, []).append(sample)
+
+    # 304 Not Modified 是正常回應；連線失敗記為 status 0
+    def is_error(sample):
+        return sample.status == 0 or sample.status >= 400
+
+    endpoints = {}
+    for endpoint in sorted(by_endpoint):
+        group = by_endpoint[endpoint]
+        endpoints[endpoint] = _summary([s.latency for s in group], sum(is_error(s) for s in group), elapsed)
+        statuses = {}
+        for s in group:
+            key = s.error or str(s.status)
+            statuses[key] = statuses.get(key, 0) + 1
+        endpoints[endpoint]["status_codes"] = statuses
+
+    return {
+        "total": _summary([s.latency for s in samples], sum(is_error(s) for s in samples), elapsed),
+        "endpoints": endpoints,
+    }
+
+def compare(current: dict, baseline: dict, metric: str = "p95_ms", max_ratio: float = 1.2):
+    """回傳 [(endpoint, baseline 值, 目前值, 比值, 是否退步)]；只比較兩邊都有的端點"""
+    rows = []
+    for endpoint, stats in current["results"]["endpoints"].items():
+        base = baseline.get("results", {}).get("endpoints", {}).get(endpoint)
+        if not base or not base.get(metric):
+            continue
+        ratio = stats[metric] / base[metric]
+        rows.append((endpoint, base[metric], stats[metric], ratio, ratio > max_ratio))
+    return rows
+
+def print_table(report: dict, file):
+    results = report["results"]
+    print(f"{'endpoint':<28} {'reqs':>7} {'err':>5} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}", file=file)
+    rows = list(results["endpoints"].items()) + [("TOTAL", results["total"])]
+    for endpoint, s in rows:
+        print(f"{endpoint:<28} {s['requests']:>7} {s['errors']:>5} {s['throughput_rps']:>8.1f} "
+              f"{s['p50_ms']:>6.1f}ms {s['p95_ms']:>6.1f}ms {s['p99_ms']:>6.1f}ms", file=file)
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,56 @@
+"""壓測共用：以 uvicorn 子行程啟動 app、等待就緒、透過 API 建立壓測帳號與看板"""
+import os
+import random
+import string
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def random_str(length=8):
+    return ''.join(random.choices(string.ascii_letters, k=length))
+
+def start_server(database_url: str, async_mode: bool, port: int, extra_args=()):
+    env = dict(os.environ)
+    env["DATABASE_URL"] = database_url
+    env["DATABASE_ASYNC"] = "true" if async_mode else "false"
+    # 壓測登入很頻繁 (或只登入一次)，降低 bcrypt 成本避免干擾 (除非呼叫端另外指定)
+    env.setdefault("BCRYPT_ROUNDS", "4")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning",
+         *extra_args],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+def wait_ready(base_url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+def seed_board(base_url, name: str, tickets: int = 0):
+    """註冊一個 bench_ 使用者並建立看板 (含 tickets 張票券)；回傳 (token, board)"""
+    username = f"bench_{random_str()}"
+    password = "password123"
+    with httpx.Client(base_url=f"{base_url}/api", timeout=30) as client:
+        client.post("/auth/register", json={"username": username, "password": password, "name": "Bench"})
+        token = client.post("/auth/login", json={"username": username, "password": password}).json()["access_token"]
+        headers = {"Authorization": f"Token {token}"}
+        board = client.post("/boards/", headers=headers, json={"name": name}).json()
+        columns = board["columns"]
+        for i in range(tickets):
+            client.post("/tickets/", headers=headers, json={
+                "board_id": board["id"],
+                "column_id": columns[i % len(columns)]["id"],
+                "title": f"Ticket {i}",
+            })
+    return token, board
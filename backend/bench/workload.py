@@ -0,0 +1,158 @@
+"""虛擬使用者：以 httpx 併發呼叫 API，記錄每個請求的延遲與狀態碼"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+# 操作權重，約略對應前端的使用比例
+OPERATIONS = {
+    "board_open": 40,
+    "ticket_create": 20,
+    "ticket_move": 20,
+    "ticket_delete": 10,
+    "login": 5,
+    "admin_dashboard": 5,
+}
+
+@dataclass
+class Sample:
+    endpoint: str  # "GET /api/boards/{id}" (路由樣板，不含實際 id)
+    started: float
+    latency: float
+    status: int  # 連線層級的錯誤為 0，error 記錄例外名稱
+    error: str = None
+
+@dataclass
+class Recorder:
+    warmup_until: float
+    samples: list = field(default_factory=list)
+
+    async def request(self, client, method, endpoint, url, **kwargs):
+        started = time.perf_counter()
+        error = None
+        try:
+            response = await client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError as exc:
+            response, status, error = None, 0, type(exc).__name__
+        latency = time.perf_counter() - started
+        # 暖機期間的請求不計入結果
+        if started >= self.warmup_until:
+            self.samples.append(Sample(endpoint, started, latency, status, error))
+        return response
+
+class VirtualUser:
+    def __init__(self, recorder, client, username, password, boards, admin_username, rng):
+        self.recorder = recorder
+        self.client = client
+        self.username = username
+        self.password = password
+        self.boards = boards  # [(board_id, column_ids, ticket_ids)]，ticket_ids 只含分配給這個 VU 的票券
+        self.admin_username = admin_username
+        self.rng = rng
+        self.headers = {}
+        self.admin_headers = None
+        self.etags = {}
+
+    async def login(self, username=None):
+        response = await self.recorder.request(self.client, "POST", "POST /api/auth/login", "/api/auth/login", json={
+            "username": username or self.username, "password": self.password,
+        })
+        if response is None or response.status_code != 200:
+            return None
+        return {"Authorization": f"Token {response.json()['access_token']}"}
+
+    async def run(self, deadline):
+        self.headers = await self.login() or {}
+        names = list(OPERATIONS)
+        weights = list(OPERATIONS.values())
+        while time.perf_counter() < deadline:
+            operation = self.rng.choices(names, weights)[0]
+            await getattr(self, operation)()
+
+    def _pick_board(self):
+        return self.rng.choice(self.boards)
+
+    async def board_open(self):
+        board_id, _, _ = self._pick_board()
+        # 與瀏覽器相同，帶上次的 ETag 做條件式 GET
+        headers = dict(self.headers)
+        if board_id in self.etags:
+            headers["If-None-Match"] = self.etags[board_id]
+        response = await self.recorder.request(self.client, "GET", "GET /api/boards/{id}", f"/api/boards/{board_id}", headers=headers)
+        if response is not None and response.status_code == 200:
+            self.etags[board_id] = response.headers.get("etag")
+
+    async def ticket_create(self):
+        board_id, column_ids, ticket_ids = self._pick_board()
+        response = await self.recorder.request(self.client, "POST", "POST /api/tickets/", "/api/tickets/", headers=self.headers, json={
+            "board_id": board_id,
+            "column_id": self.rng.choice(column_ids),
+            "title": f"Bench ticket {self.rng.randrange(1_000_000)}",
+            "priority": self.rng.choice(("low", "medium", "high")),
+        })
+        if response is not None and response.status_code == 200:
+            ticket_ids.append(response.json()["id"])
+
+    async def ticket_move(self):
+        _, column_ids, ticket_ids = self._pick_board()
+        if not ticket_ids:
+            return await self.ticket_create()
+        await self.recorder.request(self.client, "POST", "POST /api/tickets/move", "/api/tickets/move", headers=self.headers, json={
+            "moves": [{
+                "ticket_id": self.rng.choice(ticket_ids),
+                "column_id": self.rng.choice(column_ids),
+                "index": self.rng.randrange(10),
+            }],
+        })
+
+    async def ticket_delete(self):
+        _, _, ticket_ids = self._pick_board()
+        if not ticket_ids:
+            return await self.ticket_create()
+        ticket_id = ticket_ids.pop(self.rng.randrange(len(ticket_ids)))
+        await self.recorder.request(self.client, "DELETE", "DELETE /api/tickets/{id}", f"/api/tickets/{ticket_id}", headers=self.headers)
+
+    async def admin_dashboard(self):
+        # AdminDashboardView：總覽統計 + 使用者列表
+        if self.admin_headers is None:
+            self.admin_headers = await self.login(self.admin_username) or {}
+        await self.recorder.request(self.client, "GET", "GET /api/stats/", "/api/stats/", headers=self.admin_headers)
+        await self.recorder.request(self.client, "GET", "GET /api/users/", "/api/users/", headers=self.admin_headers)
+
+def assign(dataset, concurrency: int):
+    """
+    把資料分配給 concurrency 個虛擬使用者：VU i 使用第 i % users 個使用者；
+    多個 VU 共用同一個使用者時，票券依序分給各個 VU，避免互相刪除對方的票券
+    """
+    users = dataset.users
+    sharing = {}
+    for vu in range(concurrency):
+        sharing.setdefault(vu % len(users), []).append(vu)
+
+    assignments = []
+    for vu in range(concurrency):
+        user_index = vu % len(users)
+        share = sharing[user_index]
+        slot = share.index(vu)
+        boards = [
+            (board.id, board.column_ids, board.ticket_ids[slot::len(share)])
+            for board in users[user_index].boards
+        ]
+        assignments.append((users[user_index].username, boards))
+    return assignments
+
+async def run(base_url, dataset, concurrency: int, duration: float, warmup: float, seed: int):
+    started = time.perf_counter()
+    recorder = Recorder(warmup_until=started + warmup)
+    deadline = started + warmup + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        users = [
+            VirtualUser(recorder, client, username, dataset.password, boards, dataset.admin_username, random.Random(seed * 100_003 + vu))
+            for vu, (username, boards) in enumerate(assign(dataset, concurrency))
+        ]
+        await asyncio.gather(*(user.run(deadline) for user in users))
+    return recorder.samples, recorder.warmup_until, time.perf_counter()
@@ -0,0 +1,108 @@
+"""
+同步 / async 資料庫模式的並排壓測
+
+分別以 DATABASE_ASYNC=false 與 DATABASE_ASYNC=true 啟動 uvicorn，
+對同一份資料在不同併發數下打 GET /api/boards/{id} 與 GET /api/tickets/，
+輸出每個模式的 req/s 與 p50 / p95 延遲。
+
+用法:
+    uv run python bench_async.py --database-url postgresql://user:pw@localhost:5432/kanban_bench
+    uv run python bench_async.py --levels 1,10,50,100,200 --requests 2000
+
+需要 httpx 與 async driver (uv sync --extra async --extra bench)。
+預設使用本機 SQLite 檔案，要看出連線池 vs threadpool 的差異建議改用 PostgreSQL。
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from bench.report import percentile
+from bench.server import seed_board, start_server, wait_ready
+
+async def run_level(base_url, headers, paths, concurrency, total, timeout):
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker(client):
+        nonlocal errors
+        for i in remaining:
+            path = paths[i % len(paths)]
+            started = time.perf_counter()
+            try:
+                resp = await client.get(path, headers=headers)
+                ok = resp.status_code == 200
+            except httpx.HTTPError:
+                # 連線池耗盡時 server 可能直接斷線或逾時，一律算錯誤
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "rps": total / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+    }
+
+def bench_mode(args, async_mode, port):
+    database_url = args.database_url
+    if database_url.startswith("sqlite"):
+        # 兩個模式各用一個 SQLite 檔，避免互相影響
+        database_url = database_url.replace(".db", "_async.db" if async_mode else "_sync.db")
+    proc = start_server(database_url, async_mode, port)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(base_url)
+        token, board = seed_board(base_url, "Bench Board", tickets=args.tickets)
+        headers = {"Authorization": f"Token {token}"}
+        paths = [f"/api/boards/{board['id']}", f"/api/tickets/?board_id={board['id']}"]
+        results = []
+        for level in args.levels:
+            results.append(asyncio.run(run_level(base_url, headers, paths, level, args.requests, args.timeout)))
+        return results
+    finally:
+        proc.terminate()
+        proc.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync vs async database mode")
+    parser.add_argument("--database-url", default="sqlite:///./bench.db")
+    parser.add_argument("--levels", default="1,10,50,100,200",
+                        type=lambda s: [int(x) for x in s.split(",")])
+    parser.add_argument("--requests", type=int, default=1000, help="requests per concurrency level")
+    parser.add_argument("--tickets", type=int, default=50, help="tickets seeded into the bench board")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=30, help="per-request client timeout (seconds)")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    report = {
+        "sync": bench_mode(args, async_mode=False, port=args.port),
+        "async": bench_mode(args, async_mode=True, port=args.port + 1),
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    header = f"{'rps':>9} {'p50':>9} {'p95':>9} {'errors':>6}"
+    print(f"{'concurrency':>11} | sync  {header} | async {header}")
+    for s, a in zip(report["sync"], report["async"]):
+        row = lambda r: f"{r['rps']:>9.1f} {r['p50_ms']:>7.1f}ms {r['p95_ms']:>7.1f}ms {r['errors']:>6}"
+        print(f"{s['concurrency']:>11} |       {row(s)} |       {row(a)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+刪除大型看板的壓測：ORM 載入後逐筆刪除 vs 資料庫 ON DELETE CASCADE
+
+建立一個有 N 張票券的看板，分別用兩種方式刪除並比較耗時、SQL 語句數與 Python 記憶體峰值:
+  orm-cascade  舊做法：ORM 刪除 board 時把欄位與票券全部載入 session 再逐筆 DELETE。
+               使用本檔另外定義的舊版對應 (relationship 沒有 passive_deletes、外鍵沒有 ondelete)，
+               SQLite 並比照舊版關閉 foreign_keys，不會有資料庫層的 cascade；PostgreSQL 的外鍵
+               仍是 ON DELETE CASCADE，但子資料已先由 ORM 刪除，cascade 不會刪到任何列
+  db-cascade   crud.delete_board：單一 DELETE，子資料由外鍵 ON DELETE CASCADE 刪除
+
+用法:
+    uv run python bench_cascade.py                                   # 預設 SQLite 暫存檔、50k 票券
+    uv run python bench_cascade.py --database-url postgresql://user:pw@localhost:5432/kanban_bench --tickets 50000
+
+資料庫會先套用 migrations；建議使用專用的測試資料庫。
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+def baseline_models():
+    """
+    舊版 (沒有 ON DELETE CASCADE 以前) 的看板 / 欄位 / 票券對應，對應到同樣的資料表：
+    cascade="all, delete-orphan" 但沒有 passive_deletes，外鍵也沒有 ondelete
+    """
+    from types import SimpleNamespace
+    from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String, Text
+    from sqlalchemy.orm import declarative_base, relationship
+
+    Base = declarative_base()
+
+    class Board(Base):
+        __tablename__ = "boards"
+
+        id = Column(BigInteger, primary_key=True)
+        name = Column(String(100), nullable=False)
+        description = Column(Text)
+        owner_id = Column(BigInteger, nullable=False)
+        created_at = Column(DateTime(timezone=True))
+        updated_at = Column(DateTime(timezone=True))
+
+        columns = relationship("KanbanColumn", back_populates="board", cascade="all, delete-orphan",
+                               order_by="KanbanColumn.position")
+        tickets = relationship("Ticket", back_populates="board", cascade="all, delete-orphan")
+
+    class KanbanColumn(Base):
+        __tablename__ = "columns"
+
+        id = Column(BigInteger, primary_key=True)
+        board_id = Column(BigInteger, ForeignKey("boards.id"), nullable=False)
+        name = Column(String(100), nullable=False)
+        color = Column(String(20))
+        position = Column(Integer, nullable=False)
+        created_at = Column(DateTime(timezone=True))
+        updated_at = Column(DateTime(timezone=True))
+
+        board = relationship("Board", back_populates="columns")
+        tickets = relationship("Ticket", back_populates="column", cascade="all, delete-orphan")
+
+    class Ticket(Base):
+        __tablename__ = "tickets"
+
+        id = Column(BigInteger, primary_key=True)
+        board_id = Column(BigInteger, ForeignKey("boards.id"), nullable=False)
+        column_id = Column(BigInteger, ForeignKey("columns.id"), nullable=False)
+        title = Column(String(255), nullable=False)
+        description = Column(Text)
+        priority = Column(String(20))
+        start_date = Column(DateTime(timezone=True))
+        due_date = Column(DateTime(timezone=True))
+        position = Column(Integer)
+        created_at = Column(DateTime(timezone=True))
+        updated_at = Column(DateTime(timezone=True))
+
+        board = relationship("Board", back_populates="tickets")
+        column = relationship("KanbanColumn", back_populates="tickets")
+
+    return SimpleNamespace(Board=Board, KanbanColumn=KanbanColumn, Ticket=Ticket)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark deleting a large board")
+    parser.add_argument("--database-url", default="sqlite:///./bench_cascade.db")
+    parser.add_argument("--tickets", type=int, default=50_000)
+    parser.add_argument("--columns", type=int, default=4)
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    # app.database 在 import 時讀取 DATABASE_URL
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DATABASE_ASYNC"] = "false"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from sqlalchemy import event, insert, select, text
+    from app import crud, models
+    from app.database import SessionLocal, engine
+    from app.migrations import run_migrations
+    from app.ranking import POSITION_GAP
+
+    run_migrations(args.database_url, log=lambda msg: None)
+
+    statements = []
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statements(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def seed(db):
+        owner = db.scalar(select(models.User).where(models.User.username == "bench_cascade"))
+        if owner is None:
+            owner = models.User(username="bench_cascade", password_hash="x", name="Bench", role="user")
+            db.add(owner)
+            db.flush()
+        board = models.Board(name="Cascade Bench", owner_id=owner.id)
+        db.add(board)
+        db.flush()
+        columns = [models.KanbanColumn(board_id=board.id, name=f"Col {i}", position=i) for i in range(args.columns)]
+        db.add_all(columns)
+        db.flush()
+        rows = [{
+            "board_id": board.id,
+            "column_id": columns[i % len(columns)].id,
+            "title": f"Ticket {i}",
+            "priority": "medium",
+            "position": (i // len(columns) + 1) * POSITION_GAP,
+        } for i in range(args.tickets)]
+        for start in range(0, len(rows), 5000):
+            db.execute(insert(models.Ticket), rows[start:start + 5000])
+        db.commit()
+        return board.id
+
+    baseline = baseline_models()
+
+    def orm_cascade(db, board_id):
+        # 舊版 crud.delete_board：查出 board 後 db.delete，子物件由 relationship 逐一 lazy load 再刪除
+        board = db.get(baseline.Board, board_id)
+        db.delete(board)
+        db.commit()
+
+    def db_cascade(db, board_id):
+        crud.delete_board(db, board_id=board_id)
+
+    results = {}
+    # SQLite 的 foreign_keys 是連線層級的設定：舊版沒有開啟，新版每條連線都開啟
+    for name, fn, foreign_keys in (("orm-cascade", orm_cascade, "OFF"), ("db-cascade", db_cascade, "ON")):
+        db = SessionLocal()
+        try:
+            if engine.dialect.name == "sqlite":
+                db.execute(text(f"PRAGMA foreign_keys={foreign_keys}"))
+            board_id = seed(db)
+            db.expunge_all()
+            statements.clear()
+            tracemalloc.start()
+            started = time.perf_counter()
+            fn(db, board_id)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            remaining = db.query(models.Ticket).filter(models.Ticket.board_id == board_id).count()
+        finally:
+            db.close()
+        results[name] = {
+            "tickets": args.tickets,
+            "seconds": elapsed,
+            "statements": len(statements),
+            "peak_memory_mb": peak / 1024 / 1024,
+            "remaining_tickets": remaining,
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'mode':<12} {'tickets':>8} {'seconds':>9} {'statements':>10} {'peak MB':>9} {'left':>5}")
+    for name, r in results.items():
+        print(f"{name:<12} {r['tickets']:>8} {r['seconds']:>9.3f} {r['statements']:>10} "
+              f"{r['peak_memory_mb']:>9.1f} {r['remaining_tickets']:>5}")
+
+if __name__ == "__main__":
+    main()
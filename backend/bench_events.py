@@ -0,0 +1,160 @@
+"""
+即時推播 (SSE) 的壓測：大量閒置訂閱者 + 事件分派延遲
+
+啟動一個 uvicorn worker，對同一個看板開 N 條閒置的 SSE 連線 (GET /api/boards/{id}/events)，
+量測:
+  - 每條訂閱占用的 server 記憶體 (RSS 差值 / N)
+  - 閒置期間 server 的 CPU 使用率
+  - 每次寫入後事件送達所有訂閱者的延遲 (p50 / p99 / max) 與送達率
+
+用法:
+    uv run python bench_events.py --subscribers 5000
+    uv run python bench_events.py --subscribers 2000,5000,10000 --writes 20 --json
+
+訂閱者用原生 asyncio socket 實作，client 端盡量輕量；需要 httpx 做初始化 (uv sync --extra bench)。
+延遲是從送出寫入到「client 的單一 event loop 讀到事件」，N 很大時 client 本身的解析也算在內，數值偏保守。
+每條連線占用一個 fd，N 很大時先調高 `ulimit -n`。
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import httpx
+
+from bench.report import percentile
+from bench.server import seed_board, start_server, wait_ready
+
+def read_proc(pid):
+    # 回傳 (RSS bytes, 累計 CPU 秒數)；僅支援 Linux
+    with open(f"/proc/{pid}/status") as f:
+        rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    return rss_kb * 1024, (int(fields[11]) + int(fields[12])) / ticks
+
+class Subscriber:
+    def __init__(self):
+        self.ready = asyncio.Event()
+        self.received = {}  # version -> 收到的時間
+        self.writer = None
+
+    async def run(self, port, board_id, token):
+        reader, self.writer = await asyncio.open_connection("127.0.0.1", port)
+        self.writer.write(
+            f"GET /api/boards/{board_id}/events?token={token} HTTP/1.1\r\n"
+            f"Host: 127.0.0.1\r\nAccept: text/event-stream\r\n\r\n".encode()
+        )
+        await self.writer.drain()
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            if line.startswith(b"event: ready"):
+                self.ready.set()
+            elif line.startswith(b"data: {\"type\""):
+                event = json.loads(line[6:])
+                self.received[event["version"]] = time.perf_counter()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+async def run_level(args, port, base_url, token, board, count):
+    proc_pid = args.server_pid
+    rss_before, _ = read_proc(proc_pid)
+
+    subscribers = [Subscriber() for _ in range(count)]
+    tasks = []
+    # 分批連線，避免瞬間塞爆 accept backlog
+    for start in range(0, count, 500):
+        for sub in subscribers[start:start + 500]:
+            tasks.append(asyncio.create_task(sub.run(port, board["id"], token)))
+        await asyncio.sleep(0.05)
+    await asyncio.wait_for(asyncio.gather(*(s.ready.wait() for s in subscribers)), timeout=120)
+
+    rss_after, cpu_before = read_proc(proc_pid)
+    await asyncio.sleep(args.idle)
+    _, cpu_after = read_proc(proc_pid)
+
+    headers = {"Authorization": f"Token {token}"}
+    column_id = board["columns"][0]["id"]
+    write_times = []
+    async with httpx.AsyncClient(base_url=f"{base_url}/api", timeout=30) as client:
+        for i in range(args.writes):
+            started = time.perf_counter()
+            resp = await client.post("/tickets/", headers=headers, json={
+                "board_id": board["id"], "column_id": column_id, "title": f"Event {i}",
+            })
+            resp.raise_for_status()
+            write_times.append(started)
+            # 下一次寫入前等事件散播完
+            await asyncio.sleep(args.interval)
+        await asyncio.sleep(1)
+    # 每次寫入對應一個新版本號，依序配對
+    versions = sorted(set().union(*(s.received.keys() for s in subscribers)))
+
+    latencies = []
+    delivered = 0
+    for version, started in zip(versions, write_times):
+        for sub in subscribers:
+            received = sub.received.get(version)
+            if received is not None:
+                delivered += 1
+                latencies.append(received - started)
+
+    for sub in subscribers:
+        sub.close()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.sleep(1)
+
+    return {
+        "subscribers": count,
+        "rss_per_subscriber_kb": (rss_after - rss_before) / count / 1024,
+        "idle_cpu_pct": (cpu_after - cpu_before) / args.idle * 100,
+        "writes": args.writes,
+        "delivery_rate": delivered / (count * args.writes),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies, default=0) * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the SSE board change feed")
+    parser.add_argument("--database-url", default="sqlite:///./bench_events.db")
+    parser.add_argument("--subscribers", default="1000,5000",
+                        type=lambda s: [int(x) for x in s.split(",")])
+    parser.add_argument("--writes", type=int, default=10, help="writes per level (one event each)")
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between writes")
+    parser.add_argument("--idle", type=float, default=10, help="seconds to measure idle CPU")
+    parser.add_argument("--async-mode", action="store_true", help="run the server with DATABASE_ASYNC=true")
+    parser.add_argument("--port", type=int, default=8775)
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    proc = start_server(args.database_url, args.async_mode, args.port, extra_args=("--backlog", "4096"))
+    args.server_pid = proc.pid
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_ready(base_url)
+        token, board = seed_board(base_url, "Events Bench")
+        results = [asyncio.run(run_level(args, args.port, base_url, token, board, n)) for n in args.subscribers]
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'subscribers':>11} {'KB/sub':>7} {'idle CPU':>9} {'delivered':>9} {'p50':>9} {'p99':>9} {'max':>9}")
+    for r in results:
+        print(f"{r['subscribers']:>11} {r['rss_per_subscriber_kb']:>7.1f} {r['idle_cpu_pct']:>8.1f}% "
+              f"{r['delivery_rate']:>8.1%} {r['p50_ms']:>7.1f}ms {r['p99_ms']:>7.1f}ms {r['max_ms']:>7.1f}ms")
+
+if __name__ == "__main__":
+    main()
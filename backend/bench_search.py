@@ -0,0 +1,171 @@
+"""
+票券全文搜尋的基準測試 (crud.search_tickets / GET /api/tickets/search)
+
+建立 N 張票券 (標題 4~8 個詞、描述 10~40 個詞，詞頻呈 Zipf 分佈)，
+對不同選擇性的查詢量測延遲 (包含 highlight / snippet 與 HTML 跳脫)：
+  rare          罕見詞 (約 0.1% 的票券)
+  common        常見詞 (約 3% 的票券)
+  very-common   接近停用詞 (超過一半的票券都有)
+  two-terms     兩個中等頻率的詞 (AND)
+  prefix        3 個字元的前綴 (邊打邊搜)
+  no-match      不存在的詞
+
+查詢的最後一個詞會做前綴比對 (與 API 相同)。預設對全部命中排序 (SEARCH_MAX_CANDIDATES=0，與 API 預設相同)；
+--max-candidates N 另外量測只排序最新 N 筆的模式。每個查詢都列出命中總數 (matches)，
+有上限時另列 truncated，不會因為上限而看不出實際命中了多少。
+
+用法:
+    uv run python bench_search.py                           # 100k 張，暫存 SQLite
+    uv run python bench_search.py --tickets 1000000
+    uv run python bench_search.py --tickets 1000000 --max-candidates 1000
+    uv run python bench_search.py --database-url postgresql://... --tickets 1000000 --json
+
+資料庫需為空的或專用的 (會執行遷移並寫入資料)。
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-text ticket search")
+    parser.add_argument("--database-url", default=None, help="defaults to a temporary SQLite file")
+    parser.add_argument("--tickets", type=int, default=100_000)
+    parser.add_argument("--boards", type=int, default=50, help="tickets are spread over this many boards")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-candidates", type=int, default=0,
+                        help="also measure ranking only the newest N matches (0 = full ranking only)")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench_search.db"
+    # app.database 在 import 時讀取 DATABASE_URL
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["DATABASE_ASYNC"] = "false"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from sqlalchemy import func, insert, select
+    from app import crud, models, search
+    from app.database import SessionLocal
+    from app.migrations import run_migrations
+    from app.ranking import POSITION_GAP
+
+    run_migrations(database_url, log=lambda msg: None)
+    rng = random.Random(args.seed)
+
+    # 詞庫：5000 個假詞，依 Zipf 分佈抽樣 (少數詞很常見，大部分詞很少見)
+    syllables = ["ka", "ri", "to", "mo", "ne", "sa", "lu", "vi", "de", "po", "xa", "qu", "ze", "fo", "bi", "gu"]
+    vocabulary = sorted({"".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(8000)})[:5000]
+    rng.shuffle(vocabulary)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+
+    def words(count):
+        return " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=count))
+
+    def seed(db):
+        owner = models.User(username=f"bench_search_{time.time_ns()}", password_hash="x", name="Bench", role="user")
+        db.add(owner)
+        db.flush()
+        boards = [models.Board(name=f"Search {i}", description="bench", owner_id=owner.id) for i in range(args.boards)]
+        db.add_all(boards)
+        db.flush()
+        columns = [models.KanbanColumn(board_id=b.id, name="Todo", position=0) for b in boards]
+        db.add_all(columns)
+        db.flush()
+        db.commit()
+
+        started = time.perf_counter()
+        batch = []
+        for i in range(args.tickets):
+            column = columns[i % len(columns)]
+            batch.append({
+                "board_id": column.board_id,
+                "column_id": column.id,
+                "title": words(rng.randint(4, 8)).capitalize(),
+                "description": words(rng.randint(10, 40)) if i % 4 else None,
+                "priority": ("low", "medium", "high")[i % 3],
+                "position": (i // len(columns) + 1) * POSITION_GAP,
+            })
+            if len(batch) == 5000:
+                db.execute(insert(models.Ticket), batch)
+                db.commit()
+                batch = []
+        if batch:
+            db.execute(insert(models.Ticket), batch)
+            db.commit()
+        return owner.id, time.perf_counter() - started
+
+    def count_matches(db, user_id, terms):
+        # 命中總數 (不計時)，用來確認排序涵蓋了多少命中
+        source, matches, id_column = crud._search_matches(db.get_bind().dialect.name, user_id, terms)
+        return db.scalar(select(func.count()).select_from(source).where(*matches))
+
+    def measure(db, user_id, terms, max_candidates):
+        search.SEARCH_MAX_CANDIDATES = max_candidates
+        crud.search_tickets(db, user_id=user_id, terms=terms, limit=args.limit)  # 暖機
+        timings = []
+        rows, truncated = [], False
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            rows, truncated = crud.search_tickets(db, user_id=user_id, terms=terms, limit=args.limit)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        return {
+            "max_candidates": max_candidates,
+            "p50_ms": statistics.median(timings) * 1000,
+            "p95_ms": timings[int(len(timings) * 0.95) - 1] * 1000,
+            "max_ms": timings[-1] * 1000,
+            "results": len(rows),
+            "truncated": truncated,
+        }
+
+    db = SessionLocal()
+    try:
+        user_id, seed_seconds = seed(db)
+        # 依 Zipf 排名挑選查詢 (每張票約 25 個詞，排名 r 的詞約出現在 25 / (9.1 * (r + 1)) 的票券)
+        queries = {
+            "rare": [vocabulary[3000]],
+            "common": [vocabulary[90]],
+            "very-common": [vocabulary[2]],
+            "two-terms": [vocabulary[40], vocabulary[60]],
+            "prefix": [vocabulary[500][:3]],
+            "no-match": ["zzzqqq"],
+        }
+        modes = [0] + ([args.max_candidates] if args.max_candidates > 0 else [])
+        results = []
+        for name, terms in queries.items():
+            terms = search.parse_terms(" ".join(terms))
+            matches = count_matches(db, user_id, terms)
+            for max_candidates in modes:
+                results.append({"query": name, "terms": terms, "matches": matches,
+                                **measure(db, user_id, terms, max_candidates)})
+    finally:
+        db.close()
+
+    summary = {
+        "database": database_url.split("://")[0],
+        "tickets": args.tickets,
+        "seed_seconds": seed_seconds,
+        "results": results,
+    }
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"{summary['database']}: {args.tickets} tickets seeded in {seed_seconds:.1f}s, limit={args.limit}")
+    print(f"{'query':<12} {'terms':<24} {'ranked':>7} {'matches':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} "
+          f"{'results':>8} {'truncated':>9}")
+    for r in results:
+        ranked = r["max_candidates"] or "all"
+        print(f"{r['query']:<12} {' '.join(r['terms']):<24} {ranked:>7} {r['matches']:>8} {r['p50_ms']:>8.2f} "
+              f"{r['p95_ms']:>8.2f} {r['max_ms']:>8.2f} {r['results']:>8} {str(r['truncated']).lower():>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+回應序列化的微基準：Pydantic response_model 路徑 vs 快速序列化路徑 (app/serialization.py)
+
+對 100 / 1k / 10k 張票券的看板，分別量測 (每次都包含查詢 + 建立回應內容 + JSON 編碼):
+  pydantic      目前的路徑：載入 ORM 物件 -> response_model (from_attributes) 驗證 -> JSON
+  fast          只 SELECT schema 欄位 -> dict -> orjson
+  fast-stdlib   同上，但以標準庫 json 編碼 (未安裝 orjson 時的退路)
+
+用法:
+    uv run python bench_serialization.py
+    uv run python bench_serialization.py --tickets 100,1000,10000,50000 --repeat 20 --json
+
+兩條路徑的輸出會先比對是否逐位元組相同。
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization paths")
+    parser.add_argument("--database-url", default=None, help="defaults to a temporary SQLite file")
+    parser.add_argument("--tickets", default="100,1000,10000",
+                        type=lambda s: [int(x) for x in s.split(",")])
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench_serialization.db"
+    # app.database 在 import 時讀取 DATABASE_URL
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["DATABASE_ASYNC"] = "false"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from pydantic import TypeAdapter
+    from sqlalchemy import insert
+    from typing import List
+    from app import crud, models, schemas, serialization
+    from app.database import SessionLocal
+    from app.migrations import run_migrations
+    from app.ranking import POSITION_GAP
+
+    run_migrations(database_url, log=lambda msg: None)
+
+    def seed(db, count):
+        owner = models.User(username=f"bench_ser_{count}_{time.time_ns()}", password_hash="x", name="Bench", role="user")
+        db.add(owner)
+        db.flush()
+        board = models.Board(name=f"Serialization {count}", description="bench", owner_id=owner.id)
+        db.add(board)
+        db.flush()
+        columns = [models.KanbanColumn(board_id=board.id, name=f"Col {i}", position=i) for i in range(4)]
+        db.add_all(columns)
+        db.flush()
+        rows = [{
+            "board_id": board.id,
+            "column_id": columns[i % 4].id,
+            "title": f"Ticket {i}",
+            "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit." if i % 3 else None,
+            "priority": ("low", "medium", "high")[i % 3],
+            "position": (i // 4 + 1) * POSITION_GAP,
+        } for i in range(count)]
+        for start in range(0, len(rows), 5000):
+            db.execute(insert(models.Ticket), rows[start:start + 5000])
+        db.commit()
+        return board.id
+
+    board_adapter = TypeAdapter(schemas.BoardDetailResponse)
+    tickets_adapter = TypeAdapter(List[schemas.TicketResponse])
+
+    # 每個情境：(名稱, 回傳 JSON bytes 的函式)
+    def scenarios(board_id):
+        orjson = serialization.orjson
+
+        def stdlib(fn):
+            def run(db):
+                serialization.orjson = None
+                try:
+                    return fn(db)
+                finally:
+                    serialization.orjson = orjson
+            return run
+
+        def board_pydantic(db):
+            return board_adapter.dump_json(board_adapter.validate_python(crud.get_board_snapshot(db, board_id), from_attributes=True))
+
+        def board_fast(db):
+            return serialization.dumps(crud.get_board_snapshot_rows(db, board_id))
+
+        def tickets_pydantic(db):
+            return tickets_adapter.dump_json(tickets_adapter.validate_python(crud.get_tickets_by_board(db, board_id), from_attributes=True))
+
+        def tickets_fast(db):
+            return serialization.dumps(crud.get_ticket_rows_by_board(db, board_id))
+
+        return {
+            "board": [("pydantic", board_pydantic), ("fast", board_fast), ("fast-stdlib", stdlib(board_fast))],
+            "tickets": [("pydantic", tickets_pydantic), ("fast", tickets_fast), ("fast-stdlib", stdlib(tickets_fast))],
+        }
+
+    def measure(fn):
+        timings = []
+        body = None
+        for _ in range(args.repeat):
+            # 每次用新的 session，避免 identity map 讓 ORM 路徑占便宜
+            db = SessionLocal()
+            try:
+                started = time.perf_counter()
+                body = fn(db)
+                timings.append(time.perf_counter() - started)
+            finally:
+                db.close()
+        return statistics.median(timings) * 1000, body
+
+    results = []
+    for count in args.tickets:
+        db = SessionLocal()
+        try:
+            board_id = seed(db, count)
+        finally:
+            db.close()
+        for endpoint, paths in scenarios(board_id).items():
+            bodies = {}
+            baseline = None
+            for name, fn in paths:
+                ms, bodies[name] = measure(fn)
+                baseline = baseline or ms
+                results.append({
+                    "tickets": count,
+                    "endpoint": endpoint,
+                    "path": name,
+                    "median_ms": ms,
+                    "speedup": baseline / ms,
+                    "bytes": len(bodies[name]),
+                })
+            if len(set(bodies.values())) != 1:
+                raise SystemExit(f"Output mismatch for {endpoint} with {count} tickets")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'tickets':>8} {'endpoint':<8} {'path':<12} {'median ms':>10} {'speedup':>8} {'bytes':>10}")
+    for r in results:
+        print(f"{r['tickets']:>8} {r['endpoint']:<8} {r['path']:<12} {r['median_ms']:>10.2f} "
+              f"{r['speedup']:>7.1f}x {r['bytes']:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import argparse
+from app.migrations import applied_versions, discover, run_migrations
+from app.database import SQLALCHEMY_DIRECT_DATABASE_URL
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+# 資料庫遷移 CLI
+#   python migrate.py           套用所有尚未執行的遷移
+#   python migrate.py --status  列出各版本是否已套用
+
+def show_status():
+    engine = create_engine(SQLALCHEMY_DIRECT_DATABASE_URL, poolclass=NullPool)
+    try:
+        done = applied_versions(engine)
+    finally:
+        engine.dispose()
+    for version, name, module in discover():
+        mark = "x" if version in done else " "
+        print(f"[{mark}] {version:04d}_{name}: {module.description}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run database migrations")
+    parser.add_argument("--status", action="store_true", help="show applied / pending migrations")
+    args = parser.parse_args()
+
+    if args.status:
+        show_status()
+    else:
+        applied = run_migrations()
+        print(f"✅ Applied {len(applied)} migration(s)" if applied else "✅ Database is up to date")
@@ -0,0 +1,68 @@
+"""
+測試共用設定：暫存 SQLite (或 TEST_DATABASE_URL 指定的空資料庫) + TestClient (啟動時自動執行遷移)
+
+    uv run --group dev pytest
+    TEST_DATABASE_URL=postgresql://user:pw@localhost:5432/kanban_test uv run --group dev pytest
+"""
+import itertools
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+# app.database 在 import 時讀取 DATABASE_URL，必須在 import app 之前設定
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or \
+    f"sqlite:///{tempfile.mkdtemp(prefix='kanban-tests-')}/test.db"
+os.environ["DATABASE_ASYNC"] = "false"
+os.environ["AUTO_MIGRATE"] = "true"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import engine
+from app.main import app
+
+_usernames = itertools.count(1)
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def auth(client):
+    """註冊並登入一個新使用者，回傳 Authorization header"""
+    def make():
+        username = f"user{next(_usernames)}"
+        client.post("/api/auth/register", json={"username": username, "password": "pw123456", "name": username})
+        response = client.post("/api/auth/login", json={"username": username, "password": "pw123456"})
+        return {"Authorization": "Token " + response.json()["access_token"]}
+    return make
+
+@pytest.fixture
+def board(client):
+    """建立看板，回傳 (board_id, [column_id, ...])"""
+    def make(headers, name="Board"):
+        data = client.post("/api/boards/", json={"name": name}, headers=headers).json()
+        return data["id"], [c["id"] for c in data["columns"]]
+    return make
+
+@contextmanager
+def _count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+@pytest.fixture
+def count_queries():
+    # with count_queries() as statements: ... 區塊內送到資料庫的 statement
+    return _count_queries
@@ -0,0 +1,24 @@
+from sqlalchemy import event
+from app import passwords
+from app.database import engine
+
+def test_login_with_rehash_commits_once(client, auth, monkeypatch):
+    username = client.get("/api/auth/me", headers=auth()).json()["username"]
+    monkeypatch.setattr(passwords, "needs_rehash", lambda hashed: True)
+    commits = []
+
+    def record(conn):
+        commits.append(conn)
+
+    event.listen(engine, "commit", record)
+    try:
+        response = client.post("/api/auth/login", json={"username": username, "password": "pw123456"})
+    finally:
+        event.remove(engine, "commit", record)
+    assert response.status_code == 200
+    assert len(commits) == 1
+
+    monkeypatch.undo()
+    # 新 hash 已寫入：仍可用同一組密碼登入
+    response = client.post("/api/auth/login", json={"username": username, "password": "pw123456"})
+    assert response.status_code == 200
@@ -0,0 +1,52 @@
+import pytest
+
+WRITES = {
+    "ticket create": lambda c, h, b: c.post("/api/tickets/", json={"title": "new", "board_id": b["id"],
+                                                                   "column_id": b["columns"][0]}, headers=h),
+    "ticket update": lambda c, h, b: c.put(f"/api/tickets/{b['tickets'][0]}", json={"title": "renamed"}, headers=h),
+    "ticket delete": lambda c, h, b: c.delete(f"/api/tickets/{b['tickets'][0]}", headers=h),
+    "ticket move": lambda c, h, b: c.post("/api/tickets/move", json={"moves": [
+        {"ticket_id": b["tickets"][0], "column_id": b["columns"][1], "index": 0}]}, headers=h),
+    "bulk update": lambda c, h, b: c.patch("/api/tickets/bulk", json={"board_id": b["id"],
+                                                                     "changes": {"priority": "high"}}, headers=h),
+    "bulk delete": lambda c, h, b: c.post("/api/tickets/bulk-delete", json={"ids": b["tickets"]}, headers=h),
+    "column create": lambda c, h, b: c.post("/api/columns/", json={"name": "new", "board_id": b["id"]}, headers=h),
+    "column update": lambda c, h, b: c.put(f"/api/columns/{b['columns'][0]}", json={"name": "renamed"}, headers=h),
+    "column delete": lambda c, h, b: c.delete(f"/api/columns/{b['columns'][1]}", headers=h),
+    "board update": lambda c, h, b: c.put(f"/api/boards/{b['id']}", json={"name": "renamed"}, headers=h),
+}
+
+@pytest.fixture
+def seeded(client, auth, board):
+    headers = auth()
+    board_id, columns = board(headers)
+    tickets = [
+        client.post("/api/tickets/", json={"title": f"t{i}", "board_id": board_id, "column_id": columns[0]},
+                    headers=headers).json()["id"]
+        for i in range(2)
+    ]
+    return headers, {"id": board_id, "columns": columns, "tickets": tickets}
+
+def test_unchanged_board_is_not_modified(client, seeded):
+    headers, board = seeded
+    url = f"/api/boards/{board['id']}"
+    tag = client.get(url, headers=headers).headers["ETag"]
+    response = client.get(url, headers={**headers, "If-None-Match": tag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == tag
+
+@pytest.mark.parametrize("write", WRITES.values(), ids=WRITES.keys())
+def test_every_write_changes_board_etag(client, seeded, write):
+    headers, board = seeded
+    url = f"/api/boards/{board['id']}"
+    tag = client.get(url, headers=headers).headers["ETag"]
+
+    assert write(client, headers, board).status_code == 200
+
+    response = client.get(url, headers={**headers, "If-None-Match": tag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != tag
+    fresh = client.get(url, headers={**headers, "If-None-Match": response.headers["ETag"]})
+    assert fresh.status_code == 304
+    assert fresh.content == b""
@@ -0,0 +1,47 @@
+from app.database import engine
+
+def _make_board(client, headers, board, columns, tickets):
+    board_id, column_ids = board(headers)
+    for column_id in column_ids[columns:]:
+        client.delete(f"/api/columns/{column_id}", headers=headers)
+    column_ids = column_ids[:columns]
+    for i in range(len(column_ids), columns):
+        column = client.post("/api/columns/", json={"name": f"c{i}", "board_id": board_id, "position": i},
+                             headers=headers).json()
+        column_ids.append(column["id"])
+    for i in range(tickets):
+        client.post("/api/tickets/", json={"title": f"t{i}", "board_id": board_id,
+                                           "column_id": column_ids[i % columns]}, headers=headers)
+    return board_id
+
+def _count_board_read(client, headers, board_id, count_queries):
+    client.get(f"/api/boards/{board_id}", headers=headers)  # 暖身：token 快取
+    with count_queries() as statements:
+        response = client.get(f"/api/boards/{board_id}", headers=headers)
+    assert response.status_code == 200
+    return response.json(), len(statements)
+
+def test_board_snapshot_query_count_is_constant(client, auth, board, count_queries):
+    headers = auth()
+    small = _make_board(client, headers, board, columns=1, tickets=1)
+    large = _make_board(client, headers, board, columns=10, tickets=100)
+
+    small_board, small_queries = _count_board_read(client, headers, small, count_queries)
+    large_board, large_queries = _count_board_read(client, headers, large, count_queries)
+
+    assert len(small_board["columns"]) == 1
+    assert len(large_board["columns"]) == 10
+    assert len(large_board["tickets"]) == 100
+    assert small_queries == large_queries
+
+def test_write_bumps_board_version_in_the_same_statement(client, auth, board, count_queries):
+    # PostgreSQL：寫入與 version +1 是同一條 statement (CTE)；SQLite 另外一條 UPDATE boards
+    headers = auth()
+    board_id, columns = board(headers)
+    ticket = client.post("/api/tickets/", json={"title": "t", "board_id": board_id, "column_id": columns[0]},
+                         headers=headers).json()
+    with count_queries() as statements:
+        response = client.put(f"/api/tickets/{ticket['id']}", json={"title": "renamed"}, headers=headers)
+    assert response.status_code == 200
+    separate_bumps = [s for s in statements if s.lstrip().upper().startswith("UPDATE BOARDS")]
+    assert len(separate_bumps) == (0 if engine.dialect.name == "postgresql" else 1)
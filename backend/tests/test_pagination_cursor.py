@@ -0,0 +1,49 @@
+import pytest
+from app import pagination
+
+OUT_OF_RANGE = [2**63, -2**63 - 1, 10**30]
+
+def test_cursor_round_trip():
+    assert pagination.decode_cursor(pagination.encode_cursor(3, 2**63 - 1), 2) == (3, 2**63 - 1)
+
+@pytest.mark.parametrize("values", [[2**63], [True], [1.5], ["1"], [None]])
+def test_decode_rejects_non_int64(values):
+    with pytest.raises(ValueError):
+        pagination.decode_cursor(pagination.encode_cursor(*values), 1)
+
+def test_key_datetime_rejects_overflow():
+    with pytest.raises(ValueError):
+        pagination.key_datetime(2**62)
+
+@pytest.mark.parametrize("value", OUT_OF_RANGE)
+def test_users_cursor_out_of_range(client, auth, value):
+    response = client.get("/api/users/", params={"cursor": pagination.encode_cursor(value)}, headers=auth())
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("value", OUT_OF_RANGE)
+def test_tickets_position_cursor_out_of_range(client, auth, board, value):
+    headers = auth()
+    board_id, _ = board(headers)
+    cursor = pagination.encode_cursor(1, value, 1)
+    response = client.get("/api/tickets/", params={"board_id": board_id, "cursor": cursor}, headers=headers)
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("sort", ["due_date", "-due_date"])
+@pytest.mark.parametrize("value", OUT_OF_RANGE + [2**62, -2**62])
+def test_tickets_due_date_cursor_out_of_range(client, auth, board, sort, value):
+    headers = auth()
+    board_id, _ = board(headers)
+    params = {"board_id": board_id, "sort": sort, "cursor": pagination.encode_cursor(value, 1)}
+    response = client.get("/api/tickets/", params=params, headers=headers)
+    assert response.status_code == 400
+
+def test_tickets_due_date_cursor_pages(client, auth, board):
+    headers = auth()
+    board_id, columns = board(headers)
+    for day in (1, 2, 3):
+        client.post("/api/tickets/", json={"title": f"t{day}", "board_id": board_id, "column_id": columns[0],
+                                           "due_date": f"2026-10-0{day}T00:00:00Z"}, headers=headers)
+    params = {"board_id": board_id, "sort": "due_date", "limit": 2}
+    first = client.get("/api/tickets/", params=params, headers=headers)
+    second = client.get("/api/tickets/", params={**params, "cursor": first.headers["X-Next-Cursor"]}, headers=headers)
+    assert [t["title"] for t in first.json() + second.json()] == ["t1", "t2", "t3"]
@@ -0,0 +1,57 @@
+import asyncio
+import pytest
+from app import profiling
+from app.auth_cache import Principal
+
+@pytest.fixture
+def profiler(monkeypatch, tmp_path):
+    async def admin(scope):
+        return Principal(1, "admin", "admin")
+    monkeypatch.setattr(profiling, "_authorize_admin", admin)
+    monkeypatch.setattr(profiling, "limiter", profiling.ProfileLimiter(100))
+    monkeypatch.setattr(profiling, "store", profiling.ProfileStore(str(tmp_path), 10))
+    return profiling
+
+def _scope(path):
+    return {"type": "http", "method": "GET", "path": path, "query_string": b"",
+            "headers": [(b"x-profile", b"1"), (b"authorization", b"Token x")]}
+
+async def _receive():
+    return {"type": "http.disconnect"}
+
+def test_sse_releases_limiter_and_saves_while_streaming(profiler):
+    observed = {}
+
+    async def sse_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"text/event-stream")]})
+        # 串流進行中：名額已釋放、結果已在背景保存
+        observed["active"] = profiler.limiter.active
+        await asyncio.gather(*profiler._pending_saves)
+        observed["saved"] = [p["path"] for p in profiler.store.list()]
+        await send({"type": "http.response.body", "body": b"data: x\n\n", "more_body": False})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(profiler.ProfilerMiddleware(sse_app)(_scope("/events"), _receive, send))
+
+    assert observed == {"active": False, "saved": ["/events"]}
+    assert len(profiler.store.list()) == 1
+    assert (b"x-profile-status", b"recorded") in messages[0]["headers"]
+
+def test_regular_request_saves_once(profiler):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def send(message):
+        pass
+
+    asyncio.run(profiler.ProfilerMiddleware(app)(_scope("/api/x"), _receive, send))
+
+    profiles = profiler.store.list()
+    assert [(p["path"], p["status"]) for p in profiles] == [("/api/x", 201)]
+    assert profiler.limiter.active is False
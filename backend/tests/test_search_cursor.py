@@ -0,0 +1,58 @@
+import pytest
+from app import pagination, search
+
+def _seed(client, headers, board_id, column_id, titles):
+    for title in titles:
+        client.post("/api/tickets/", json={"title": title, "board_id": board_id, "column_id": column_id},
+                    headers=headers)
+
+@pytest.mark.parametrize("offset", [-1, -2**63])
+def test_search_offset_out_of_range(client, auth, offset):
+    response = client.get("/api/tickets/search", params={"q": "x", "cursor": pagination.encode_cursor(offset)},
+                          headers=auth())
+    assert response.status_code == 400
+
+def test_search_offset_beyond_cap(client, auth, monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_MAX_CANDIDATES", 5)
+    response = client.get("/api/tickets/search", params={"q": "x", "cursor": pagination.encode_cursor(5)},
+                          headers=auth())
+    assert response.status_code == 400
+
+def test_search_pages_through_every_match(client, auth, board):
+    headers = auth()
+    board_id, columns = board(headers)
+    _seed(client, headers, board_id, columns[0], [f"needle {i}" for i in range(5)])
+    seen, params = [], {"q": "needle", "limit": 2}
+    while True:
+        response = client.get("/api/tickets/search", params=params, headers=headers)
+        assert response.status_code == 200
+        assert response.json()["truncated"] is False
+        seen += [t["id"] for t in response.json()["results"]]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+    assert len(set(seen)) == 5
+
+def test_older_better_match_ranks_first(client, auth, board):
+    # 相關度對全部命中計算：較舊但標題更相符的票券排第一
+    headers = auth()
+    board_id, columns = board(headers)
+    _seed(client, headers, board_id, columns[0], ["haystack haystack haystack"])
+    client.post("/api/tickets/", json={"title": "unrelated", "description": "haystack", "board_id": board_id,
+                                       "column_id": columns[0]}, headers=headers)
+    results = client.get("/api/tickets/search", params={"q": "haystack"}, headers=headers).json()["results"]
+    assert [r["title"] for r in results] == ["haystack haystack haystack", "unrelated"]
+
+def test_capped_search_reports_truncation(client, auth, board, monkeypatch):
+    headers = auth()
+    board_id, columns = board(headers)
+    _seed(client, headers, board_id, columns[0], [f"capped {i}" for i in range(4)])
+    monkeypatch.setattr(search, "SEARCH_MAX_CANDIDATES", 3)
+    response = client.get("/api/tickets/search", params={"q": "capped", "limit": 3}, headers=headers)
+    assert response.json()["truncated"] is True
+    assert len(response.json()["results"]) == 3
+    assert "X-Next-Cursor" not in response.headers
+
+    monkeypatch.setattr(search, "SEARCH_MAX_CANDIDATES", 4)
+    response = client.get("/api/tickets/search", params={"q": "capped", "limit": 3}, headers=headers)
+    assert response.json()["truncated"] is False
@@ -0,0 +1,40 @@
+from app.stats_cache import StatsCache, stats_cache
+
+def test_stats_cache_is_bounded():
+    cache = StatsCache(maxsize=2, ttl=60)
+    for user_id in range(5):
+        cache.put((user_id, None), {"boards": []})
+    assert cache.stats()["size"] == 2
+
+def test_stats_cache_invalidation():
+    cache = StatsCache(maxsize=10, ttl=60)
+    cache.put((1, None), {"boards": [{"id": 10}, {"id": 11}]})
+    cache.put((1, 11), {"boards": [{"id": 11}]})
+    cache.put((2, None), {"boards": [{"id": 20}]})
+    cache.invalidate_board(10)
+    assert cache.get((1, None)) is None
+    assert cache.get((1, 11)) is not None
+    cache.invalidate_user(1)
+    assert cache.get((1, 11)) is None
+    assert cache.get((2, None)) is not None
+
+def test_foreign_and_missing_boards_are_not_cached(client, auth, board):
+    owner, other = auth(), auth()
+    board_id, _ = board(owner)
+    stats_cache.clear()
+    assert client.get("/api/stats/", params={"board_id": board_id}, headers=other).status_code == 403
+    assert client.get("/api/stats/", params={"board_id": 10**9}, headers=other).status_code == 404
+    assert stats_cache.stats()["size"] == 0
+
+    response = client.get("/api/stats/", params={"board_id": board_id}, headers=owner)
+    assert response.status_code == 200
+    assert stats_cache.stats()["size"] == 1
+
+def test_stats_refresh_after_write(client, auth, board):
+    headers = auth()
+    board_id, columns = board(headers)
+    params = {"board_id": board_id}
+    before = client.get("/api/stats/", params=params, headers=headers).json()
+    client.post("/api/tickets/", json={"title": "t", "board_id": board_id, "column_id": columns[0]}, headers=headers)
+    after = client.get("/api/stats/", params=params, headers=headers).json()
+    assert after != before
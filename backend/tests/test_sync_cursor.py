@@ -0,0 +1,37 @@
+import pytest
+from app import sync
+
+@pytest.mark.parametrize("since", ["2026-10-18T00:00:00Z", "2026-10-18T08:00:00+08:00", "2026-10-18T00:00:00"])
+def test_iso_since_forms_are_normalized(client, auth, board, since):
+    headers = auth()
+    board_id, _ = board(headers)
+    response = client.get("/api/tickets/", params={"board_id": board_id, "since": since}, headers=headers)
+    assert response.status_code == 200
+    assert sync.decode_cursor(since) == sync.decode_cursor("2026-10-18T00:00:00Z")
+
+def test_cursor_round_trip_returns_only_changes(client, auth, board):
+    headers = auth()
+    board_id, columns = board(headers)
+    first = client.get("/api/tickets/", params={"board_id": board_id, "since": sync.INITIAL_CURSOR}, headers=headers).json()
+    assert first["reset"] is True
+
+    ticket = client.post("/api/tickets/", json={"title": "t", "board_id": board_id, "column_id": columns[0]},
+                         headers=headers).json()
+    second = client.get("/api/tickets/", params={"board_id": board_id, "since": first["cursor"]}, headers=headers).json()
+    assert second["reset"] is False
+    assert [t["id"] for t in second["tickets"]] == [ticket["id"]]
+
+@pytest.mark.parametrize("since", ["garbage", "bm90LWEtZGF0ZQ", "0001-01-01T00:00:00+08:00", ""])
+def test_malformed_since_is_rejected(client, auth, board, since):
+    headers = auth()
+    board_id, _ = board(headers)
+    response = client.get("/api/tickets/", params={"board_id": board_id, "since": since}, headers=headers)
+    assert response.status_code == 400
+
+def test_future_since_resets(client, auth, board):
+    headers = auth()
+    board_id, _ = board(headers)
+    response = client.get("/api/tickets/", params={"board_id": board_id, "since": "2999-01-01T00:00:00Z"},
+                          headers=headers)
+    assert response.status_code == 200
+    assert response.json()["reset"] is True
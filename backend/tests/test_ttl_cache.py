@@ -0,0 +1,58 @@
+import time
+from app.auth_cache import Ownership, OwnershipCache, Principal, PrincipalCache
+from app.ttl_cache import TTLCache
+
+class TaggedCache(TTLCache):
+    def _tags(self, key, value):
+        return value
+
+def test_lru_eviction_keeps_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["size"] == 2
+
+def test_expired_entries_miss(monkeypatch):
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.put("a", 1)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+def test_invalidate_tag_clears_every_tag_index():
+    cache = TaggedCache(maxsize=10, ttl=60)
+    cache.put("x", ("board:1", "user:1"))
+    cache.put("y", ("board:2", "user:1"))
+    cache.invalidate_tag("board:1")
+    assert cache.get("x") is None
+    assert cache.get("y") is not None
+    cache.invalidate_tag("user:1")
+    assert cache.get("y") is None
+    assert cache._keys_by_tag == {}
+
+def test_disabled_cache_stores_nothing():
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+
+def test_principal_cache_invalidate_user():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    cache.put("t1", Principal(1, "a", "user"))
+    cache.put("t2", Principal(1, "a", "user"))
+    cache.put("t3", Principal(2, "b", "user"))
+    cache.invalidate_user(1)
+    assert cache.get("t1") is None and cache.get("t2") is None
+    assert cache.get("t3") == Principal(2, "b", "user")
+
+def test_ownership_cache_invalidate():
+    cache = OwnershipCache(maxsize=10, ttl=60)
+    cache.put_many({("board", 1): Ownership(1, 7), ("ticket", 5): Ownership(1, 7), ("ticket", 6): Ownership(2, 7)})
+    cache.invalidate("ticket", 6)
+    assert cache.get(("ticket", 6)) is None
+    cache.invalidate_board(1)
+    assert cache.get(("board", 1)) is None and cache.get(("ticket", 5)) is None
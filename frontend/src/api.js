@@ -6,6 +6,29 @@ const BASE_URL = (import.meta.env.VITE_API_URL || 'http://127.0.0.1:8000') + '/a
  * 自動帶入 Token, JSON Content-Type
  */
 export async function apiFetch(endpoint, options = {}) {
+    const { data } = await apiRequest(endpoint, options);
+    return data;
+}
+
+/**
+ * 取得 cursor 分頁列表的所有頁
+ * 依回應的 X-Next-Cursor 逐頁請求，直到沒有下一頁
+ */
+export async function apiFetchAll(endpoint, options = {}) {
+    const separator = endpoint.includes('?') ? '&' : '?';
+    const items = [];
+    let cursor = null;
+    do {
+        const url = cursor ? `${endpoint}${separator}cursor=${encodeURIComponent(cursor)}` : endpoint;
+        const { data, headers } = await apiRequest(url, options);
+        items.push(...data);
+        cursor = headers.get('X-Next-Cursor');
+    } while (cursor);
+    return items;
+}
+
+// 回傳 { data, headers }，供需要讀取回應 header 的呼叫端使用
+async function apiRequest(endpoint, options = {}) {
     // 1. 準備 Headers
     const token = localStorage.getItem('kanban_token');
     const headers = {
@@ -50,7 +73,18 @@ export async function apiFetch(endpoint, options = {}) {
     }
 
     // 若是 204 No Content，回傳 null
-    if (response.status === 204) return null;
+    if (response.status === 204) return { data: null, headers: response.headers };
 
-    return response.json();
+    return { data: await response.json(), headers: response.headers };
+}
+
+/**
+ * 訂閱 Server-Sent Events 串流
+ * EventSource 不能自訂 header，Token 改放在 query string
+ */
+export function apiEventSource(endpoint) {
+    const token = localStorage.getItem('kanban_token');
+    const separator = endpoint.includes('?') ? '&' : '?';
+    const query = token ? `${separator}token=${encodeURIComponent(token)}` : '';
+    return new EventSource(`${BASE_URL}${endpoint}${query}`);
 }
@@ -11,17 +11,22 @@ export const useColumnStore = defineStore('column', () => {
     async function fetchColumns(boardId) {
         try {
             const data = await apiFetch(`/columns/?board_id=${boardId}`)
-            // 更新本地 Store: 先移除該 board 舊資料，再加入新資料
-            // 這裡簡單做法：把非此 board 的留著，加上新的
-            // Note: API returns snake_case 'board_id'
-            const otherBoardCols = columns.value.filter(c => c.board_id !== Number(boardId))
-            columns.value = [...otherBoardCols, ...data]
+            setBoardColumns(boardId, data)
             return data
         } catch (error) {
             console.error('Fetch columns failed:', error)
         }
     }
 
+    // 以 API 回傳資料取代某個 board 的欄位 (fetchColumns 與看板快照共用)
+    function setBoardColumns(boardId, data) {
+        // 更新本地 Store: 先移除該 board 舊資料，再加入新資料
+        // 這裡簡單做法：把非此 board 的留著，加上新的
+        // Note: API returns snake_case 'board_id'
+        const otherBoardCols = columns.value.filter(c => c.board_id !== Number(boardId))
+        columns.value = [...otherBoardCols, ...data]
+    }
+
     async function createColumn({ boardId, name, color = 'slate' }) {
         try {
             const newCol = await apiFetch('/columns/', {
@@ -77,6 +82,7 @@ export const useColumnStore = defineStore('column', () => {
     return {
         columns,
         fetchColumns,
+        setBoardColumns,
         createColumn,
         updateColumn,
         deleteColumn,
@@ -0,0 +1,35 @@
+import { defineStore } from 'pinia'
+import { ref } from 'vue'
+import { apiFetch } from '../api'
+
+// 統計數據由後端 GET /api/stats 彙總 (GROUP BY + 短期快取)，前端不再下載所有票券自己算
+export const useStatsStore = defineStore('stats', () => {
+    // ===== State =====
+    const overview = ref(null)      // 所有看板
+    const boardStats = ref({})      // boardId -> 單一看板統計
+
+    // ===== Actions =====
+    async function fetchStats() {
+        try {
+            overview.value = await apiFetch('/stats/')
+        } catch (error) {
+            console.error('Fetch stats failed:', error)
+        }
+    }
+
+    async function fetchBoardStats(boardId) {
+        try {
+            const data = await apiFetch(`/stats/?board_id=${boardId}`)
+            boardStats.value = { ...boardStats.value, [boardId]: data.boards[0] }
+        } catch (error) {
+            console.error('Fetch board stats failed:', error)
+        }
+    }
+
+    return {
+        overview,
+        boardStats,
+        fetchStats,
+        fetchBoardStats
+    }
+})
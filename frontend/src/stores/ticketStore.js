@@ -4,18 +4,45 @@ import { apiFetch } from '../api'
 
 export const useTicketStore = defineStore('ticket', () => {
     const allTickets = ref([])
+    // 每個 board 的增量同步 cursor (由後端發給)
+    const syncCursors = {}
 
+    // 增量同步：只取上次之後新增 / 更新的票券與被刪除的票券 id
     async function fetchTickets(boardId) {
+        const cursor = syncCursors[boardId] || '0'
         try {
-            const data = await apiFetch(`/tickets/?board_id=${boardId}`)
-            // 清除舊資料，保留非此 board 的 (或乾脆全清，視需求)
-            const otherTickets = allTickets.value.filter(t => t.board_id !== Number(boardId))
-            allTickets.value = [...otherTickets, ...data]
+            const data = await apiFetch(`/tickets/?board_id=${boardId}&since=${encodeURIComponent(cursor)}`)
+            if (data.reset) {
+                setBoardTickets(boardId, data.tickets)
+            } else {
+                applyTicketChanges(data.tickets, data.deleted)
+            }
+            syncCursors[boardId] = data.cursor
         } catch (error) {
             console.error('Fetch tickets failed:', error)
         }
     }
 
+    function applyTicketChanges(changedTickets, deletedIds) {
+        const changedById = new Map(changedTickets.map(t => [t.id, t]))
+        const deleted = new Set(deletedIds)
+        const merged = allTickets.value
+            .filter(t => !deleted.has(t.id))
+            .map(t => {
+                const changed = changedById.get(t.id)
+                changedById.delete(t.id)
+                return changed || t
+            })
+        allTickets.value = [...merged, ...changedById.values()]
+    }
+
+    // 以 API 回傳資料取代某個 board 的票券 (fetchTickets 與看板快照共用)
+    function setBoardTickets(boardId, data) {
+        // 清除舊資料，保留非此 board 的 (或乾脆全清，視需求)
+        const otherTickets = allTickets.value.filter(t => t.board_id !== Number(boardId))
+        allTickets.value = [...otherTickets, ...data]
+    }
+
     async function createTicket(ticketData) {
         // ticketData: { boardId, columnId, title, description, priority, startDate, dueDate }
         // 轉成 API 需要的 snake_case
@@ -77,6 +104,31 @@ export const useTicketStore = defineStore('ticket', () => {
         await updateTicket(ticketId, { columnId: newColumnId })
     }
 
+    // 批次移動 / 排序：moves = [{ ticketId, columnId, index }]
+    async function moveTickets(moves) {
+        const payload = {
+            moves: moves.map(m => ({
+                ticket_id: m.ticketId,
+                column_id: m.columnId,
+                index: m.index
+            }))
+        }
+
+        try {
+            const changedTickets = await apiFetch('/tickets/move', {
+                method: 'POST',
+                body: JSON.stringify(payload)
+            })
+            // 只更新有變動的票券 (可能包含重排的同欄票券)
+            const changedById = new Map(changedTickets.map(t => [t.id, t]))
+            allTickets.value = allTickets.value.map(t => changedById.get(t.id) || t)
+            return changedTickets
+        } catch (error) {
+            console.error('Move tickets failed:', error)
+            throw error
+        }
+    }
+
     async function deleteTicket(ticketId) {
         try {
             await apiFetch(`/tickets/${ticketId}`, {
@@ -90,6 +142,27 @@ export const useTicketStore = defineStore('ticket', () => {
         }
     }
 
+    // 批次刪除：selector 可用 { ids, columnId, priority }，後端一條 DELETE 完成
+    async function bulkDeleteTickets(selector) {
+        const payload = {}
+        if (selector.ids !== undefined) payload.ids = selector.ids
+        if (selector.columnId !== undefined) payload.column_id = selector.columnId
+        if (selector.priority !== undefined) payload.priority = selector.priority
+
+        try {
+            const result = await apiFetch('/tickets/bulk-delete', {
+                method: 'POST',
+                body: JSON.stringify(payload)
+            })
+            const deleted = new Set(result.ids)
+            allTickets.value = allTickets.value.filter(t => !deleted.has(t.id))
+            return result.ids
+        } catch (error) {
+            console.error('Bulk delete tickets failed:', error)
+            throw error
+        }
+    }
+
     // 當刪除看板時，前端也要清空相關的 ticket
     function deleteTicketsByBoard(boardId) {
         allTickets.value = allTickets.value.filter(t => t.board_id !== Number(boardId))
@@ -109,10 +182,13 @@ export const useTicketStore = defineStore('ticket', () => {
     return {
         allTickets,
         fetchTickets,
+        setBoardTickets,
         createTicket,
         updateTicket,
         moveTicket,
+        moveTickets,
         deleteTicket,
+        bulkDeleteTickets,
         deleteTicketsByBoard,
         getTicketsByColumn,
         getTicketsByBoard
@@ -1,6 +1,6 @@
 import { defineStore } from 'pinia'
 import { ref, computed } from 'vue'
-import { apiFetch } from '../api'
+import { apiFetch, apiFetchAll } from '../api'
 
 export const useUserStore = defineStore('user', () => {
     // ===== State =====
@@ -14,7 +14,7 @@ export const useUserStore = defineStore('user', () => {
     // ===== Actions =====
     async function fetchUsers() {
         try {
-            const data = await apiFetch('/users/')
+            const data = await apiFetchAll('/users/')
             users.value = data
         } catch (error) {
             console.error('Fetch users failed:', error)